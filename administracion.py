@@ -0,0 +1,375 @@
+"""Vistas de administración: simulador de puntajes, memoria, duplicados y exportación"""
+import streamlit as st
+import sys
+import time
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from datos import (
+    TOPES_DIGITALIZACION, PUNTAJES_TIPO_ORGANIZACION, PUNTAJES_JERARQUIA, PUNTAJES_PLANEACION,
+    PUNTAJES_FUNCIONES, PUNTAJES_IDENTIDAD, MULTIPLICADORES_HERRAMIENTAS, MULTIPLICADORES_IAS,
+    MULTIPLICADORES_COMUNIDADES, conectar_google_sheets, cargar_respuestas_sheets,
+    encontrar_duplicados, cargar_datos_compartidos, obtener_datos_compartidos, obtener_paises,
+    obtener_ciudades_por_pais
+)
+from exportar_datos import FORMATOS_EXPORTACION, MINIMO_CIUDAD, bloques_hoja, exportar_a_temporal
+from resultados import obtener_indice_coordenadas, obtener_serie_envios
+
+# ==================== SIMULADOR DE PUNTAJES ====================
+
+# Columna de respuesta -> tabla de pesos del modelo por defecto
+TABLAS_FORMALIZACION = {
+    'jerarquia': PUNTAJES_JERARQUIA,
+    'planeacion': PUNTAJES_PLANEACION,
+    'funciones': PUNTAJES_FUNCIONES,
+    'identidad': PUNTAJES_IDENTIDAD
+}
+TABLAS_MULTIPLICADORES = {
+    'importancia_herramientas': MULTIPLICADORES_HERRAMIENTAS,
+    'importancia_ias': MULTIPLICADORES_IAS,
+    'importancia_comunidades': MULTIPLICADORES_COMUNIDADES
+}
+# Qué multiplicador afecta a cada conteo de digitalización
+MULTIPLICADOR_POR_CONTEO = {
+    'num_herramientas': 'importancia_herramientas',
+    'num_herramientas_pagadas': 'importancia_herramientas',
+    'num_ias': 'importancia_ias',
+    'num_ias_pagadas': 'importancia_ias',
+    'num_comunidades': 'importancia_comunidades'
+}
+# Conteos que la encuesta calcula sin la opción "Ninguna" (procesar_respuestas sí la cuenta)
+CONTEOS_SIN_NINGUNA = {
+    'num_herramientas': 'herramientas',
+    'num_ias': 'ias',
+    'num_comunidades': 'comunidades'
+}
+
+def modelo_por_defecto():
+    """Parámetros actuales del modelo de puntajes"""
+    return {
+        'tipo_organizacion': dict(PUNTAJES_TIPO_ORGANIZACION),
+        **{columna: dict(tabla) for columna, tabla in TABLAS_FORMALIZACION.items()},
+        **{columna: dict(tabla) for columna, tabla in TABLAS_MULTIPLICADORES.items()},
+        'topes': dict(TOPES_DIGITALIZACION)
+    }
+
+def codigos_respuesta(valores, opciones):
+    """Índice de cada respuesta en la lista de opciones (-1 si no coincide con ninguna)"""
+    return pd.Index(list(opciones)).get_indexer(valores).astype(np.int64)
+
+def contar_sin_ninguna(columna):
+    """Opciones elegidas por fila en un campo separado por '|', sin contar "Ninguna" (como la encuesta)"""
+    entradas = columna.astype(str).str.split('|').explode()
+    validas = (entradas != '') & (entradas != 'Ninguna')
+    return np.bincount(entradas.index.to_numpy()[validas.to_numpy()], minlength=len(columna)).astype(float)
+
+@st.cache_resource(max_entries=4)
+def compilar_datos_puntaje(version_datos, _df_datos):
+    """Códigos enteros y conteos listos para puntuar el conjunto completo, una vez por versión"""
+    compilado = {
+        columna: codigos_respuesta(_df_datos[columna], tabla)
+        for columna, tabla in {**TABLAS_FORMALIZACION, **TABLAS_MULTIPLICADORES}.items()
+    }
+    compilado.update({
+        conteo: _df_datos[conteo].to_numpy(dtype=float) for conteo in TOPES_DIGITALIZACION
+    })
+    # Así el modelo por defecto reproduce los puntajes guardados en la hoja
+    compilado.update({
+        conteo: contar_sin_ninguna(_df_datos[campo]) for conteo, campo in CONTEOS_SIN_NINGUNA.items()
+    })
+
+    # Tipos de organización: un par (fila, código) por cada organización declarada
+    tipos = _df_datos['organizaciones_tipos'].str.split('|').explode()
+    tipos = tipos[tipos.notna() & (tipos != '')]
+    compilado['org_filas'] = tipos.index.to_numpy()
+    compilado['org_codigos'] = codigos_respuesta(tipos, PUNTAJES_TIPO_ORGANIZACION)
+    compilado['n'] = len(_df_datos)
+    return compilado
+
+def arreglo_pesos(tabla, por_defecto):
+    """Pesos en el orden de las opciones; el último valor es para respuestas sin coincidencia (código -1)"""
+    return np.array(list(tabla.values()) + [por_defecto], dtype=float)
+
+def puntuar_vectorizado(compilado, modelo):
+    """Tipo de organización, formalización y digitalización de todas las filas con un modelo dado"""
+    pesos_tipo = arreglo_pesos(modelo['tipo_organizacion'], 0)
+    tipo_org = np.bincount(compilado['org_filas'], weights=pesos_tipo[compilado['org_codigos']],
+                           minlength=compilado['n'])
+    tipo_org = np.clip(tipo_org, -10, 10)
+
+    formalizacion = np.zeros(compilado['n'])
+    for columna in TABLAS_FORMALIZACION:
+        formalizacion += arreglo_pesos(modelo[columna], 0)[compilado[columna]]
+
+    multiplicadores = {
+        columna: arreglo_pesos(modelo[columna], 1.0)[compilado[columna]] for columna in TABLAS_MULTIPLICADORES
+    }
+    digitalizacion = np.zeros(compilado['n'])
+    for conteo, (puntos, tope) in modelo['topes'].items():
+        digitalizacion += np.minimum(compilado[conteo] * puntos, tope) * multiplicadores[MULTIPLICADOR_POR_CONTEO[conteo]]
+    digitalizacion = np.round(np.minimum(digitalizacion, 100))
+
+    return tipo_org, formalizacion, digitalizacion
+
+def sliders_tabla(titulo, columna, tabla, minimo, maximo, paso):
+    """Un slider por opción de respuesta; devuelve la tabla con los pesos elegidos"""
+    with st.expander(titulo):
+        return {
+            opcion: st.slider(opcion, minimo, maximo, valor, paso, key=f"sim_{columna}_{i}")
+            for i, (opcion, valor) in enumerate(tabla.items())
+        }
+
+def crear_scatter_comparado(puntajes_actuales, puntajes_nuevos, max_puntos=20000):
+    """Dispersión del modelo actual y del simulado, lado a lado"""
+    from plotly.subplots import make_subplots
+
+    n = len(puntajes_actuales[0])
+    # Con conjuntos muy grandes se dibuja una muestra fija; las métricas usan todas las filas
+    muestra = np.random.default_rng(0).choice(n, max_puntos, replace=False) if n > max_puntos else slice(None)
+
+    fig = make_subplots(rows=1, cols=2, shared_yaxes=True, subplot_titles=("Modelo actual", "Modelo simulado"))
+    for columna, (tipo_org, formalizacion, digitalizacion) in enumerate([puntajes_actuales, puntajes_nuevos], start=1):
+        for valores, nombre, color in [(formalizacion, 'Formalización', '#258DC5'), (digitalizacion, 'Digitalización', '#EA185E')]:
+            fig.add_trace(go.Scattergl(
+                x=tipo_org[muestra], y=valores[muestra], mode='markers', name=nombre,
+                marker=dict(color=color, opacity=0.5, size=6), legendgroup=nombre, showlegend=columna == 1
+            ), row=1, col=columna)
+    fig.update_xaxes(range=[-12, 12], gridcolor='#f0f0f0', title_text="Tipo de organización")
+    fig.update_yaxes(range=[-5, 105], gridcolor='#f0f0f0')
+    fig.update_layout(height=500, plot_bgcolor='white', legend=dict(orientation="h", y=-0.2))
+    return fig
+
+def mostrar_simulador_puntajes():
+    """Página para investigadores: editar pesos y topes y repuntuar todo el conjunto en vivo"""
+    df_datos, version_datos = cargar_datos_compartidos()
+    if version_datos is None:
+        st.info("📊 Aún no hay respuestas para simular.")
+        return
+
+    if st.button("↩️ Restablecer pesos", key="sim_restablecer"):
+        for clave in [k for k in st.session_state if str(k).startswith('sim_') and k != 'sim_restablecer']:
+            del st.session_state[clave]
+        st.rerun()
+
+    por_defecto = modelo_por_defecto()
+    col_formal, col_digital = st.columns(2)
+    with col_formal:
+        st.markdown("#### Formalización")
+        modelo = {
+            'jerarquia': sliders_tabla("Jerarquía", 'jerarquia', PUNTAJES_JERARQUIA, 0, 50, 1),
+            'planeacion': sliders_tabla("Planeación", 'planeacion', PUNTAJES_PLANEACION, 0, 50, 1),
+            'funciones': sliders_tabla("Funciones", 'funciones', PUNTAJES_FUNCIONES, 0, 50, 1),
+            'identidad': sliders_tabla("Identidad", 'identidad', PUNTAJES_IDENTIDAD, 0, 50, 1)
+        }
+        st.markdown("#### Tipo de organización")
+        modelo['tipo_organizacion'] = sliders_tabla("Puntaje por tipo", 'tipo_organizacion',
+                                                    PUNTAJES_TIPO_ORGANIZACION, -10, 10, 1)
+    with col_digital:
+        st.markdown("#### Digitalización")
+        modelo['importancia_herramientas'] = sliders_tabla("Importancia de herramientas", 'importancia_herramientas',
+                                                           MULTIPLICADORES_HERRAMIENTAS, 0.0, 2.0, 0.05)
+        modelo['importancia_ias'] = sliders_tabla("Importancia de IAs", 'importancia_ias',
+                                                  MULTIPLICADORES_IAS, 0.0, 2.0, 0.05)
+        modelo['importancia_comunidades'] = sliders_tabla("Importancia de comunidades", 'importancia_comunidades',
+                                                          MULTIPLICADORES_COMUNIDADES, 0.0, 2.0, 0.05)
+        with st.expander("Puntos por elemento y topes"):
+            modelo['topes'] = {}
+            for conteo, (puntos, tope) in TOPES_DIGITALIZACION.items():
+                etiqueta = conteo.replace('num_', '').replace('_', ' ').capitalize()
+                col_puntos, col_tope = st.columns(2)
+                with col_puntos:
+                    puntos = st.slider(f"{etiqueta}: puntos", 0, 10, puntos, key=f"sim_puntos_{conteo}")
+                with col_tope:
+                    tope = st.slider(f"{etiqueta}: tope", 0, 100, tope, key=f"sim_tope_{conteo}")
+                modelo['topes'][conteo] = (puntos, tope)
+
+    compilado = compilar_datos_puntaje(version_datos, df_datos)
+    inicio = time.perf_counter()
+    actuales = puntuar_vectorizado(compilado, por_defecto)
+    nuevos = puntuar_vectorizado(compilado, modelo)
+    duracion_ms = (time.perf_counter() - inicio) * 1000
+
+    st.caption(f"{compilado['n']} respuestas repuntuadas en {duracion_ms:.1f} ms")
+
+    def banda(valores):
+        return np.digitize(valores, [33, 66], right=True)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Formalización promedio", f"{nuevos[1].mean():.1f}", f"{nuevos[1].mean() - actuales[1].mean():+.1f}")
+    col2.metric("Digitalización promedio", f"{nuevos[2].mean():.1f}", f"{nuevos[2].mean() - actuales[2].mean():+.1f}")
+    cambian = ((banda(nuevos[1]) != banda(actuales[1])) | (banda(nuevos[2]) != banda(actuales[2]))).mean() * 100
+    col3.metric("Personas que cambian de rango", f"{cambian:.1f}%")
+
+    st.plotly_chart(crear_scatter_comparado(actuales, nuevos), use_container_width=True)
+
+# ==================== REPORTE DE MEMORIA ====================
+
+def tamano_profundo(obj, vistos):
+    """Bytes aproximados de un objeto y de todo lo que referencia (sin contar dos veces)"""
+    if id(obj) in vistos:
+        return 0
+    vistos.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+
+    tam = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        tam += sum(tamano_profundo(k, vistos) + tamano_profundo(v, vistos) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        tam += sum(tamano_profundo(v, vistos) for v in obj)
+    return tam
+
+def memoria_proceso_mb():
+    """Memoria residente del proceso en MB"""
+    try:
+        with open('/proc/self/status') as f:
+            for linea in f:
+                if linea.startswith('VmRSS:'):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    # En Linux ru_maxrss está en KB y en macOS en bytes; es el pico, no el valor actual
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maximo / (1024 * 1024) if sys.platform == 'darwin' else maximo / 1024
+
+def objetos_compartidos():
+    """Estructuras de solo lectura que todas las sesiones referencian"""
+    df_datos, _ = obtener_datos_compartidos()
+    return {
+        'Tabla de respuestas': df_datos,
+        'Índice de coordenadas (geonames)': obtener_indice_coordenadas(),
+        'Ciudades por país (geonames)': obtener_ciudades_por_pais(),
+        'Países': obtener_paises(),
+        'Serie de envíos': obtener_serie_envios()
+    }
+
+def listar_sesiones_activas():
+    """(id, estado) de las sesiones conectadas; vacío fuera del servidor de Streamlit"""
+    try:
+        from streamlit.runtime import Runtime
+        sesiones = Runtime.instance()._session_mgr.list_active_sessions()
+        return [(info.session.id, info.session.session_state.filtered_state) for info in sesiones]
+    except Exception:
+        return []
+
+def estadisticas_caches_streamlit():
+    """Bytes por caché de Streamlit (st.cache_data, st.cache_resource, session_state...)"""
+    try:
+        from streamlit.runtime import Runtime
+        estadisticas = Runtime.instance().stats_mgr.get_stats()
+    except Exception:
+        return pd.DataFrame(columns=['Categoría', 'Caché', 'Entradas', 'MB'])
+
+    # Según la versión de Streamlit se recibe una lista o un dict por familia de métricas
+    if isinstance(estadisticas, dict):
+        estadisticas = [stat for grupo in estadisticas.values() for stat in grupo]
+
+    filas = [
+        {'Categoría': getattr(stat, 'category_name', ''), 'Caché': getattr(stat, 'cache_name', ''),
+         'Entradas': 1, 'MB': getattr(stat, 'byte_length', 0) / 1e6}
+        for stat in estadisticas if hasattr(stat, 'byte_length')
+    ]
+    if not filas:
+        return pd.DataFrame(columns=['Categoría', 'Caché', 'Entradas', 'MB'])
+    return (pd.DataFrame(filas).groupby(['Categoría', 'Caché'], as_index=False).sum()
+            .sort_values('MB', ascending=False))
+
+def mostrar_duplicados():
+    """Vista de administración con las filas duplicadas de la hoja"""
+    duplicados = encontrar_duplicados(cargar_respuestas_sheets())
+    if duplicados.empty:
+        st.success("No hay respuestas duplicadas en la hoja.")
+        return
+
+    sobrantes = len(duplicados) - duplicados['grupo'].nunique()
+    st.warning(f"{duplicados['grupo'].nunique()} respuestas aparecen más de una vez ({sobrantes} filas sobrantes).")
+    st.caption("Conserva la primera fila de cada grupo y elimina las demás directamente en la hoja.")
+    st.dataframe(duplicados, use_container_width=True)
+
+def liberar_exportacion():
+    """Suelta la exportación preparada; Streamlit conserva la descarga en curso hasta el siguiente rerun"""
+    st.session_state.pop('exportacion', None)
+
+def mostrar_exportacion():
+    """Vista de administración para descargar las respuestas sin datos personales"""
+    st.markdown("Se quitan nombre, correo, teléfono, clave de envío y nombres de proyectos, los cargos se "
+                "reemplazan por su rol, el momento del envío queda solo como fecha y las ciudades con pocas "
+                "respuestas se agrupan como «Otra ciudad».")
+    col1, col2 = st.columns(2)
+    with col1:
+        formato = st.radio("Formato:", list(FORMATOS_EXPORTACION), horizontal=True, key="exp_formato")
+    with col2:
+        minimo = st.number_input("Respuestas mínimas para publicar una ciudad:", min_value=1,
+                                 value=MINIMO_CIUDAD, step=1, key="exp_minimo")
+
+    if st.button("Preparar exportación", key="btn_preparar_exportacion"):
+        sheet = conectar_google_sheets()
+        if sheet is None:
+            return
+        liberar_exportacion()
+        with st.spinner("Leyendo la hoja por bloques..."):
+            try:
+                archivo, filas = exportar_a_temporal(lambda: bloques_hoja(sheet), formato, minimo)
+            except Exception as e:
+                st.error(f"❌ No se pudo preparar la exportación: {type(e).__name__}: {e}")
+                return
+        # Se lee una sola vez: los reruns siguientes reutilizan los mismos bytes hasta la descarga
+        with archivo:
+            contenido = archivo.read()
+        st.session_state.exportacion = {'contenido': contenido, 'formato': formato, 'filas': filas}
+
+    exportacion = st.session_state.get('exportacion')
+    if exportacion:
+        tipo, extension = FORMATOS_EXPORTACION[exportacion['formato']]
+        st.caption(f"{exportacion['filas']} respuestas · {len(exportacion['contenido']) / 1e6:.2f} MB")
+        st.download_button("⬇️ Descargar", exportacion['contenido'], file_name=f"mapeo_anonimo.{extension}",
+                           mime=tipo, key="btn_descargar_exportacion", on_click=liberar_exportacion)
+
+def mostrar_reporte_memoria():
+    """Vista de administración con el uso de memoria por proceso, caché y sesión"""
+    st.metric("Memoria residente del proceso", f"{memoria_proceso_mb():.1f} MB")
+
+    st.markdown("### Estructuras compartidas (una copia por proceso)")
+    compartidos = objetos_compartidos()
+    vistos_compartidos = set()
+    filas = []
+    for nombre, objeto in compartidos.items():
+        filas.append({'Estructura': nombre, 'MB': tamano_profundo(objeto, vistos_compartidos) / 1e6})
+    st.dataframe(pd.DataFrame(filas), use_container_width=True, hide_index=True,
+                 column_config={'MB': st.column_config.NumberColumn(format="%.2f")})
+
+    st.markdown("### Cachés de Streamlit")
+    st.dataframe(estadisticas_caches_streamlit(), use_container_width=True, hide_index=True,
+                 column_config={'MB': st.column_config.NumberColumn(format="%.3f")})
+
+    st.markdown("### Sesiones activas")
+    sesiones = listar_sesiones_activas()
+    if not sesiones:
+        st.info("No se pudo consultar la lista de sesiones (solo disponible dentro del servidor de Streamlit).")
+        return
+
+    filas = []
+    for id_sesion, estado in sesiones:
+        # Lo que ya está en las estructuras compartidas no se cuenta por sesión
+        vistos = set(vistos_compartidos)
+        tamanos = {clave: tamano_profundo(valor, vistos) for clave, valor in estado.items()}
+        mayor = max(tamanos, key=tamanos.get) if tamanos else ''
+        filas.append({
+            'Sesión': id_sesion[:8],
+            'Claves': len(tamanos),
+            'KB': sum(tamanos.values()) / 1024,
+            'Clave más grande': mayor,
+            'KB clave más grande': tamanos.get(mayor, 0) / 1024
+        })
+    df_sesiones = pd.DataFrame(filas).sort_values('KB', ascending=False)
+    st.caption(f"{len(df_sesiones)} sesiones · {df_sesiones['KB'].sum() / 1024:.2f} MB en total")
+    st.dataframe(df_sesiones, use_container_width=True, hide_index=True,
+                 column_config={'KB': st.column_config.NumberColumn(format="%.1f"),
+                                'KB clave más grande': st.column_config.NumberColumn(format="%.1f")})
@@ -0,0 +1,224 @@
+"""API HTTP de solo lectura con los agregados del mapeo, en JSON.
+
+Servicio independiente de Streamlit que usa la misma capa de datos que la app
+(tabla compartida con recarga cada minuto, filtros y agregados de resultados).
+Cada respuesta lleva como ETag la versión de datos: un cliente que sondea con
+If-None-Match recibe 304 sin cuerpo mientras los datos no cambien, y los
+resultados ya calculados para una versión se sirven desde una caché en memoria.
+
+Rutas:
+    GET /v1/version                      versión de datos y número de respuestas
+    GET /v1/agregados?pais=Colombia      conteos, promedios y distribuciones de una cohorte
+    GET /v1/distribucion?por=edad        respuestas y promedios por grupo
+
+Filtros (todas las rutas de datos): pais, ciudad, edad, nivel_academico,
+digitalizacion y formalizacion (bajo, medio o alto), labores, artista.
+`por` acepta pais, ciudad, edad, nivel_academico, banda_digitalizacion y
+banda_formalizacion. Los grupos con menos de --minimo respuestas no se publican.
+
+Uso:
+    python api_agregados.py --puerto 8502
+    python api_agregados.py --csv respuestas.csv --host 0.0.0.0
+"""
+import argparse
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+
+from datos import (
+    LABORES_OPCIONES, RANGOS_MEDICION, calcular_opciones_filtros, calcular_version_datos, cargar_datos_compartidos,
+    filtrar_datos
+)
+from exportar_agregados import serializar
+from exportar_datos import MINIMO_CIUDAD
+from generar_reportes import cargar_tabla
+from graficos import calcular_agregados
+
+FILTROS_API = ['pais', 'ciudad', 'edad', 'nivel_academico', 'digitalizacion', 'formalizacion', 'labores', 'artista']
+BANDAS = {'bajo': RANGOS_MEDICION[1], 'medio': RANGOS_MEDICION[2], 'alto': RANGOS_MEDICION[3]}
+DIMENSIONES_API = ['pais', 'ciudad', 'edad', 'nivel_academico', 'banda_digitalizacion', 'banda_formalizacion']
+COLUMNAS_PROMEDIO = ['nivel_formalizacion', 'nivel_digitalizacion', 'tipo_org_score',
+                     'num_organizaciones', 'num_proyectos', 'num_labores', 'num_herramientas', 'num_ias']
+RUTAS_API = ['/v1/version', '/v1/agregados', '/v1/distribucion']
+MAX_RESULTADOS = 512
+# Filtro categórico -> clave de sus opciones en calcular_opciones_filtros
+OPCIONES_FILTROS = {'pais': 'pais', 'ciudad': 'ciudad', 'edad': 'edad', 'nivel_academico': 'nivel_academico',
+                    'artista': 'artista_independiente'}
+
+class ConsultaInvalida(ValueError):
+    """Parámetros de consulta que la API no acepta (respuesta 400)"""
+
+# ==================== CONSULTAS ====================
+
+def leer_filtros(parametros, opciones):
+    """Filtros de filtrar_datos a partir de los parámetros de la URL; solo acepta valores conocidos"""
+    filtros = {}
+    for clave, valor in parametros.items():
+        if clave == 'por':
+            continue
+        if clave not in FILTROS_API:
+            raise ConsultaInvalida(f"Parámetro desconocido: {clave}")
+        if clave in ('digitalizacion', 'formalizacion'):
+            if valor.lower() not in BANDAS:
+                raise ConsultaInvalida(f"{clave} debe ser bajo, medio o alto")
+            valor = BANDAS[valor.lower()]
+        elif clave == 'labores':
+            if valor not in LABORES_OPCIONES:
+                raise ConsultaInvalida(f"labores debe ser una de: {', '.join(LABORES_OPCIONES)}")
+        elif valor not in opciones[OPCIONES_FILTROS[clave]]:
+            raise ConsultaInvalida(f"Valor desconocido para {clave}: {valor}")
+        filtros[clave] = valor
+    return filtros
+
+def bandas(serie):
+    """Banda de RANGOS_MEDICION de cada nivel (0-100), con los mismos cortes que filtrar_rango"""
+    return pd.cut(serie, [-float('inf'), 33, 66, float('inf')], labels=RANGOS_MEDICION[1:])
+
+def calcular_distribucion(df_filtrado, por, minimo):
+    """Respuestas y promedios por grupo en una sola agrupación; los grupos pequeños se omiten"""
+    grupos = bandas(df_filtrado[f"nivel_{por[len('banda_'):]}"]) if por.startswith('banda_') else df_filtrado[por]
+    agrupado = df_filtrado[COLUMNAS_PROMEDIO].groupby(grupos, observed=True)
+    conteos = agrupado.size().sort_values(ascending=False)
+    medias = agrupado.mean()
+
+    filas = []
+    omitidas = 0
+    for valor, n in conteos.items():
+        if valor == '':
+            continue
+        if n < minimo:
+            omitidas += int(n)
+            continue
+        filas.append({
+            'valor': str(valor),
+            'respuestas': int(n),
+            'promedios': {c: round(float(medias.at[valor, c]), 4) for c in COLUMNAS_PROMEDIO}
+        })
+    return {'grupos': filas, 'respuestas_omitidas': omitidas}
+
+def responder_consulta(df_datos, version_datos, ruta, parametros, minimo):
+    """Contenido JSON de una ruta de la API"""
+    if ruta == '/v1/version':
+        return {'version_datos': version_datos, 'respuestas': int(len(df_datos))}
+
+    filtros = leer_filtros(parametros, calcular_opciones_filtros(version_datos, df_datos))
+    df_filtrado = filtrar_datos(df_datos, filtros)
+    contenido = {'version_datos': version_datos, 'filtros': filtros}
+
+    if ruta == '/v1/agregados':
+        if len(df_filtrado) < minimo:
+            # Con muy pocas respuestas los agregados describirían a personas concretas
+            return {**contenido, 'respuestas': int(len(df_filtrado)), 'suprimido': True}
+        return {**contenido, **calcular_agregados(df_filtrado, minimo)}
+
+    por = parametros.get('por')
+    if por not in DIMENSIONES_API:
+        raise ConsultaInvalida(f"'por' debe ser uno de: {', '.join(DIMENSIONES_API)}")
+    return {**contenido, 'por': por, 'respuestas': int(len(df_filtrado)),
+            **calcular_distribucion(df_filtrado, por, minimo)}
+
+# ==================== SERVIDOR ====================
+
+def crear_servidor(host, puerto, obtener_datos, minimo=MINIMO_CIUDAD):
+    """Servidor HTTP con los agregados; obtener_datos() devuelve (df, versión)"""
+    resultados = OrderedDict()  # (versión, ruta, consulta) -> bytes, LRU
+    lock = threading.Lock()
+
+    class Manejador(BaseHTTPRequestHandler):
+        def enviar(self, codigo, cuerpo=b'', etag=None):
+            self.send_response(codigo)
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Expose-Headers', 'ETag')
+            if etag:
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'public, no-cache')
+            if codigo != 304:
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(cuerpo)))
+            self.end_headers()
+            if codigo != 304 and self.command != 'HEAD':
+                self.wfile.write(cuerpo)
+
+        def enviar_error(self, codigo, mensaje):
+            self.enviar(codigo, serializar({'error': mensaje}))
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path not in RUTAS_API:
+                self.enviar_error(404, f"Ruta desconocida: {url.path}")
+                return
+            df_datos, version_datos = obtener_datos()
+            if version_datos is None:
+                self.enviar_error(503, "Aún no hay respuestas cargadas")
+                return
+
+            # La versión de datos identifica el contenido de cualquier consulta sobre ella
+            etag = f'"{version_datos}"'
+            revalidadas = [v.strip().removeprefix('W/') for v in self.headers.get('If-None-Match', '').split(',')]
+            if etag in revalidadas or '*' in revalidadas:
+                self.enviar(304, etag=etag)
+                return
+
+            parametros = dict(parse_qsl(url.query))
+            clave = (version_datos, url.path, tuple(sorted(parametros.items())))
+            with lock:
+                cuerpo = resultados.get(clave)
+                if cuerpo is not None:
+                    resultados.move_to_end(clave)
+            if cuerpo is None:
+                try:
+                    contenido = responder_consulta(df_datos, version_datos, url.path, parametros, minimo)
+                except ConsultaInvalida as e:
+                    self.enviar_error(400, str(e))
+                    return
+                except Exception as e:
+                    self.log_error("Error respondiendo %s: %s: %s", self.path, type(e).__name__, e)
+                    self.enviar_error(500, "Error interno")
+                    return
+                cuerpo = serializar(contenido)
+                with lock:
+                    resultados[clave] = cuerpo
+                    while len(resultados) > MAX_RESULTADOS:
+                        resultados.popitem(last=False)
+            self.enviar(200, cuerpo, etag)
+
+        do_HEAD = do_GET
+
+    return ThreadingHTTPServer((host, puerto), Manejador)
+
+def main():
+    parser = argparse.ArgumentParser(description="API JSON de solo lectura con los agregados del mapeo")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8502)
+    parser.add_argument('--csv', help="CSV exportado de la hoja (por defecto se lee Google Sheets cada minuto)")
+    parser.add_argument('--minimo', type=int, default=MINIMO_CIUDAD,
+                        help="Respuestas mínimas para publicar un grupo o una cohorte")
+    args = parser.parse_args()
+
+    # Fuera del servidor de Streamlit las cachés avisan en cada llamada
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    if args.csv:
+        df = cargar_tabla(args.csv)
+        fijo = (df, calcular_version_datos(df) if len(df) else None)
+
+        def obtener_datos():
+            return fijo
+    else:
+        obtener_datos = cargar_datos_compartidos
+
+    servidor = crear_servidor(args.host, args.puerto, obtener_datos, args.minimo)
+    print(f"API de agregados en http://{args.host}:{args.puerto}/v1/version")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
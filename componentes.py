@@ -0,0 +1,65 @@
+"""Piezas ligeras compartidas por la app y sus páginas (sin pandas ni Google Sheets)"""
+import streamlit as st
+import html
+import hmac
+import os
+
+# ==================== ADMINISTRACIÓN ====================
+
+def obtener_token_admin():
+    """Token de administración desde variable de entorno o Streamlit Secrets"""
+    if os.environ.get('ADMIN_TOKEN'):
+        return os.environ['ADMIN_TOKEN']
+    try:
+        return st.secrets.get("admin_token", "")
+    except Exception:
+        return ""
+
+def es_admin():
+    """Las vistas de administración se habilitan abriendo la app con ?admin=<token>"""
+    token = obtener_token_admin()
+    return bool(token) and hmac.compare_digest(str(st.query_params.get('admin', '')), str(token))
+
+# ==================== VIDEOS ====================
+
+def youtube_embed(video_id, title="YouTube video player", diferido=True):
+    """Devuelve el HTML de un video de YouTube responsivo (16:9)
+
+    Con diferido=True el iframe arranca con una miniatura y un botón de play
+    (srcdoc, sin JavaScript de YouTube) y solo carga el reproductor al hacer clic.
+    loading="lazy" evita cargar los videos que aún no están en pantalla.
+    """
+    src = f"https://www.youtube.com/embed/{video_id}"
+    srcdoc = ""
+    if diferido:
+        src += "?autoplay=1"
+        miniatura = f"""
+        <style>
+            * {{ margin: 0; padding: 0; overflow: hidden; }}
+            html, body, a, img {{ height: 100%; width: 100%; }}
+            img {{ object-fit: cover; }}
+            a {{ display: block; position: relative; }}
+            span {{ position: absolute; top: 50%; left: 50%; transform: translate(-50%, -50%);
+                    width: 68px; height: 48px; border-radius: 12px; background: #EA185E;
+                    color: white; font: 28px/48px sans-serif; text-align: center; }}
+        </style>
+        <a href="{src}" aria-label="Reproducir: {html.escape(title)}">
+            <img src="https://i.ytimg.com/vi/{video_id}/hqdefault.jpg" alt="{html.escape(title)}" loading="lazy">
+            <span>&#9654;</span>
+        </a>
+        """
+        # En una sola línea para que el markdown de Streamlit no parta el bloque HTML
+        srcdoc = f'srcdoc="{html.escape(" ".join(miniatura.split()))}"'
+    return f"""
+    <div style="position: relative; padding-bottom: 56.25%; height: 0; overflow: hidden; border-radius: 12px; margin-bottom: 1rem;">
+        <iframe src="{src}"
+                {srcdoc}
+                title="{html.escape(title)}"
+                loading="lazy"
+                style="position: absolute; top: 0; left: 0; width: 100%; height: 100%; border: 0;"
+                allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture; web-share"
+                referrerpolicy="strict-origin-when-cross-origin"
+                allowfullscreen>
+        </iframe>
+    </div>
+    """
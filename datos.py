@@ -0,0 +1,849 @@
+"""Capa de datos del mapeo: puntajes, Google Sheets, preparación y filtros de respuestas"""
+import streamlit as st
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+import numpy as np
+import pandas as pd
+import gspread
+from gspread.utils import numericise_all
+from google.oauth2.service_account import Credentials
+import pycountry
+import geonamescache
+
+from metricas import (
+    incrementar, medir_sheets, registrar_consulta_cache, registrar_fallo_cache
+)
+
+# ==================== FUNCIONES DE CÁLCULO ====================
+
+# Pesos del modelo de puntajes (también los usa el simulador de puntajes)
+PUNTAJES_TIPO_ORGANIZACION = {
+    'Empresa grande (más de 100 personas)': 10,
+    'Empresa mediana (entre 50 y 100 personas)': 8,
+    'Empresa pequeña (menos de 50 personas)': 5,
+    'Emprendimiento': 2,
+    'Organización educativa privada': -2,
+    'Asociación civil, ONG, cooperativa o colectivo': -5,
+    'Organización educativa pública': -7,
+    'Organización pública': -10
+}
+
+PUNTAJES_JERARQUIA = {
+    'Altamente jerarquizadas': 25,
+    'En general menos de 3 niveles jerárquicos': 18,
+    'Nos repartimos los liderazgos y funciones': 10,
+    'No reconozco jerarquías': 0
+}
+
+PUNTAJES_PLANEACION = {
+    'Hago o llevo un plan estratégico periódico y se revisa por la dirección': 25,
+    'Tengo un plan estratégico que se comunica de manera oficial': 20,
+    'Tengo un plan estratégico pero no lo comunico': 15,
+    'Participo en el desarrollo del plan estratégico en colectivo': 10,
+    'Planeación intuitiva': 5,
+    'No tengo ninguna planeación': 0
+}
+
+PUNTAJES_FUNCIONES = {
+    'Roles claramente identificados y bajo contrato': 25,
+    'Roles identificados y formalizados': 20,
+    'Roles informales pero identificables': 12,
+    'Roles informales fluidos': 6,
+    'No tengo roles definidos': 0
+}
+
+PUNTAJES_IDENTIDAD = {
+    'Marca con manual definido': 25,
+    'Marca definida, identidad informal': 18,
+    'Una marca más bien fluida': 12,
+    'Llevo una marca por línea de trabajo': 8,
+    'Sin identidad definida': 0
+}
+
+# Multiplicadores de importancia
+MULTIPLICADORES_HERRAMIENTAS = {
+    "Totalmente fundamentales": 1.0,
+    "Fundamentales para algunas tareas": 0.75,
+    "Muy poco fundamentales": 0.5,
+    "Nada no las uso tanto": 0.25
+}
+MULTIPLICADORES_IAS = {
+    "Totalmente fundamentales": 1.0,
+    "Fundamentales para algunas tareas": 0.75,
+    "Me aportan muy poco no las uso tanto": 0.5,
+    "No sé utilizarlas muy bien quisiera manejarlas mejor": 0.25
+}
+MULTIPLICADORES_COMUNIDADES = {
+    "Totalmente fundamentales participo de forma activa": 1.0,
+    "Fundamentales en algunos casos": 0.75,
+    "Muy poco fundamentales no participo casi nunca": 0.5,
+    "No las uso solo estoy inscrito pero no participo": 0.25
+}
+
+# Digitalización: (puntos por elemento, tope) de cada conteo
+TOPES_DIGITALIZACION = {
+    'num_herramientas': (3, 30),
+    'num_herramientas_pagadas': (2, 10),
+    'num_ias': (4, 30),
+    'num_ias_pagadas': (2, 10),
+    'num_comunidades': (3, 20)
+}
+
+def calcular_tipo_organizacion_score(tipo_org):
+    return PUNTAJES_TIPO_ORGANIZACION.get(tipo_org, 0)
+
+def calcular_nivel_formalizacion(respuesta):
+    puntaje = 0
+    puntaje += PUNTAJES_JERARQUIA.get(respuesta.get('jerarquia', ''), 0)
+    puntaje += PUNTAJES_PLANEACION.get(respuesta.get('planeacion', ''), 0)
+    puntaje += PUNTAJES_FUNCIONES.get(respuesta.get('funciones', ''), 0)
+    puntaje += PUNTAJES_IDENTIDAD.get(respuesta.get('identidad', ''), 0)
+    return puntaje
+
+def calcular_nivel_digitalizacion(respuesta):
+    # Obtener multiplicadores según respuestas
+    mult_herr = MULTIPLICADORES_HERRAMIENTAS.get(respuesta.get('importancia_herramientas', ''), 1.0)
+    mult_ias = MULTIPLICADORES_IAS.get(respuesta.get('importancia_ias', ''), 1.0)
+    mult_com = MULTIPLICADORES_COMUNIDADES.get(respuesta.get('importancia_comunidades', ''), 1.0)
+
+    puntaje = 0
+
+    # Herramientas utilizadas: 30 pts máx
+    puntos, tope = TOPES_DIGITALIZACION['num_herramientas']
+    puntaje += min(respuesta.get('num_herramientas', 0) * puntos, tope) * mult_herr
+
+    # Herramientas pagadas: 10 pts máx
+    puntos, tope = TOPES_DIGITALIZACION['num_herramientas_pagadas']
+    puntaje += min(respuesta.get('num_herramientas_pagadas', 0) * puntos, tope) * mult_herr
+
+    # IAs utilizadas: 30 pts máx
+    puntos, tope = TOPES_DIGITALIZACION['num_ias']
+    puntaje += min(respuesta.get('num_ias', 0) * puntos, tope) * mult_ias
+
+    # IAs pagadas: 10 pts máx
+    puntos, tope = TOPES_DIGITALIZACION['num_ias_pagadas']
+    puntaje += min(respuesta.get('num_ias_pagadas', 0) * puntos, tope) * mult_ias
+
+    # Comunidades: 20 pts máx
+    puntos, tope = TOPES_DIGITALIZACION['num_comunidades']
+    puntaje += min(respuesta.get('num_comunidades', 0) * puntos, tope) * mult_com
+
+    return round(min(puntaje, 100))
+
+def calcular_tipo_org_score_total(organizaciones):
+    """Calcula el score total de tipo de organización (limitado a -10 a +10)"""
+    total = 0
+    for org in organizaciones:
+        total += calcular_tipo_organizacion_score(org.get('tipo', ''))
+    return max(-10, min(total, 10))
+
+def puntajes_respuesta(respuesta):
+    """Los tres puntajes de una respuesta de la encuesta, como se guardan en la hoja"""
+    return {
+        'tipo_org_score': calcular_tipo_org_score_total(respuesta.get('organizaciones', [])),
+        'nivel_formalizacion': calcular_nivel_formalizacion(respuesta.get('herramientas_admin', {})),
+        'nivel_digitalizacion': calcular_nivel_digitalizacion(respuesta.get('herramientas_digitales', {}))
+    }
+
+# ==================== GOOGLE SHEETS ====================
+# CÓDIGO MODIFICADO PARA FUNCIONAR EN RAILWAY Y STREAMLIT CLOUD
+
+SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive'
+]
+
+def obtener_credenciales_google():
+    """
+    Obtiene las credenciales de Google desde:
+    1. Variables de entorno (Railway, Render, etc.)
+    2. Streamlit Secrets (Streamlit Cloud)
+    """
+    # Opción 1: Variable de entorno GOOGLE_CREDENTIALS (Railway/Render)
+    if os.environ.get('GOOGLE_CREDENTIALS'):
+        try:
+            creds_json = json.loads(os.environ['GOOGLE_CREDENTIALS'])
+            spreadsheet_id = os.environ.get('SPREADSHEET_ID', '')
+            return creds_json, spreadsheet_id, None
+        except json.JSONDecodeError as e:
+            return None, None, f"Error parseando GOOGLE_CREDENTIALS: {e}"
+
+    # Opción 2: Streamlit Secrets (Streamlit Cloud)
+    try:
+        if "gcp_service_account" in st.secrets:
+            creds = dict(st.secrets["gcp_service_account"])
+            spreadsheet_id = st.secrets.get("google_sheets", {}).get("spreadsheet_id", "")
+            return creds, spreadsheet_id, None
+    except Exception:
+        pass
+
+    return None, None, "No se encontraron credenciales de Google (ni en variables de entorno ni en Streamlit Secrets)"
+
+@st.cache_resource(ttl=300)  # Cache por 5 minutos
+def obtener_cliente_gspread():
+    """Obtiene cliente gspread con caché para evitar múltiples autenticaciones"""
+    try:
+        creds_info, _, error = obtener_credenciales_google()
+
+        if error:
+            return None, error
+
+        if creds_info is None:
+            return None, "No se encontraron credenciales de Google"
+
+        required_fields = ["type", "project_id", "private_key", "client_email"]
+        for field in required_fields:
+            if field not in creds_info:
+                return None, f"Falta el campo '{field}' en las credenciales"
+
+        credentials = Credentials.from_service_account_info(
+            creds_info,
+            scopes=SCOPES
+        )
+        client = gspread.authorize(credentials)
+        return client, None
+    except Exception as e:
+        return None, str(e)
+
+@st.cache_resource(ttl=300)  # Cache la hoja por 5 minutos
+def obtener_spreadsheet():
+    """Obtiene el spreadsheet completo con caché"""
+    registrar_fallo_cache('spreadsheet')
+    client, error = obtener_cliente_gspread()
+    if client is None:
+        return None, error
+    try:
+        _, spreadsheet_id, error = obtener_credenciales_google()
+        if error or not spreadsheet_id:
+            return None, "No se encontró el ID del spreadsheet"
+        with medir_sheets('open_by_key'):
+            spreadsheet = client.open_by_key(spreadsheet_id)
+        revisar_encabezados(spreadsheet.sheet1)
+        return spreadsheet, None
+    except Exception as e:
+        return None, str(e)
+
+def conectar_google_sheets(mostrar_errores=True):
+    """Conecta con Google Sheets usando spreadsheet cacheado"""
+    try:
+        registrar_consulta_cache('spreadsheet')
+        spreadsheet, error = obtener_spreadsheet()
+        if spreadsheet is None:
+            # Un fallo transitorio (429, 5xx) no se conserva en caché: el reintento vuelve a abrir el libro
+            obtener_spreadsheet.clear()
+            if mostrar_errores:
+                st.error(f"❌ {error}")
+            return None
+        return spreadsheet.sheet1
+    except gspread.exceptions.SpreadsheetNotFound:
+        if mostrar_errores:
+            st.error("❌ No se encontró la hoja de cálculo. Verifica el ID del spreadsheet.")
+        return None
+    except gspread.exceptions.APIError as e:
+        if mostrar_errores:
+            st.error(f"❌ Error de API de Google: {e}")
+        return None
+    except Exception as e:
+        if mostrar_errores:
+            st.error(f"❌ Error conectando: {type(e).__name__}: {e}")
+        return None
+
+# Mismo orden en que guardar_respuesta_sheets escribe cada fila
+HEADERS_SHEETS = [
+    'timestamp', 'num_organizaciones', 'num_proyectos', 'labores_profesionales', 'artista_independiente',
+    'organizaciones_tipos', 'organizaciones_cargos', 'proyectos_nombres', 'proyectos_cargos',
+    'jerarquia', 'planeacion', 'ecosistema', 'redes', 'funciones', 'liderazgo', 'liderazgo_propio',
+    'identidad', 'importancia_formalidad', 'herramientas_admin_conoce', 'herramientas_admin_aplica',
+    'herramientas', 'herramientas_pagadas', 'importancia_herramientas',
+    'ias', 'ias_pagadas', 'importancia_ias', 'comunidades', 'importancia_comunidades', 'asociacion_artistas',
+    'pais', 'ciudad', 'edad', 'nivel_academico', 'nombre', 'correo', 'telefono',
+    'entrevista', 'convocatorias', 'mascaras', 'tipo_org_score', 'nivel_formalizacion',
+    'nivel_digitalizacion', 'clave_envio'
+]
+
+def revisar_encabezados(sheet):
+    """Agrega el encabezado clave_envio a las hojas creadas antes de que existiera.
+
+    Sin ese encabezado la hoja no devuelve las claves, así que las escrituras locales
+    solo se combinan si la hoja tiene la columna o si se pudo agregar.
+    """
+    escrituras = obtener_escrituras_locales()
+    try:
+        with medir_sheets('row_values'):
+            encabezados = sheet.row_values(1)
+        if 'clave_envio' not in encabezados and encabezados == HEADERS_SHEETS[:-1]:
+            with medir_sheets('update_cell'):
+                sheet.update_cell(1, len(HEADERS_SHEETS), 'clave_envio')
+            encabezados = encabezados + ['clave_envio']
+    except Exception:
+        # Un fallo transitorio no cambia el estado: se vuelve a revisar al reabrir el libro
+        return
+    with escrituras['lock']:
+        escrituras['activas'] = 'clave_envio' in encabezados
+        if not escrituras['activas']:
+            escrituras['registros'] = []
+            escrituras['combinada'] = None
+
+# ==================== ENVÍOS IDEMPOTENTES ====================
+
+def nuevo_temp_data():
+    """Datos temporales de una nueva respuesta, con su clave de envío única"""
+    return {'clave_envio': uuid.uuid4().hex}
+
+@st.cache_resource
+def obtener_indice_envios():
+    """Claves de envío ya guardadas (en la hoja o por este proceso)"""
+    return {'lock': threading.Lock(), 'claves': set(), 'sembrado': False}
+
+def sembrar_indice_envios(claves):
+    """Agrega al índice las claves que ya están persistidas en la hoja"""
+    indice = obtener_indice_envios()
+    with indice['lock']:
+        indice['claves'].update(clave for clave in claves if clave)
+        indice['sembrado'] = True
+
+def reservar_envio(clave):
+    """True si la clave es nueva y queda reservada; False si esa respuesta ya se guardó"""
+    indice = obtener_indice_envios()
+    if not indice['sembrado']:
+        # Hasta que una lectura de la hoja funcione, cada envío vuelve a intentar cargar sus claves
+        cargar_datos_compartidos()
+    with indice['lock']:
+        if clave in indice['claves']:
+            return False
+        indice['claves'].add(clave)
+        return True
+
+def liberar_envio(clave):
+    """Quita una reserva cuya escritura no se completó, para permitir el reintento"""
+    indice = obtener_indice_envios()
+    with indice['lock']:
+        indice['claves'].discard(clave)
+
+def encontrar_duplicados(registros):
+    """Filas repetidas en una sola pasada: mismo contenido sin contar el timestamp.
+
+    Los reintentos comparten la clave de envío y las respuestas anteriores a la
+    clave coinciden en todo lo demás, así que ambos casos quedan en el mismo grupo.
+    """
+    df = pd.DataFrame(registros).astype(str)
+    if df.empty:
+        return df
+    df.index = df.index + 2  # Número de fila en la hoja (la 1 es el encabezado)
+
+    contenido = [c for c in df.columns if c != 'timestamp']
+    huellas = pd.util.hash_pandas_object(df[contenido], index=False)
+    repetidas = huellas.duplicated(keep=False).to_numpy()
+
+    duplicados = df[repetidas].assign(grupo=pd.factorize(huellas[repetidas])[0] + 1)
+    columnas = ['grupo', 'timestamp', 'pais', 'ciudad', 'clave_envio']
+    return duplicados[[c for c in columnas if c in duplicados.columns]].rename_axis('fila').sort_values(['grupo', 'fila'])
+
+def guardar_respuesta_sheets(respuesta, max_reintentos=3):
+    """Guarda una respuesta en Google Sheets con reintentos para rate limiting"""
+
+    # Preparar los datos para la fila ANTES de conectar (para minimizar tiempo de conexión)
+    puntajes = puntajes_respuesta(respuesta)
+    fila = [
+        respuesta.get('demograficos', {}).get('timestamp', ''),
+        respuesta.get('num_organizaciones', 0),
+        respuesta.get('num_proyectos', 0),
+        '|'.join(respuesta.get('labores_profesionales', [])),
+        respuesta.get('artista_independiente', ''),
+        '|'.join([org.get('tipo', '') for org in respuesta.get('organizaciones', [])]),
+        '|'.join([org.get('cargo', '') for org in respuesta.get('organizaciones', [])]),
+        '|'.join([proy.get('nombre', '') for proy in respuesta.get('proyectos', [])]),
+        '|'.join([proy.get('cargo', '') for proy in respuesta.get('proyectos', [])]),
+        respuesta.get('herramientas_admin', {}).get('jerarquia', ''),
+        respuesta.get('herramientas_admin', {}).get('planeacion', ''),
+        respuesta.get('herramientas_admin', {}).get('ecosistema', ''),
+        respuesta.get('herramientas_admin', {}).get('redes', ''),
+        respuesta.get('herramientas_admin', {}).get('funciones', ''),
+        respuesta.get('herramientas_admin', {}).get('liderazgo', ''),
+        respuesta.get('herramientas_admin', {}).get('liderazgo_propio', ''),
+        respuesta.get('herramientas_admin', {}).get('identidad', ''),
+        respuesta.get('herramientas_admin', {}).get('importancia_formalidad', ''),
+        '|'.join(respuesta.get('herramientas_admin', {}).get('herramientas_admin_conoce', [])),
+        '|'.join(respuesta.get('herramientas_admin', {}).get('herramientas_admin_aplica', [])),
+        '|'.join(respuesta.get('herramientas_digitales', {}).get('herramientas', [])),
+        '|'.join(respuesta.get('herramientas_digitales', {}).get('herramientas_pagadas', [])),
+        respuesta.get('herramientas_digitales', {}).get('importancia_herramientas', ''),
+        '|'.join(respuesta.get('herramientas_digitales', {}).get('ias', [])),
+        '|'.join(respuesta.get('herramientas_digitales', {}).get('ias_pagadas', [])),
+        respuesta.get('herramientas_digitales', {}).get('importancia_ias', ''),
+        '|'.join(respuesta.get('herramientas_digitales', {}).get('comunidades', [])),
+        respuesta.get('herramientas_digitales', {}).get('importancia_comunidades', ''),
+        respuesta.get('herramientas_digitales', {}).get('asociacion_artistas', ''),
+        respuesta.get('demograficos', {}).get('pais', ''),
+        respuesta.get('demograficos', {}).get('ciudad', ''),
+        respuesta.get('demograficos', {}).get('edad', ''),
+        respuesta.get('demograficos', {}).get('nivel_academico', ''),
+        respuesta.get('demograficos', {}).get('nombre', ''),
+        respuesta.get('demograficos', {}).get('correo', ''),
+        respuesta.get('demograficos', {}).get('telefono', ''),
+        respuesta.get('demograficos', {}).get('entrevista', ''),
+        '|'.join(respuesta.get('demograficos', {}).get('convocatorias', [])),
+        respuesta.get('demograficos', {}).get('mascaras', ''),
+        puntajes['tipo_org_score'],
+        puntajes['nivel_formalizacion'],
+        puntajes['nivel_digitalizacion'],
+        respuesta.get('clave_envio', '')
+    ]
+
+    # Un doble click o un reintento de una respuesta ya guardada no vuelve a escribir
+    clave_envio = respuesta.get('clave_envio', '')
+    if clave_envio and not reservar_envio(clave_envio):
+        incrementar('envios_total', resultado='duplicado')
+        st.success("✅ Respuesta guardada correctamente")
+        return True
+
+    escrita = False
+    incrementar('envios_en_curso')
+    try:
+        for intento in range(max_reintentos):
+            try:
+                sheet = conectar_google_sheets(mostrar_errores=(intento == max_reintentos - 1))
+                if sheet is None:
+                    if intento < max_reintentos - 1:
+                        incrementar('envios_reintentos_total', motivo='conexion')
+                        time.sleep(2 ** intento)  # Backoff exponencial: 1s, 2s, 4s
+                        continue
+                    st.error("❌ No se pudo conectar con Google Sheets")
+                    return False
+
+                with medir_sheets('append_row'):
+                    resultado = sheet.append_row(fila)
+                escrita = True
+                # La fila se suma a la tabla compartida sin volver a leer la hoja
+                if clave_envio:
+                    registrar_escritura_local(dict(zip(HEADERS_SHEETS, numericise_all([str(v) for v in fila]))),
+                                              fila_de_escritura(resultado))
+                st.success("✅ Respuesta guardada correctamente")
+                return True
+            except gspread.exceptions.APIError as e:
+                if "429" in str(e) and intento < max_reintentos - 1:
+                    incrementar('envios_reintentos_total', motivo='429')
+                    time.sleep(2 ** intento)
+                    continue
+                st.error(f"❌ Error de API al guardar: {e}")
+                st.info("💡 Verifica que la cuenta de servicio tenga permisos de Editor en el Sheet")
+                return False
+            except Exception as e:
+                st.error(f"❌ Error guardando respuesta: {type(e).__name__}: {e}")
+                return False
+
+        return False
+    finally:
+        incrementar('envios_en_curso', -1)
+        incrementar('envios_total', resultado='guardado' if escrita else 'error')
+        # También cubre reruns que interrumpen el guardado antes de escribir
+        if clave_envio and not escrita:
+            liberar_envio(clave_envio)
+
+def leer_respuestas_sheets():
+    """(respuestas, leída): leída es False si la hoja no se pudo leer, para distinguirla de una hoja vacía"""
+    sheet = conectar_google_sheets()
+    if sheet is None:
+        return [], False
+
+    try:
+        # Verificar si hay datos
+        with medir_sheets('get_all_values'):
+            all_values = sheet.get_all_values()
+        if len(all_values) <= 1:  # Solo headers o vacío
+            return [], True
+
+        with medir_sheets('get_all_records'):
+            datos = sheet.get_all_records()
+        return datos, True
+    except gspread.exceptions.APIError as e:
+        st.error(f"❌ Error de API al cargar datos: {e}")
+        return [], False
+    except Exception as e:
+        st.error(f"❌ Error cargando respuestas: {type(e).__name__}: {e}")
+        return [], False
+
+def cargar_respuestas_sheets():
+    """Carga todas las respuestas desde Google Sheets"""
+    return leer_respuestas_sheets()[0]
+
+# ==================== PREPARACIÓN DE DATOS ====================
+
+def procesar_respuestas(respuestas):
+    """Convierte los registros de Google Sheets en el DataFrame que usan las vistas"""
+    datos_procesados = []
+    for resp in respuestas:
+        herramientas_str = str(resp.get('herramientas', ''))
+        herramientas_pagadas_str = str(resp.get('herramientas_pagadas', ''))
+        ias_str = str(resp.get('ias', ''))
+        ias_pagadas_str = str(resp.get('ias_pagadas', ''))
+        comunidades_str = str(resp.get('comunidades', ''))
+        labores_str = str(resp.get('labores_profesionales', ''))
+
+        num_herramientas = len([h for h in herramientas_str.split('|') if h]) if herramientas_str else 0
+        num_herramientas_pagadas = len([h for h in herramientas_pagadas_str.split('|') if h]) if herramientas_pagadas_str else 0
+        num_ias = len([i for i in ias_str.split('|') if i and i != 'Ninguna']) if ias_str else 0
+        num_ias_pagadas = len([i for i in ias_pagadas_str.split('|') if i]) if ias_pagadas_str else 0
+        num_comunidades = len([c for c in comunidades_str.split('|') if c]) if comunidades_str else 0
+        labores_list = [l for l in labores_str.split('|') if l] if labores_str else []
+        num_labores = len(labores_list)
+
+        datos_procesados.append({
+            'num_organizaciones': resp.get('num_organizaciones', 0),
+            'num_proyectos': resp.get('num_proyectos', 0),
+            'total_entidades': resp.get('num_organizaciones', 0) + resp.get('num_proyectos', 0),
+            'tipo_org_score': max(-10, min(int(resp.get('tipo_org_score', 0) or 0), 10)),
+            'nivel_formalizacion': min(int(resp.get('nivel_formalizacion', 0) or 0), 100),
+            'nivel_digitalizacion': min(int(resp.get('nivel_digitalizacion', 0) or 0), 100),
+            'jerarquia': resp.get('jerarquia', ''),
+            'planeacion': resp.get('planeacion', ''),
+            'ecosistema': resp.get('ecosistema', ''),
+            'redes': resp.get('redes', ''),
+            'liderazgo': resp.get('liderazgo', ''),
+            'funciones': resp.get('funciones', ''),
+            'identidad': resp.get('identidad', ''),
+            'importancia_herramientas': resp.get('importancia_herramientas', ''),
+            'importancia_ias': resp.get('importancia_ias', ''),
+            'importancia_comunidades': resp.get('importancia_comunidades', ''),
+            'organizaciones_tipos': str(resp.get('organizaciones_tipos', '')),
+            'organizaciones_cargos': str(resp.get('organizaciones_cargos', '')),
+            'proyectos_nombres': str(resp.get('proyectos_nombres', '')),
+            'proyectos_cargos': str(resp.get('proyectos_cargos', '')),
+            'artista_independiente': resp.get('artista_independiente', ''),
+            'labores_profesionales': labores_str,
+            'num_labores': num_labores,
+            'herramientas': herramientas_str,
+            'ias': ias_str,
+            'comunidades': comunidades_str,
+            'num_herramientas': num_herramientas,
+            'num_herramientas_pagadas': num_herramientas_pagadas,
+            'num_ias': num_ias,
+            'num_ias_pagadas': num_ias_pagadas,
+            'num_comunidades': num_comunidades,
+            'pais': resp.get('pais', ''),
+            'ciudad': resp.get('ciudad', ''),
+            'edad': resp.get('edad', ''),
+            'nivel_academico': resp.get('nivel_academico', ''),
+            'timestamp': str(resp.get('timestamp', '')),
+            'clave_envio': str(resp.get('clave_envio', ''))
+        })
+
+    df_datos = pd.DataFrame(datos_procesados)
+
+    return df_datos
+
+def calcular_version_datos(df_datos):
+    """Huella del contenido del DataFrame, usada como clave de los cachés derivados"""
+    huella = pd.util.hash_pandas_object(df_datos, index=False).values.tobytes()
+    return f"{len(df_datos)}-{hashlib.sha1(huella).hexdigest()[:12]}"
+
+# ==================== DATOS COMPARTIDOS ====================
+# Estructuras de solo lectura que se construyen una vez por proceso y que todas
+# las sesiones referencian en lugar de copiar.
+
+# Con copy-on-write ninguna vista derivada puede modificar la tabla compartida
+# (en pandas >= 3 siempre está activo)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+@st.cache_resource(ttl=60, show_spinner=False)
+def obtener_datos_compartidos():
+    """Tabla de respuestas procesada y su versión, compartida entre sesiones por 1 minuto"""
+    registrar_fallo_cache('datos_compartidos')
+    respuestas, leida = leer_respuestas_sheets()
+    if not respuestas:
+        # Solo una lectura exitosa (aunque la hoja esté vacía) cuenta como índice cargado
+        if leida:
+            sembrar_indice_envios([])
+        return pd.DataFrame(), None
+    df_datos = procesar_respuestas(respuestas)
+    sembrar_indice_envios(df_datos['clave_envio'])
+    return df_datos, calcular_version_datos(df_datos)
+
+@st.cache_resource
+def obtener_ultima_tabla():
+    """Última tabla compartida que se cargó bien, para cuando la hoja falla o llega vacía"""
+    return {'lock': threading.Lock(), 'datos': None, 'version': None, 'momento': None}
+
+def cargar_datos_compartidos():
+    """Devuelve la tabla compartida con las respuestas recién guardadas por este proceso;
+    los resultados vacíos no se conservan en caché.
+
+    Si la hoja falla o llega vacía se usa la última tabla válida del proceso (más las
+    escrituras locales) y se avisa que los datos pueden no estar al día.
+    """
+    registrar_consulta_cache('datos_compartidos')
+    df_datos, version_datos = obtener_datos_compartidos()
+    ultima = obtener_ultima_tabla()
+    degradada = version_datos is None
+    if degradada:
+        obtener_datos_compartidos.clear()
+        with ultima['lock']:
+            anterior = (ultima['datos'], ultima['version'], ultima['momento'])
+        if anterior[1] is not None:
+            df_datos, version_datos, momento = anterior
+            incrementar('datos_degradados_total', origen='ultima_tabla')
+            st.warning(f"⚠️ No se pudo actualizar la hoja: se muestran las respuestas cargadas a las {momento:%H:%M}.")
+    else:
+        with ultima['lock']:
+            ultima.update(datos=df_datos, version=version_datos, momento=pd.Timestamp.now())
+
+    df_datos, version_datos = combinar_escrituras_locales(df_datos, version_datos)
+    if degradada and version_datos is not None and ultima['version'] is None:
+        incrementar('datos_degradados_total', origen='escrituras_locales')
+        st.warning("⚠️ No se pudo cargar la hoja: solo se muestran las respuestas enviadas recientemente "
+                   "desde este servidor.")
+    if version_datos is not None:
+        actualizar_posiciones(df_datos, version_datos)
+    return df_datos, version_datos
+
+@st.cache_resource
+def obtener_escrituras_locales():
+    """Respuestas que este proceso ya escribió en la hoja y que la tabla en caché aún no tiene"""
+    return {'lock': threading.Lock(), 'registros': [], 'version_base': None, 'combinada': None, 'activas': True}
+
+def fila_de_escritura(resultado):
+    """Número de fila de la hoja donde quedó un append_row (None si la respuesta no lo trae)"""
+    try:
+        rango = resultado['updates']['updatedRange']
+    except (TypeError, KeyError):
+        return None
+    coincidencia = re.search(r'![A-Z]+(\d+)', rango)
+    return int(coincidencia.group(1)) if coincidencia else None
+
+def registrar_escritura_local(registro, fila=None):
+    """Agrega un registro (como lo devolvería get_all_records) a las escrituras pendientes de recarga,
+    con la fila de la hoja donde se escribió"""
+    escrituras = obtener_escrituras_locales()
+    with escrituras['lock']:
+        if not escrituras['activas']:
+            return
+        escrituras['registros'].append((fila, registro))
+        escrituras['combinada'] = None
+
+def combinar_escrituras_locales(df_datos, version_datos):
+    """Tabla compartida más las escrituras locales que todavía no trae, con su propia versión.
+
+    Las filas nuevas van al final, como en la hoja, así que las cachés incrementales
+    (serie de envíos, perfiles) solo procesan esas filas. Una escritura deja de estar
+    pendiente cuando la recarga trae su clave de envío o ya llega hasta su fila.
+    """
+    escrituras = obtener_escrituras_locales()
+    with escrituras['lock']:
+        if not escrituras['registros']:
+            return df_datos, version_datos
+        if escrituras['combinada'] is not None and escrituras['version_base'] == version_datos:
+            return escrituras['combinada']
+
+        guardadas = set(df_datos['clave_envio']) if 'clave_envio' in df_datos.columns else set()
+        # La fila 1 es el encabezado: la tabla llega hasta la fila len(df_datos) + 1 de la hoja
+        ultima_fila = len(df_datos) + 1
+        escrituras['registros'] = [
+            (fila, registro) for fila, registro in escrituras['registros']
+            if registro['clave_envio'] not in guardadas and (fila is None or fila > ultima_fila)
+        ]
+        if not escrituras['registros']:
+            escrituras['combinada'] = None
+            return df_datos, version_datos
+
+        nuevas = procesar_respuestas([registro for _, registro in escrituras['registros']])
+        combinada = pd.concat([df_datos, nuevas], ignore_index=True) if len(df_datos) else nuevas
+        escrituras['version_base'] = version_datos
+        escrituras['combinada'] = (combinada, calcular_version_datos(combinada))
+        return escrituras['combinada']
+
+@st.cache_resource(max_entries=4)
+def calcular_opciones_filtros(version_datos, _df_datos):
+    """Opciones de los filtros del mapeo, una vez por versión de datos"""
+    def opciones(serie):
+        return ('Todos',) + tuple(sorted(v for v in serie.unique().tolist() if v))
+
+    return {
+        'pais': opciones(_df_datos['pais']),
+        'ciudad': opciones(_df_datos['ciudad']),
+        'ciudades_por_pais': {pais: opciones(grupo) for pais, grupo in _df_datos.groupby('pais')['ciudad']},
+        'edad': opciones(_df_datos['edad']),
+        'nivel_academico': opciones(_df_datos['nivel_academico']),
+        'artista_independiente': opciones(_df_datos['artista_independiente'])
+    }
+
+@st.cache_resource
+def obtener_geonames():
+    """Instancia única de GeonamesCache (carga el JSON de ciudades una sola vez)"""
+    return geonamescache.GeonamesCache()
+
+@st.cache_resource
+def obtener_paises():
+    """Países disponibles en la encuesta"""
+    return tuple(sorted(country.name for country in pycountry.countries))
+
+@st.cache_resource
+def obtener_codigos_paises():
+    """Nombre de país (como lo guarda la encuesta) -> código alpha_2"""
+    return {country.name: country.alpha_2 for country in pycountry.countries}
+
+@st.cache_resource
+def obtener_ciudades_por_pais():
+    """Código de país -> ciudades ordenadas alfabéticamente"""
+    ciudades = {}
+    for city in obtener_geonames().get_cities().values():
+        ciudades.setdefault(city["countrycode"], []).append(city["name"])
+    return {codigo: tuple(sorted(nombres)) for codigo, nombres in ciudades.items()}
+
+# ==================== POSICIÓN DE UNA RESPUESTA ====================
+# Puntajes de todas las respuestas ordenados (en general y por país), para ubicar
+# una respuesta con búsqueda binaria sin recorrer la tabla ni leer la hoja. La
+# respuesta recién enviada se suma a los arreglos si el índice todavía no la tiene.
+
+COLUMNAS_POSICION = ['nivel_formalizacion', 'nivel_digitalizacion', 'tipo_org_score']
+MINIMO_PAIS_POSICION = 5
+
+def posiciones_vacias():
+    """Contenido del índice de posiciones antes de procesar la primera fila"""
+    return {
+        'version': None,
+        'filas': 0,
+        'ultimo_timestamp': None,
+        'todos': {columna: np.empty(0) for columna in COLUMNAS_POSICION},
+        'paises': {},
+        'claves': set()
+    }
+
+@st.cache_resource
+def obtener_posiciones():
+    """Estado compartido por el proceso: puntajes ordenados de la última versión de datos"""
+    return {'lock': threading.Lock(), **posiciones_vacias()}
+
+def insertar_ordenados(ordenados, nuevos):
+    """Inserta valores en un arreglo ordenado sin volver a ordenarlo"""
+    nuevos = np.sort(nuevos)
+    return np.insert(ordenados, np.searchsorted(ordenados, nuevos), nuevos)
+
+def actualizar_posiciones(df_datos, version_datos):
+    """Inserta solo las filas nuevas (la hoja solo crece al final), una vez por versión"""
+    posiciones = obtener_posiciones()
+    with posiciones['lock']:
+        if posiciones['version'] == version_datos:
+            return
+        filas = posiciones['filas']
+        # Si cambió alguna fila ya procesada (ediciones o borrados en la hoja) se reconstruye todo
+        if len(df_datos) < filas or (filas and df_datos['timestamp'].iat[filas - 1] != posiciones['ultimo_timestamp']):
+            posiciones.update(posiciones_vacias())
+            filas = 0
+
+        if len(df_datos) > filas:
+            nuevas = df_datos.iloc[filas:]
+            for columna in COLUMNAS_POSICION:
+                posiciones['todos'][columna] = insertar_ordenados(posiciones['todos'][columna],
+                                                                  nuevas[columna].to_numpy(dtype=float))
+            for pais, grupo in nuevas.groupby('pais'):
+                del_pais = posiciones['paises'].setdefault(
+                    pais, {columna: np.empty(0) for columna in COLUMNAS_POSICION})
+                for columna in COLUMNAS_POSICION:
+                    del_pais[columna] = insertar_ordenados(del_pais[columna], grupo[columna].to_numpy(dtype=float))
+            posiciones['claves'].update(nuevas['clave_envio'])
+            posiciones['filas'] = len(df_datos)
+            posiciones['ultimo_timestamp'] = df_datos['timestamp'].iat[-1]
+        posiciones['version'] = version_datos
+
+def percentil(ordenados, valor):
+    """Percentil (0-100) de un valor; los empates cuentan como la mitad"""
+    menores = np.searchsorted(ordenados, valor, side='left')
+    iguales = np.searchsorted(ordenados, valor, side='right') - menores
+    return float((menores + iguales / 2) / len(ordenados) * 100)
+
+def mediana_ordenados(ordenados):
+    """Mediana de un arreglo ya ordenado"""
+    n = len(ordenados)
+    return float((ordenados[(n - 1) // 2] + ordenados[n // 2]) / 2)
+
+def calcular_posicion(puntajes, pais, clave_envio=''):
+    """Percentil de cada puntaje y mediana de todas las respuestas y de las del país.
+
+    Si el índice aún no incluye la respuesta con esa clave de envío, sus puntajes se
+    insertan en copias de los arreglos ordenados. Devuelve None si no hay respuestas;
+    la comparación por país queda en None con menos de MINIMO_PAIS_POSICION respuestas.
+    """
+    posiciones = obtener_posiciones()
+    if posiciones['version'] is None:
+        # Proceso recién iniciado: se indexa la tabla compartida (una lectura de la hoja por proceso)
+        cargar_datos_compartidos()
+    with posiciones['lock']:
+        # Los arreglos se reemplazan al actualizar: basta copiar los diccionarios
+        todos = dict(posiciones['todos'])
+        del_pais = dict(posiciones['paises'].get(pais, {}))
+        incluida = not clave_envio or clave_envio in posiciones['claves']
+    if not incluida:
+        for columna in COLUMNAS_POSICION:
+            todos[columna] = insertar_ordenados(todos[columna], [float(puntajes[columna])])
+            del_pais[columna] = insertar_ordenados(del_pais.get(columna, np.empty(0)), [float(puntajes[columna])])
+    respuestas = len(todos[COLUMNAS_POSICION[0]])
+    if not respuestas:
+        return None
+    respuestas_pais = len(del_pais[COLUMNAS_POSICION[0]]) if del_pais else 0
+    if respuestas_pais < MINIMO_PAIS_POSICION:
+        del_pais = None
+
+    def ubicar(ordenados, valor):
+        return {'percentil': percentil(ordenados, valor), 'mediana': mediana_ordenados(ordenados)}
+
+    posicion = {'respuestas': respuestas, 'respuestas_pais': respuestas_pais if del_pais else 0}
+    for columna in COLUMNAS_POSICION:
+        posicion[columna] = {
+            'todos': ubicar(todos[columna], puntajes[columna]),
+            'pais': ubicar(del_pais[columna], puntajes[columna]) if del_pais else None
+        }
+    return posicion
+
+# ==================== FILTROS ====================
+
+LABORES_OPCIONES = ["Creación", "Producción", "Gestión", "Educación formal",
+                    "Educación informal", "Investigación", "Administración Pública",
+                    "Representación de artistas", "Inversionista", "Estudiante"]
+
+RANGOS_MEDICION = ['Todos', 'Bajo (0-33)', 'Medio (34-66)', 'Alto (67-100)']
+
+def filtrar_rango(df, columna, rango):
+    """Filtra un nivel (0-100) por uno de los RANGOS_MEDICION"""
+    if rango == 'Bajo (0-33)':
+        return df[df[columna] <= 33]
+    elif rango == 'Medio (34-66)':
+        return df[(df[columna] > 33) & (df[columna] <= 66)]
+    elif rango == 'Alto (67-100)':
+        return df[df[columna] > 66]
+    return df
+
+def filtrar_datos(df, filtros):
+    """Aplica filtros demográficos y de medición a un DataFrame"""
+    df_filtrado = df
+
+    if filtros.get('pais', 'Todos') != 'Todos':
+        df_filtrado = df_filtrado[df_filtrado['pais'] == filtros['pais']]
+
+    if filtros.get('ciudad', 'Todos') != 'Todos':
+        df_filtrado = df_filtrado[df_filtrado['ciudad'] == filtros['ciudad']]
+
+    if filtros.get('edad', 'Todos') != 'Todos':
+        df_filtrado = df_filtrado[df_filtrado['edad'] == filtros['edad']]
+
+    if filtros.get('nivel_academico', 'Todos') != 'Todos':
+        df_filtrado = df_filtrado[df_filtrado['nivel_academico'] == filtros['nivel_academico']]
+
+    if filtros.get('digitalizacion', 'Todos') != 'Todos':
+        df_filtrado = filtrar_rango(df_filtrado, 'nivel_digitalizacion', filtros['digitalizacion'])
+
+    if filtros.get('formalizacion', 'Todos') != 'Todos':
+        df_filtrado = filtrar_rango(df_filtrado, 'nivel_formalizacion', filtros['formalizacion'])
+
+    if filtros.get('labores', 'Todos') != 'Todos':
+        df_filtrado = df_filtrado[df_filtrado['labores_profesionales'].str.contains(filtros['labores'], na=False, regex=False)]
+
+    if filtros.get('artista', 'Todos') != 'Todos':
+        df_filtrado = df_filtrado[df_filtrado['artista_independiente'] == filtros['artista']]
+
+    return df_filtrado
@@ -0,0 +1,617 @@
+"""Páginas de la encuesta del mapeo"""
+import streamlit as st
+from datetime import datetime
+
+from datos import (
+    nuevo_temp_data, guardar_respuesta_sheets, obtener_paises, obtener_codigos_paises,
+    obtener_ciudades_por_pais, puntajes_respuesta, calcular_posicion
+)
+
+# ==================== FUNCIONES DE LA ENCUESTA ====================
+
+def mostrar_encuesta():
+    """Muestra el formulario de encuesta"""
+    if 'encuesta_page' not in st.session_state:
+        st.session_state.encuesta_page = 0
+    if 'temp_data' not in st.session_state:
+        st.session_state.temp_data = nuevo_temp_data()
+
+    if st.session_state.encuesta_page == 0:
+        pagina_intro()
+    elif st.session_state.encuesta_page == 1:
+        pagina_cantidad()
+    elif st.session_state.encuesta_page == 2:
+        pagina_herramientas_admin()
+    elif st.session_state.encuesta_page == 3:
+        pagina_herramientas_digitales()
+    elif st.session_state.encuesta_page == 4:
+        pagina_demograficos()
+    elif st.session_state.encuesta_page == 5:
+        pagina_gracias()
+
+def fuera_de_seleccion(elegidas, base):
+    """Opciones de una pregunta dependiente que no se marcaron en la pregunta de la que depende"""
+    return [opcion for opcion in elegidas if opcion not in base]
+
+def pagina_intro():
+    st.markdown("""
+    <div class="question-box" style="margin-top: 1.5rem; border-left: 4px solid #EA185E;">
+        <p style="line-height: 1.8;">
+            En el mundo del arte, la cultura y el emprendimiento social las personas solemos
+            participar en múltiples espacios, proyectos u organizaciones. Esto lo hacemos por
+            necesidades financieras en muchos casos, pero también por exploraciones estéticas,
+            sociales o personales.
+        </p>
+        <p style="line-height: 1.8; margin-top: 1rem;">
+            Definitivamente, no todos los productos o proyectos que hacemos pueden enmarcarse
+            en un solo lugar, y por eso tenemos que dividirlos. Eso plantea grandes retos para
+            la gestión de cada uno, especialmente afectados hoy en día por la digitalización.
+        </p>
+        <p style="line-height: 1.8; margin-top: 1rem;">
+            En este mapa queremos conocer de qué manera divides tu trabajo, qué necesidades de
+            gestión tienes y cómo estás apropiando herramientas digitales. Responde de manera
+            personal pero puedes enfocarte en la organización más relevante para tu trabajo o
+            en forma general.
+        </p>
+        <p style="line-height: 1.8; margin-top: 1rem; font-weight: 600;">
+            Te agradecemos mucho tu participación, te tomará alrededor de 15 minutos.<br>
+            Este estudio es clave para plantear mejoras a las formas de gestión cultural en Latinoamérica.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Checkbox de consentimiento
+    acepta_datos = st.checkbox(
+        "He leído y acepto el tratamiento de mis datos personales.",
+        key="acepta_datos"
+    )
+
+    if acepta_datos:
+        if st.button("INICIAR ENCUESTA ➡️", use_container_width=True):
+            st.session_state.temp_data = nuevo_temp_data()
+            st.session_state.encuesta_page = 1
+            st.rerun()
+    else:
+        st.button("INICIAR ENCUESTA ➡️", use_container_width=True, disabled=True)
+        st.caption("Debes aceptar el tratamiento de datos para continuar.")
+    
+    # Aviso de tratamiento de datos
+    st.markdown("""
+    <div class="question-box">
+        <h4 style="font-family: 'Roboto', sans-serif; margin-bottom: 1rem;">Aviso de Tratamiento de Datos Personales</h4>
+        <p style="line-height: 1.6; font-size: 0.95rem;">
+            Al participar en esta encuesta, autorizas el tratamiento de tus datos personales conforme a lo siguiente:
+        </p>
+        <p style="line-height: 1.6; margin-top: 0.8rem; font-size: 0.95rem;">
+            <strong>Responsables:</strong> El Chorro Producciones (Colombia) y Huika Mexihco (México),
+            en el marco del proyecto de investigación "Máscaras Ciberpiratas".
+        </p>
+        <p style="line-height: 1.6; margin-top: 0.8rem; font-size: 0.95rem;">
+            <strong>Finalidad:</strong> Tus respuestas serán utilizadas exclusivamente para fines de investigación
+            académica. Los resultados se presentarán de forma agregada y anónima.
+        </p>
+        <p style="line-height: 1.6; margin-top: 0.8rem; font-size: 0.95rem;">
+            <strong>Datos recopilados:</strong> Información sobre tu participación en organizaciones y proyectos
+            culturales, herramientas de gestión y digitales que utilizas, y datos demográficos básicos
+            (país, ciudad, rango de edad, nivel académico).
+        </p>
+        <p style="line-height: 1.6; margin-top: 0.8rem; font-size: 0.95rem;">
+            <strong>Datos opcionales:</strong> Nombre, correo electrónico y teléfono son voluntarios y solo se
+            usarán para contactarte si aceptas participar en entrevistas o convocatorias.
+        </p>
+        <p style="line-height: 1.6; margin-top: 0.8rem; font-size: 0.95rem;">
+            <strong>Derechos:</strong> Puedes solicitar acceso, corrección o eliminación de tus datos escribiendo a
+            <a href="mailto:info@elchorro.com.co" style="color: #EA185E;">info@elchorro.com.co</a>.
+        </p>
+        <p style="line-height: 1.6; margin-top: 0.8rem; font-size: 0.95rem;">
+            <strong>Protección:</strong> Tus datos se almacenan de forma segura y no serán compartidos con terceros
+            fuera del equipo de investigación.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+def pagina_cantidad():
+    st.markdown("""
+    <div class="question-box">
+        <h4 style="font-family: 'Roboto', sans-serif; margin-bottom: 1rem;">Conceptos Clave</h4>
+        <p style="line-height: 1.6;">
+            Ten en cuenta los siguientes conceptos para responder esta encuesta:
+        </p>
+        <p style="line-height: 1.6; margin-top: 0.8rem;">
+            <strong>1. ORGANIZACIÓN:</strong> Tiene límites claramente definidos, división de labores
+            y mecanismos de pertenencia establecidos. Normalmente desarrolla múltiples proyectos.
+        </p>
+        <p style="line-height: 1.6; margin-top: 0.8rem;">
+            <strong>2. PROYECTO:</strong> No tiene conformación formal necesariamente. Puede ser
+            autogestionado o realizarse dentro de una organización.
+        </p>
+        <p style="line-height: 1.6; margin-top: 0.8rem;">
+            <strong>3. ECOSISTEMA:</strong> Un ecosistema es la agrupación de campos específicos dentro
+            del campo del arte y la cultura ubicados territorialmente. Permite agrupar redes de trabajo,
+            organizaciones y personas de múltiples disciplinas.
+        </p>
+        <p style="line-height: 1.6; margin-top: 0.8rem;">
+            <strong>4. RED:</strong> Una red es un campo de organizaciones usualmente del mismo segmento
+            o disciplina las cuales colaboran entre sí para desarrollar proyectos específicos.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    preguntas_cantidad()
+
+# Fragmento: los conteos deciden cuántas organizaciones y proyectos se preguntan, así que
+# cambiarlos (o cualquier otra respuesta) solo vuelve a dibujar estas preguntas, no la app
+@st.fragment
+def preguntas_cantidad():
+    st.markdown("### De los siguientes, ¿qué labores desarrollas en tu ámbito profesional?")
+    labores_profesionales = st.multiselect(
+        "Selecciona todas las que apliquen en tu trabajo, independientemente de cuántos trabajos tengas, cuántos proyectos haces o a cuántas organizaciones perteneces:",
+        [
+            "Creación",
+            "Producción",
+            "Gestión",
+            "Educación formal",
+            "Educación informal",
+            "Investigación",
+            "Administración Pública",
+            "Representación de artistas",
+            "Inversionista",
+            "Estudiante"
+        ],
+        key="labores_profesionales"
+    )
+
+    st.markdown("### ¿Te reconoces como artista independiente o emprendedor social?")
+    artista_independiente = st.radio(
+        "Selecciona una opción:",
+        [
+            "Sí totalmente",
+            "Sí pero quisiera estar en otro segmento",
+            "Medianamente (trabajo con empresas tradicionales del sector)",
+            "Medianamente (participo activamente con organizaciones públicas o gobierno)",
+            "No porque trabajo principalmente con empresas de producción masiva"
+        ],
+        key="artista_independiente"
+    )
+
+    st.markdown("### ¿A cuántas organizaciones perteneces formal o informalmente y en cuántos proyectos estás participando?")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        num_org = st.number_input("Organizaciones:", min_value=0, max_value=20, value=0, key="num_org")
+    with col2:
+        num_proy = st.number_input("Proyectos:", min_value=0, max_value=20, value=0, key="num_proy")
+
+    orgs_data = []
+    if num_org > 0:
+        st.markdown("### Organizaciones")
+        for i in range(num_org):
+            with st.expander(f"Organización {i+1}"):
+                tipo = st.selectbox(
+                    "Tipo:",
+                    ["Empresa grande (más de 100 personas)",
+                     "Empresa mediana (entre 50 y 100 personas)",
+                     "Empresa pequeña (menos de 50 personas)",
+                     "Emprendimiento",
+                     "Organización educativa privada",
+                     "Asociación civil, ONG, cooperativa o colectivo",
+                     "Organización educativa pública",
+                     "Organización pública"],
+                    key=f"tipo_org_{i}"
+                )
+                cargo = st.text_input("Cargo:", key=f"cargo_org_{i}")
+                orgs_data.append({'tipo': tipo, 'cargo': cargo})
+
+    proyectos_data = []
+    if num_proy > 0:
+        st.markdown("### Proyectos")
+        for i in range(num_proy):
+            with st.expander(f"Proyecto {i+1}"):
+                nombre = st.text_input("Nombre:", key=f"nombre_proy_{i}")
+                cargo = st.text_input("Cargo:", key=f"cargo_proy_{i}")
+                proyectos_data.append({'nombre': nombre, 'cargo': cargo})
+
+    col_prev, col_next = st.columns([1, 1])
+    with col_prev:
+        regresar = st.button("⬅️ Regresar", use_container_width=True)
+    with col_next:
+        continuar = st.button("Continuar ➡️", use_container_width=True)
+
+    # Cambiar de página sí requiere correr toda la app
+    if regresar:
+        st.session_state.encuesta_page = 0
+        st.rerun()
+    if continuar:
+        if num_org + num_proy == 0:
+            st.warning("Indica al menos una organización o un proyecto para continuar.")
+        else:
+            if 'temp_data' not in st.session_state:
+                st.session_state.temp_data = nuevo_temp_data()
+            st.session_state.temp_data.update({
+                'num_organizaciones': num_org,
+                'num_proyectos': num_proy,
+                'labores_profesionales': labores_profesionales,
+                'artista_independiente': artista_independiente,
+                'organizaciones': orgs_data,
+                'proyectos': proyectos_data
+            })
+            st.session_state.encuesta_page = 2
+            st.rerun()
+
+def pagina_herramientas_admin():
+    st.markdown("### Herramientas Administrativas y Gestivas")
+
+    herramientas_admin = ["Planeación estratégica", "Recursos Humanos", "Mercadotecnia",
+                          "Control de gestión", "Proceso administrativo (planear, organizar, controlar, dirigir)",
+                          "Otras", "Ninguna"]
+
+    with st.form("form_herramientas_admin", border=False):
+        jerarquia = st.selectbox(
+            "**1. ¿Cómo son tus relaciones de trabajo?**",
+            ["Altamente jerarquizadas", "En general menos de 3 niveles jerárquicos",
+             "Nos repartimos los liderazgos y funciones", "No reconozco jerarquías"]
+        )
+
+        planeacion = st.radio(
+            "**2. ¿Cómo es tu forma de planeación?**",
+            ["Hago o llevo un plan estratégico periódico y se revisa por la dirección",
+             "Tengo un plan estratégico que se comunica de manera oficial",
+             "Tengo un plan estratégico pero no lo comunico",
+             "Participo en el desarrollo del plan estratégico en colectivo",
+             "Planeación intuitiva",
+             "No tengo ninguna planeación"]
+        )
+
+        ecosistema = st.radio(
+            "**3. ¿Reconoces el ecosistema al que perteneces?** (por ecosistema se entiende: la configuración del sector creativo al que perteneces donde participan e intermedian personas de múltiples disciplinas)",
+            ["Participo formalmente con otras organizaciones de diferentes sectores",
+             "Participo informalmente con organizaciones de diferentes sectores",
+             "Participo con organizaciones del mismo sector",
+             "No reconozco participación con nadie más"]
+        )
+
+        funciones = st.selectbox(
+            "**4. ¿Cómo son tus funciones y labores?**",
+            ["Roles claramente identificados y bajo contrato",
+             "Roles identificados y formalizados",
+             "Roles informales pero identificables",
+             "Roles informales fluidos",
+             "No tengo roles definidos"]
+        )
+
+        liderazgo = st.selectbox(
+            "**5. ¿Cómo es el liderazgo de otras personas en tus espacios de trabajo?**",
+            ["Líderes específicos para cada área",
+             "Líderes específicos según el proyecto",
+             "Liderazgo compartido por conocimiento",
+             "Sin liderazgo claro"]
+        )
+
+        liderazgo_propio = st.selectbox(
+            "**6. ¿Cómo es tu tipo de liderazgo?**",
+            ["Es específico para un área o departamento",
+             "Lidero todos mis proyectos",
+             "Lidero algunos proyectos",
+             "Comparto el liderazgo",
+             "No soy líder de mis proyectos"]
+        )
+
+        identidad = st.selectbox(
+            "**7. ¿Tienes una identidad definida?**",
+            ["Marca con manual definido",
+             "Marca definida, identidad informal",
+             "Una marca más bien fluida",
+             "Llevo una marca por línea de trabajo",
+             "Sin identidad definida"]
+        )
+
+        importancia_formalidad = st.radio(
+            "**8. ¿Qué tan importante es la formalidad en tus relaciones laborales para lograr un buen desempeño de tus proyectos?** (por formalidad se entiende: tener manuales y procedimientos escritos, reglamentación, seguimiento para asegurar el cumplimiento y divulgación de estos documentos)",
+            ["Muy importantes",
+             "Mucho pero a veces dificulta relaciones",
+             "No tanto prefiero relaciones más fluidas",
+             "No es nada importante"]
+        )
+
+        herramientas_admin_conoce = st.multiselect(
+            "**9. ¿Conoces alguna de estas herramientas?**, Selecciona las que conoces:",
+            herramientas_admin,
+            key="herramientas_admin_conoce"
+        )
+
+        # Dentro del formulario la pregunta 10 no puede seguir a la 9 en cada clic:
+        # muestra todas las herramientas y se contrasta con la 9 al continuar
+        st.markdown("**10. ¿Aplicas alguna de ellas?**")
+        herramientas_admin_aplica = st.multiselect(
+            "Selecciona las que aplicas:",
+            [h for h in herramientas_admin if h not in ("Otras", "Ninguna")],
+            key="herramientas_admin_aplica",
+            help="Solo entre las que marcaste en la pregunta 9"
+        )
+
+        redes = st.selectbox(
+            "**11. ¿Tienes una red de trabajo consolidada?** (por red se entiende: las relaciones con las personas u organizaciones con quienes trabajas)",
+            ["Participo activamente con organizaciones del sector",
+             "Reconozco organizaciones pero no me reconocen",
+             "Estoy consolidando lazos",
+             "No participo con nadie"]
+        )
+
+        col_prev, col_next = st.columns([1, 1])
+        with col_prev:
+            regresar = st.form_submit_button("⬅️ Regresar", use_container_width=True)
+        with col_next:
+            continuar = st.form_submit_button("Continuar ➡️", use_container_width=True)
+
+    if regresar:
+        st.session_state.encuesta_page = 1
+        st.rerun()
+    if continuar:
+        sobrantes = fuera_de_seleccion(herramientas_admin_aplica, herramientas_admin_conoce)
+        if "Ninguna" in herramientas_admin_conoce and herramientas_admin_aplica:
+            st.warning("En la pregunta 9 marcaste que no conoces ninguna herramienta; deja vacía la pregunta 10.")
+        elif sobrantes:
+            st.warning("En la pregunta 10 marcaste herramientas que no seleccionaste en la pregunta 9: " + ", ".join(sobrantes))
+        else:
+            st.session_state.temp_data['herramientas_admin'] = {
+                'jerarquia': jerarquia,
+                'planeacion': planeacion,
+                'ecosistema': ecosistema,
+                'redes': redes,
+                'funciones': funciones,
+                'liderazgo': liderazgo,
+                'liderazgo_propio': liderazgo_propio,
+                'identidad': identidad,
+                'importancia_formalidad': importancia_formalidad,
+                'herramientas_admin_conoce': herramientas_admin_conoce,
+                'herramientas_admin_aplica': herramientas_admin_aplica
+            }
+            st.session_state.encuesta_page = 3
+            st.rerun()
+
+def pagina_herramientas_digitales():
+    st.markdown("### Uso de Herramientas Digitales")
+
+    opciones_herramientas = ["Redes sociales", "Página web", "Almacenamiento en la nube",
+                             "Banca en línea (recibimos pagos)", "Banca en línea (no recibimos pagos)",
+                             "Correo personalizado", "Plataformas de llamadas virtuales",
+                             "Software de oficina", "Software especializado", "Otras", "Ninguna"]
+    opciones_ias = ["Generador de texto (ChatGPT, Claude, etc.)",
+                    "Asistente de escritura", "Traductor", "Asistente de oficina",
+                    "Generador de imágenes", "Herramienta pedagógica",
+                    "Herramienta de código", "Otras", "Ninguna"]
+
+    with st.form("form_herramientas_digitales", border=False):
+        herramientas = st.multiselect(
+            "**1. De las siguientes, ¿qué herramientas utilizas?**",
+            opciones_herramientas
+        )
+
+        # Las preguntas de pago muestran todas las opciones y se contrastan con
+        # las de uso al continuar, sin volver a dibujar la página en cada clic
+        st.markdown("**2. ¿Cuáles pagas?**")
+        herramientas_pagadas = st.multiselect(
+            "Selecciona:", [h for h in opciones_herramientas if h != "Ninguna"], key="herr_pag",
+            help="Solo entre las que marcaste en la pregunta 1"
+        )
+
+        importancia_herramientas = st.selectbox(
+            "**3. ¿Estas herramientas son importantes para tu trabajo?**",
+            ["Totalmente fundamentales",
+             "Fundamentales para algunas tareas",
+             "Muy poco fundamentales",
+             "Nada no las uso tanto"],
+            key="importancia_herramientas"
+        )
+
+        ias = st.multiselect(
+            "**4. De las siguientes, ¿qué inteligencias artificiales utilizas?**",
+            opciones_ias,
+            key="ias"
+        )
+
+        st.markdown("**5. ¿Cuáles pagas?**")
+        ias_pagadas = st.multiselect(
+            "Selecciona:", [ia for ia in opciones_ias if ia != "Ninguna"], key="ias_pag",
+            help="Solo entre las que marcaste en la pregunta 4"
+        )
+
+        importancia_ias = st.selectbox(
+            "**6. ¿Estas herramientas son importantes para tu trabajo?**",
+            ["Totalmente fundamentales",
+             "Fundamentales para algunas tareas",
+             "Me aportan muy poco no las uso tanto",
+             "No sé utilizarlas muy bien quisiera manejarlas mejor"],
+            key="importancia_ias"
+        )
+
+        comunidades = st.multiselect(
+            "**7. ¿Perteneces a alguna comunidad en línea?**",
+            ["Grupos de WhatsApp/Telegram", "Grupos de difusión",
+             "Grupos de redes sociales", "Comunidades especializadas en línea",
+             "Comunidades híbridas", "Otras", "Ninguna"],
+            key="comunidades"
+        )
+
+        importancia_comunidades = st.selectbox(
+            "**8. ¿Estas comunidades son importantes para tu trabajo?**",
+            ["Totalmente fundamentales participo de forma activa",
+             "Fundamentales en algunos casos",
+             "Muy poco fundamentales no participo casi nunca",
+             "No las uso solo estoy inscrito pero no participo"],
+            key="importancia_comunidades"
+        )
+
+        asociacion_artistas = st.selectbox(
+            "**9. ¿Pertences a alguna asociación de representación de artistas, gestores o emprendedores sociales?**",
+            ["Sí", "No", "No pero me gustaría pertenecer"],
+            key="asociacion_artistas"
+        )
+
+        col_prev, col_next = st.columns([1, 1])
+        with col_prev:
+            regresar = st.form_submit_button("⬅️ Regresar", use_container_width=True)
+        with col_next:
+            continuar = st.form_submit_button("Continuar ➡️", use_container_width=True)
+
+    if regresar:
+        st.session_state.encuesta_page = 2
+        st.rerun()
+    if continuar:
+        herramientas_sobrantes = fuera_de_seleccion(herramientas_pagadas, herramientas)
+        ias_sobrantes = fuera_de_seleccion(ias_pagadas, ias)
+        if herramientas_sobrantes:
+            st.warning("En la pregunta 2 marcaste herramientas que no seleccionaste en la pregunta 1: " + ", ".join(herramientas_sobrantes))
+        if ias_sobrantes:
+            st.warning("En la pregunta 5 marcaste inteligencias artificiales que no seleccionaste en la pregunta 4: " + ", ".join(ias_sobrantes))
+        if not herramientas_sobrantes and not ias_sobrantes:
+            st.session_state.temp_data['herramientas_digitales'] = {
+                'herramientas': herramientas,
+                'herramientas_pagadas': herramientas_pagadas,
+                'importancia_herramientas': importancia_herramientas,
+                'ias': ias,
+                'ias_pagadas': ias_pagadas,
+                'importancia_ias': importancia_ias,
+                'comunidades': comunidades,
+                'importancia_comunidades': importancia_comunidades,
+                'asociacion_artistas': asociacion_artistas,
+                'num_herramientas': len([h for h in herramientas if h != "Ninguna"]),
+                'num_herramientas_pagadas': len(herramientas_pagadas),
+                'num_ias': len([ia for ia in ias if ia != "Ninguna"]),
+                'num_ias_pagadas': len(ias_pagadas),
+                'num_comunidades': len([c for c in comunidades if c != "Ninguna"])
+            }
+            st.session_state.encuesta_page = 4
+            st.rerun()
+
+def pagina_demograficos():
+    st.markdown("### Datos Demográficos")
+    st.caption("Campos con * son obligatorios")
+
+    st.markdown("#### Información obligatoria")
+
+    # Listas de países y ciudades compartidas por todas las sesiones. El país queda
+    # fuera del formulario porque de él depende la lista de ciudades
+    pais = st.selectbox("País *", obtener_paises())
+
+    # Obtener ciudades del país
+    country_code = obtener_codigos_paises().get(pais)
+    ciudades = obtener_ciudades_por_pais().get(country_code, ()) if country_code else ()
+
+    with st.form("form_demograficos", border=False):
+        ciudad = st.selectbox("Ciudad *", ciudades if ciudades else ["Seleccione un país"])
+
+        edad = st.selectbox(
+            "Rango de edad *",
+            ["Selecciona...", "18-24 años", "25-34 años", "35-44 años",
+             "45-54 años", "55-64 años", "65+ años"]
+        )
+        nivel_academico = st.selectbox(
+            "Nivel académico *",
+            ["Selecciona...", "Sin estudios formales", "Primaria", "Secundaria",
+             "Preparatoria/Bachillerato", "Técnico", "Licenciatura/Grado",
+             "Maestría/Posgrado", "Doctorado"]
+        )
+
+        st.markdown("#### Información opcional")
+        nombre = st.text_input("Nombre")
+        correo = st.text_input("Correo electrónico")
+        telefono = st.text_input("Teléfono")
+        entrevista = st.radio("¿Te gustaría que te contactemos para entrevistas de esta investigación?", ["No", "Sí"])
+        convocatorias = st.multiselect("¿Te interesa participar en?", ["Talleres de autogestión", "Ferias de arte"])
+        mascaras = st.radio("""¿Te gustaría participar en la serie web "Máscaras Ciberpiratas"?, Si no la has visto, te invitamos a verla en el vínculo de abajo""", ["Si, ¿cuánto cuesta?", "No"])
+        st.markdown("""
+        <a href="https://www.youtube.com/watch?v=0x9rbnCRHR0&list=PLlmVVBH4XMZCIh1DXFh3XmYZqkLbiToyH" target="_blank" style="text-decoration: none;">
+            <button style="width: 40%; background-color: #EA185E; color: #FFFFFF; font-family: 'Roboto', sans-serif, margin-left;
+                           font-weight: 700; border-radius: 10px; padding: 0.75rem; border: none; font-size: 1rem; cursor: pointer;">
+                🤖¡Mira la serie web "Máscaras Ciberpiratas" acá!
+            </button>
+        </a>
+        <br>
+        """, unsafe_allow_html=True)
+        st.markdown(" ")
+        col_prev, col_next = st.columns([1, 1])
+        with col_prev:
+            regresar = st.form_submit_button("⬅️ Regresar", use_container_width=True)
+        with col_next:
+            finalizar = st.form_submit_button("Finalizar ✅ \u2028 (si muestra error, vuelve a dar click acá, no te regreses)", use_container_width=True)
+
+    if regresar:
+        st.session_state.encuesta_page = 3
+        st.rerun()
+    if finalizar:
+        campos_completos = (
+            pais and ciudad and ciudad != "Seleccione un país" and
+            edad != "Selecciona..." and nivel_academico != "Selecciona..."
+        )
+
+        if not campos_completos:
+            st.warning("Completa los campos obligatorios (*) para finalizar.")
+        else:
+            respuesta_completa = {
+                **st.session_state.temp_data,
+                'demograficos': {
+                    'pais': pais,
+                    'ciudad': ciudad,
+                    'edad': edad,
+                    'nivel_academico': nivel_academico,
+                    'nombre': nombre,
+                    'correo': correo,
+                    'telefono': telefono,
+                    'entrevista': entrevista,
+                    'convocatorias': convocatorias,
+                    'mascaras': mascaras,
+                    'timestamp': datetime.now().isoformat()
+                }
+            }
+
+            # Guardar respuesta en Google Sheets
+            if guardar_respuesta_sheets(respuesta_completa):
+                # Para ubicar la respuesta en la página de agradecimiento sin volver a leer la hoja
+                st.session_state.puntajes_envio = {**puntajes_respuesta(respuesta_completa), 'pais': pais,
+                                                   'clave_envio': respuesta_completa['clave_envio']}
+                st.session_state.encuesta_page = 5
+                st.rerun()
+            else:
+                st.error("Error al guardar la respuesta. Por favor intenta de nuevo.")
+
+def pagina_gracias():
+    st.markdown("""
+    <div class="thanks-message">
+        ¡Muchas gracias por responder y apoyarnos con este estudio!<br>
+        Ahora navega por nuestros mapeos
+    </div>
+    """, unsafe_allow_html=True)
+
+    if 'puntajes_envio' in st.session_state:
+        mostrar_posicion(st.session_state.puntajes_envio)
+
+def mostrar_posicion(puntajes):
+    """Percentiles de la respuesta recién guardada entre todas las respuestas y las de su país"""
+    posicion = calcular_posicion(puntajes, puntajes['pais'], puntajes.get('clave_envio', ''))
+    if posicion is None:
+        return
+
+    pais = puntajes['pais']
+    st.markdown("### ¿Dónde quedas en el mapeo?")
+    col1, col2, col3 = st.columns(3)
+    for col, columna, titulo in [(col1, 'nivel_formalizacion', "Formalización"),
+                                 (col2, 'nivel_digitalizacion', "Digitalización")]:
+        ubicacion = posicion[columna]
+        with col:
+            st.metric(titulo, f"{puntajes[columna]} / 100")
+            texto = f"Percentil {ubicacion['todos']['percentil']:.0f} entre todas las respuestas"
+            if ubicacion['pais']:
+                texto += f" y {ubicacion['pais']['percentil']:.0f} en {pais}"
+            st.caption(texto + ".")
+
+    ubicacion = posicion['tipo_org_score']
+    with col3:
+        st.metric("Tipo de organización", f"{puntajes['tipo_org_score']:+d}")
+        texto = f"Mediana de todas las respuestas: {ubicacion['todos']['mediana']:+.0f}"
+        if ubicacion['pais']:
+            texto += f"; en {pais}: {ubicacion['pais']['mediana']:+.0f}"
+        st.caption(texto + f". Más empresarial que el {ubicacion['todos']['percentil']:.0f}% de las respuestas.")
+
+    st.caption(f"Comparado con {posicion['respuestas']} respuestas"
+               + (f", {posicion['respuestas_pais']} de {pais}." if posicion['respuestas_pais'] else "."))
@@ -0,0 +1,116 @@
+"""Exportador de agregados del mapeo en JSON estático.
+
+Escribe, para cada cohorte principal, los agregados de la vista de resultados
+(celdas del gráfico principal, conteos de las tortas y de labores, promedios) en
+un archivo cuyo nombre lleva el hash de su contenido. Esos archivos nunca cambian
+y pueden servirse desde un CDN con caché indefinida; una cohorte cuyos agregados
+no cambiaron conserva su archivo. manifest.json, el único archivo que se
+reescribe, lleva la versión de datos y apunta a los archivos vigentes.
+
+Como en la API de agregados, las cohortes con menos de --minimo respuestas se
+listan en el manifiesto sin datos ni conteo, y dentro de cada cohorte se omiten
+las celdas y categorías con menos de --minimo personas.
+
+Uso:
+    python exportar_agregados.py --salida publico/agregados --por pais
+    python exportar_agregados.py --csv respuestas.csv --cohortes cohortes.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+from datos import calcular_version_datos, filtrar_datos
+from exportar_datos import MINIMO_CIUDAD
+from graficos import calcular_agregados
+from generar_reportes import COLUMNAS_COHORTE, cargar_tabla, construir_cohortes, nombre_archivo
+
+def serializar(contenido):
+    """JSON canónico: mismas claves y valores producen siempre los mismos bytes"""
+    return json.dumps(contenido, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+def escribir_si_no_existe(ruta, datos):
+    """Escribe un archivo direccionado por contenido; si ya existe es idéntico y se omite"""
+    if os.path.exists(ruta):
+        return False
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'wb') as f:
+        f.write(datos)
+    os.replace(temporal, ruta)
+    return True
+
+def exportar_agregados(df, cohortes, directorio, minimo=MINIMO_CIUDAD):
+    """Escribe un JSON con hash por cohorte y el manifest.json que los enumera"""
+    os.makedirs(directorio, exist_ok=True)
+    version = calcular_version_datos(df)
+    manifiesto = {
+        'version_datos': version,
+        'generado': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'cohortes': []
+    }
+    nuevos = 0
+
+    for cohorte in cohortes:
+        df_filtrado = filtrar_datos(df, cohorte['filtros'])
+        if len(df_filtrado) < minimo:
+            # Con muy pocas respuestas los agregados describirían a personas concretas
+            manifiesto['cohortes'].append({
+                'nombre': cohorte['nombre'],
+                'filtros': cohorte['filtros'],
+                'suprimido': True
+            })
+            continue
+        contenido = {
+            'nombre': cohorte['nombre'],
+            'filtros': cohorte['filtros'],
+            'agregados': calcular_agregados(df_filtrado, minimo)
+        }
+        datos = serializar(contenido)
+        huella = hashlib.sha256(datos).hexdigest()[:16]
+        archivo = f"{nombre_archivo(cohorte['nombre'])}.{huella}.json"
+        nuevos += escribir_si_no_existe(os.path.join(directorio, archivo), datos)
+        manifiesto['cohortes'].append({
+            'nombre': cohorte['nombre'],
+            'filtros': cohorte['filtros'],
+            'respuestas': len(df_filtrado),
+            'archivo': archivo,
+            'sha256': huella
+        })
+
+    # El manifiesto se reemplaza de forma atómica para que nunca se sirva a medias
+    temporal = os.path.join(directorio, 'manifest.json.tmp')
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, os.path.join(directorio, 'manifest.json'))
+
+    return manifiesto, nuevos
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta los agregados de resultados como JSON estático con hash de contenido")
+    parser.add_argument('--salida', default='agregados', help="Carpeta de salida")
+    parser.add_argument('--csv', help="CSV exportado de la hoja de respuestas (por defecto se lee Google Sheets)")
+    parser.add_argument('--cohortes', help="JSON con la lista de cohortes [{\"nombre\", \"filtros\"}]")
+    parser.add_argument('--por', choices=list(COLUMNAS_COHORTE), help="Columna para generar una cohorte por cada valor")
+    parser.add_argument('--minimo', type=int, default=MINIMO_CIUDAD,
+                        help="Respuestas mínimas para publicar una cohorte, una celda o una categoría")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    df = cargar_tabla(args.csv)
+    if df.empty:
+        print("No hay respuestas para exportar", file=sys.stderr)
+        return 1
+
+    cohortes = construir_cohortes(df, args.cohortes, args.por)
+    manifiesto, nuevos = exportar_agregados(df, cohortes, args.salida, args.minimo)
+    suprimidas = sum(1 for c in manifiesto['cohortes'] if c.get('suprimido'))
+
+    print(f"Versión de datos {manifiesto['version_datos']}: {len(cohortes)} cohortes ({suprimidas} suprimidas), "
+          f"{nuevos} archivos nuevos en {time.perf_counter() - inicio:.2f} s -> {os.path.join(args.salida, 'manifest.json')}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""Exportación anonimizada de las respuestas del mapeo.
+
+Lee la hoja por bloques de filas, quita los datos de contacto y los nombres de
+proyectos, reemplaza los cargos escritos a mano por su rol de la taxonomía, deja
+solo la fecha del envío y agrupa las ciudades con pocas respuestas en "Otra
+ciudad". El resultado se escribe bloque por bloque en CSV o Parquet, así que
+nunca se arma el archivo completo en memoria.
+
+Uso:
+    python exportar_datos.py --salida respuestas_anonimas.csv
+    python exportar_datos.py --formato parquet --salida respuestas.parquet --minimo-ciudad 10
+    python exportar_datos.py --csv export_hoja.csv --salida anonimas.csv
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from functools import lru_cache
+
+import pandas as pd
+
+from datos import conectar_google_sheets
+from resultados import CAMPOS_CARGOS, ETIQUETAS_ROLES, SIN_RESPUESTA, clasificar_cargo, normalizar_texto
+
+# Datos personales o identificadores que nunca salen de la hoja
+COLUMNAS_PRIVADAS = ['nombre', 'correo', 'telefono', 'clave_envio']
+# Texto libre que puede identificar a quien responde
+COLUMNAS_TEXTO_LIBRE = ['proyectos_nombres']
+# Ciudades con menos respuestas que este umbral se generalizan
+MINIMO_CIUDAD = 5
+CIUDAD_GENERALIZADA = 'Otra ciudad'
+FILAS_POR_BLOQUE = 1000
+# La exportación de la página de administración pasa a disco por encima de este tamaño
+MAXIMO_EN_MEMORIA = 16 * 1024 * 1024
+FORMATOS_EXPORTACION = {
+    'csv': ('text/csv', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet')
+}
+
+def bloques_hoja(sheet, filas_por_bloque=FILAS_POR_BLOQUE):
+    """DataFrames de texto con filas consecutivas de la hoja, leídas por rangos"""
+    encabezados = sheet.row_values(1)
+    inicio = 2
+    while True:
+        fin = inicio + filas_por_bloque - 1
+        leidas = sheet.get_values(f"A{inicio}:{fin}")
+        # La API recorta las celdas vacías al final de cada fila y las filas vacías al final del rango
+        filas = [(fila + [''] * len(encabezados))[:len(encabezados)] for fila in leidas if any(fila)]
+        if filas:
+            yield pd.DataFrame(filas, columns=encabezados)
+        # Un bloque corto puede terminar en filas borradas: solo se para con un bloque vacío
+        # que ya pasó el tamaño de la hoja (row_count puede estar desactualizado si la hoja creció)
+        if not leidas and fin >= sheet.row_count:
+            return
+        inicio = fin + 1
+
+def bloques_csv(ruta, filas_por_bloque=FILAS_POR_BLOQUE):
+    """DataFrames de texto con filas consecutivas de un CSV exportado de la hoja"""
+    yield from pd.read_csv(ruta, dtype=str, keep_default_na=False, chunksize=filas_por_bloque)
+
+def contar_ciudades(bloques):
+    """Respuestas por (país, ciudad) en una primera pasada por los bloques"""
+    conteos = Counter()
+    for bloque in bloques:
+        conteos.update(zip(bloque['pais'], bloque['ciudad']))
+    return conteos
+
+@lru_cache(maxsize=4096)
+def rol_de_cargo(cargo):
+    """Rol de la taxonomía para un cargo escrito a mano ('' si no hay respuesta)"""
+    normalizado = normalizar_texto(cargo)
+    return '' if normalizado in SIN_RESPUESTA else ETIQUETAS_ROLES[clasificar_cargo(normalizado)]
+
+def generalizar_cargos(columna):
+    """Reemplaza cada cargo separado por '|' por su rol, conservando el orden de las entradas"""
+    return columna.astype(str).map(lambda valor: '|'.join(rol_de_cargo(c.strip()) for c in valor.split('|')))
+
+def anonimizar_bloque(bloque, ciudades_frecuentes):
+    """Quita columnas privadas y de texto libre, generaliza cargos, timestamp y ciudades poco frecuentes"""
+    bloque = bloque.drop(columns=[c for c in COLUMNAS_PRIVADAS + COLUMNAS_TEXTO_LIBRE if c in bloque.columns])
+    for campo in CAMPOS_CARGOS:
+        if campo in bloque.columns:
+            bloque[campo] = generalizar_cargos(bloque[campo])
+    if 'timestamp' in bloque.columns:
+        bloque['timestamp'] = bloque['timestamp'].astype(str).str[:10]
+    frecuente = pd.Series(list(zip(bloque['pais'], bloque['ciudad'])), index=bloque.index).isin(ciudades_frecuentes)
+    bloque['ciudad'] = bloque['ciudad'].where(frecuente | (bloque['ciudad'] == ''), CIUDAD_GENERALIZADA)
+    return bloque.astype(str)
+
+def escribir_exportacion(obtener_bloques, destino, formato='csv', minimo_ciudad=MINIMO_CIUDAD):
+    """Escribe la exportación anonimizada en destino (ruta o archivo binario); devuelve las filas escritas
+
+    obtener_bloques se llama dos veces: una para contar ciudades y otra para escribir.
+    """
+    conteos = contar_ciudades(obtener_bloques())
+    ciudades_frecuentes = {clave for clave, n in conteos.items() if n >= minimo_ciudad}
+
+    filas = 0
+    if formato == 'parquet':
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("La exportación en Parquet requiere pyarrow (pip install pyarrow)")
+
+        escritor = None
+        try:
+            for bloque in obtener_bloques():
+                tabla = pa.Table.from_pandas(anonimizar_bloque(bloque, ciudades_frecuentes), preserve_index=False)
+                if escritor is None:
+                    escritor = pq.ParquetWriter(destino, tabla.schema)
+                escritor.write_table(tabla)
+                filas += tabla.num_rows
+        finally:
+            if escritor is not None:
+                escritor.close()
+        return filas
+
+    es_ruta = isinstance(destino, (str, os.PathLike))
+    archivo = open(destino, 'wb') if es_ruta else destino
+    try:
+        for bloque in obtener_bloques():
+            anonimo = anonimizar_bloque(bloque, ciudades_frecuentes)
+            anonimo.to_csv(archivo, index=False, header=(filas == 0), encoding='utf-8', quoting=csv.QUOTE_MINIMAL)
+            filas += len(anonimo)
+    finally:
+        if es_ruta:
+            archivo.close()
+    return filas
+
+def exportar_a_temporal(obtener_bloques, formato='csv', minimo_ciudad=MINIMO_CIUDAD):
+    """Escribe la exportación en un archivo temporal anónimo y devuelve (archivo, filas)
+
+    El archivo queda en memoria hasta MAXIMO_EN_MEMORIA y después pasa a disco sin nombre,
+    así que se borra solo al cerrarlo o al liberarse, aunque la sesión termine sin descargar.
+    """
+    archivo = tempfile.SpooledTemporaryFile(max_size=MAXIMO_EN_MEMORIA)
+    try:
+        filas = escribir_exportacion(obtener_bloques, archivo, formato, minimo_ciudad)
+    except BaseException:
+        archivo.close()
+        raise
+    archivo.seek(0)
+    return archivo, filas
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta las respuestas sin datos personales, por bloques")
+    parser.add_argument('--salida', required=True, help="Archivo de salida")
+    parser.add_argument('--formato', choices=list(FORMATOS_EXPORTACION), default='csv')
+    parser.add_argument('--csv', help="CSV exportado de la hoja (por defecto se lee Google Sheets)")
+    parser.add_argument('--minimo-ciudad', type=int, default=MINIMO_CIUDAD,
+                        help="Respuestas mínimas para publicar una ciudad; las demás se generalizan")
+    parser.add_argument('--filas-por-bloque', type=int, default=FILAS_POR_BLOQUE)
+    args = parser.parse_args()
+
+    if args.csv:
+        def obtener_bloques():
+            return bloques_csv(args.csv, args.filas_por_bloque)
+    else:
+        sheet = conectar_google_sheets()
+        if sheet is None:
+            print("No se pudo conectar a Google Sheets", file=sys.stderr)
+            return 1
+
+        def obtener_bloques():
+            return bloques_hoja(sheet, args.filas_por_bloque)
+
+    inicio = time.perf_counter()
+    filas = escribir_exportacion(obtener_bloques, args.salida, args.formato, args.minimo_ciudad)
+    print(f"{filas} respuestas anonimizadas en {time.perf_counter() - inicio:.1f} s -> {args.salida}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
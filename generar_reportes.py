@@ -0,0 +1,225 @@
+"""Generador de reportes estáticos del mapeo, sin servidor de Streamlit.
+
+Carga la tabla de respuestas una sola vez, la reparte a un grupo de procesos y
+dibuja, para cada combinación de filtros (cohorte), las mismas figuras que la
+vista de resultados. Cada cohorte queda en su propia carpeta con una página HTML
+y, si kaleido está instalado, las figuras en PNG/SVG. Al final se escribe un
+index.html y un index.json con todas las cohortes.
+
+Uso:
+    python generar_reportes.py --salida reportes --por pais
+    python generar_reportes.py --csv respuestas.csv --cohortes cohortes.json --formatos html png
+
+El archivo de cohortes es una lista de {"nombre": ..., "filtros": {...}} con las
+mismas claves que filtrar_datos (pais, ciudad, edad, nivel_academico,
+digitalizacion, formalizacion, labores, artista).
+"""
+import argparse
+import csv
+import html
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+from gspread.utils import numericise_all
+from plotly.offline import get_plotlyjs
+
+from datos import cargar_respuestas_sheets, procesar_respuestas, calcular_version_datos, filtrar_datos
+from graficos import crear_figuras_reporte
+
+FORMATOS = ['html', 'png', 'svg']
+
+# Columnas con las que se puede partir la tabla en cohortes -> clave de filtro en filtrar_datos
+COLUMNAS_COHORTE = {
+    'pais': 'pais',
+    'ciudad': 'ciudad',
+    'edad': 'edad',
+    'nivel_academico': 'nivel_academico',
+    'artista_independiente': 'artista'
+}
+
+TITULOS_FIGURAS = {
+    'principal': 'Formalización y digitalización por tipo de organización',
+    'labores': 'Labores profesionales',
+    'jerarquia': 'Tipos de jerarquía',
+    'planeacion': 'Tipos de planeación',
+    'ecosistema': 'Tipos de ecosistemas',
+    'redes': 'Tipos de redes',
+    'liderazgo': 'Tipos de liderazgo',
+    'herramientas': 'Uso promedio de herramientas digitales por persona'
+}
+
+# Tabla de respuestas de cada proceso del grupo, recibida una sola vez al iniciarlo
+_df_proceso = None
+
+def nombre_archivo(texto):
+    """Convierte el nombre de una cohorte en un nombre de carpeta seguro"""
+    texto = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode()
+    texto = re.sub(r'[^A-Za-z0-9]+', '-', texto).strip('-').lower()
+    return texto or 'cohorte'
+
+def cargar_tabla(ruta_csv=None):
+    """Tabla procesada desde un CSV exportado de la hoja o directamente desde Google Sheets"""
+    if ruta_csv:
+        # Los valores se convierten igual que en get_all_records de gspread
+        with open(ruta_csv, encoding='utf-8', newline='') as f:
+            filas = list(csv.reader(f))
+        encabezados = filas[0] if filas else []
+        respuestas = [dict(zip(encabezados, numericise_all(fila))) for fila in filas[1:]]
+    else:
+        respuestas = cargar_respuestas_sheets()
+    return procesar_respuestas(respuestas)
+
+def construir_cohortes(df, ruta_cohortes=None, columna=None):
+    """Lista de cohortes (nombre, filtros): todas las respuestas, las del archivo y una por valor de la columna"""
+    cohortes = [{'nombre': 'Todos', 'filtros': {}}]
+
+    if ruta_cohortes:
+        with open(ruta_cohortes, encoding='utf-8') as f:
+            cohortes.extend(json.load(f))
+
+    if columna:
+        clave = COLUMNAS_COHORTE[columna]
+        for valor in sorted(v for v in df[columna].dropna().unique() if v != ''):
+            cohortes.append({'nombre': f"{columna}: {valor}", 'filtros': {clave: valor}})
+
+    return cohortes
+
+def iniciar_proceso(df):
+    """Inicializador del grupo de procesos: guarda la tabla para todas las tareas del proceso"""
+    global _df_proceso
+    _df_proceso = df
+
+def renderizar_cohorte(cohorte, carpeta, directorio, formatos):
+    """Dibuja las figuras de una cohorte y las escribe en su carpeta"""
+    inicio = time.perf_counter()
+    df_filtrado = filtrar_datos(_df_proceso, cohorte['filtros'])
+    resultado = {
+        'nombre': cohorte['nombre'],
+        'filtros': cohorte['filtros'],
+        'carpeta': carpeta,
+        'respuestas': len(df_filtrado),
+        'archivos': [],
+        'errores': []
+    }
+    if len(df_filtrado) == 0:
+        resultado['errores'].append('Sin respuestas con estos filtros')
+        return resultado
+
+    ruta = os.path.join(directorio, carpeta)
+    os.makedirs(ruta, exist_ok=True)
+    figuras = crear_figuras_reporte(df_filtrado)
+
+    for formato in formatos:
+        if formato == 'html':
+            continue
+        for nombre, fig in figuras.items():
+            archivo = f"{nombre}.{formato}"
+            try:
+                fig.write_image(os.path.join(ruta, archivo), format=formato, width=1000)
+                resultado['archivos'].append(f"{carpeta}/{archivo}")
+            except Exception as e:
+                # Sin kaleido no se pueden exportar imágenes; se informa una vez por formato
+                resultado['errores'].append(f"{formato}: {type(e).__name__}: {' '.join(str(e).split())}")
+                break
+
+    if 'html' in formatos:
+        secciones = [
+            f"<h2>{html.escape(TITULOS_FIGURAS[nombre])}</h2>\n"
+            + fig.to_html(full_html=False, include_plotlyjs=False, default_width='100%')
+            for nombre, fig in figuras.items()
+        ]
+        with open(os.path.join(ruta, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(
+                "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+                f"<title>{html.escape(cohorte['nombre'])}</title>"
+                "<script src=\"../plotly.min.js\"></script></head><body>\n"
+                f"<h1>{html.escape(cohorte['nombre'])}</h1>\n"
+                f"<p>{len(df_filtrado)} respuestas</p>\n"
+                + "\n".join(secciones)
+                + "\n</body></html>\n"
+            )
+        resultado['archivos'].append(f"{carpeta}/index.html")
+
+    resultado['segundos'] = round(time.perf_counter() - inicio, 3)
+    return resultado
+
+def escribir_indice(directorio, resultados, version, total):
+    """index.json con el detalle de cada cohorte e index.html con enlaces a sus páginas"""
+    with open(os.path.join(directorio, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump({'version_datos': version, 'respuestas': total, 'cohortes': resultados},
+                  f, ensure_ascii=False, indent=2)
+
+    filas = []
+    for r in resultados:
+        pagina = f"{r['carpeta']}/index.html"
+        enlace = (f"<a href=\"{html.escape(pagina)}\">{html.escape(r['nombre'])}</a>"
+                  if pagina in r['archivos'] else html.escape(r['nombre']))
+        filas.append(f"<tr><td>{enlace}</td><td>{r['respuestas']}</td>"
+                     f"<td>{html.escape('; '.join(r['errores']))}</td></tr>")
+
+    with open(os.path.join(directorio, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Reportes del mapeo</title></head><body>\n"
+            f"<h1>Reportes del mapeo</h1>\n<p>Versión de datos {html.escape(str(version))} · {total} respuestas</p>\n"
+            "<table><tr><th>Cohorte</th><th>Respuestas</th><th>Avisos</th></tr>\n"
+            + "\n".join(filas)
+            + "\n</table>\n</body></html>\n"
+        )
+
+def generar_reportes(df, cohortes, directorio, formatos, procesos=None):
+    """Renderiza todas las cohortes en paralelo y escribe el índice"""
+    os.makedirs(directorio, exist_ok=True)
+    if 'html' in formatos:
+        with open(os.path.join(directorio, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+
+    # Cada cohorte recibe una carpeta única aunque dos nombres se normalicen igual
+    carpetas = []
+    for cohorte in cohortes:
+        carpeta = base = nombre_archivo(cohorte['nombre'])
+        sufijo = 2
+        while carpeta in carpetas:
+            carpeta = f"{base}-{sufijo}"
+            sufijo += 1
+        carpetas.append(carpeta)
+
+    with ProcessPoolExecutor(max_workers=procesos, initializer=iniciar_proceso, initargs=(df,)) as grupo:
+        futuros = [grupo.submit(renderizar_cohorte, cohorte, carpeta, directorio, formatos)
+                   for cohorte, carpeta in zip(cohortes, carpetas)]
+        resultados = [futuro.result() for futuro in futuros]
+
+    escribir_indice(directorio, resultados, calcular_version_datos(df), len(df))
+    return resultados
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera reportes estáticos por cohorte sin servidor de Streamlit")
+    parser.add_argument('--salida', default='reportes', help="Carpeta de salida")
+    parser.add_argument('--csv', help="CSV exportado de la hoja de respuestas (por defecto se lee Google Sheets)")
+    parser.add_argument('--cohortes', help="JSON con la lista de cohortes [{\"nombre\", \"filtros\"}]")
+    parser.add_argument('--por', choices=list(COLUMNAS_COHORTE), help="Columna para generar una cohorte por cada valor")
+    parser.add_argument('--formatos', nargs='+', choices=FORMATOS, default=['html'])
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos en paralelo (por defecto, uno por CPU)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    df = cargar_tabla(args.csv)
+    if df.empty:
+        print("No hay respuestas para generar reportes", file=sys.stderr)
+        return 1
+
+    cohortes = construir_cohortes(df, args.cohortes, args.por)
+    resultados = generar_reportes(df, cohortes, args.salida, args.formatos, args.procesos)
+
+    for r in resultados:
+        avisos = f"  ({'; '.join(r['errores'])})" if r['errores'] else ''
+        print(f"{r['nombre']}: {r['respuestas']} respuestas, {len(r['archivos'])} archivos{avisos}")
+    print(f"{len(resultados)} cohortes en {time.perf_counter() - inicio:.1f} s -> {os.path.join(args.salida, 'index.html')}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""Figuras de Plotly del mapeo, compartidas por la app y el generador de reportes estáticos"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from datos import LABORES_OPCIONES
+
+# Colores azules con alto contraste
+COLORES_AZUL = ['#0B3C5D', '#1B6A99', '#258DC5', '#6FB6DE', '#B3D9EE']
+# Colores morados con alto contraste
+COLORES_MORADO = ['#7A0E3B', '#B0123F', '#EA185E', '#F06B94', '#F7A8C0', '#FBD3E0']
+
+COLORES_LABORES = ['#0B3C5D', '#B0123F', '#1B6A99', '#EA185E', '#258DC5', '#F06B94', '#6FB6DE', '#7A0E3B', '#B3D9EE', '#F7A8C0']
+
+CATEGORIAS_HERRAMIENTAS = {
+    'num_herramientas': 'Herramientas\ndigitales',
+    'num_herramientas_pagadas': 'Herramientas\npagadas',
+    'num_ias': 'IAs\nusadas',
+    'num_ias_pagadas': 'IAs\npagadas',
+    'num_comunidades': 'Comunidades'
+}
+COLORES_HERRAMIENTAS = ['#1B6A99', '#258DC5', '#B0123F', '#EA185E', '#6FB6DE']
+
+COLORES_COHORTES = ['#258DC5', '#EA185E', '#0B3C5D', '#F06B94', '#6FB6DE', '#7A0E3B']
+
+def crear_scatter_dual(df_filtrado, grupos=None):
+    """Crea scatter plot dual con puntos de Formalización y Digitalización
+
+    Con grupos=(etiquetas, nombres, colores), p. ej. perfiles o cohortes, el color
+    indica el grupo y el símbolo la medida: círculo para formalización, rombo para
+    digitalización.
+    """
+    fig = go.Figure()
+
+    medidas = [
+        ('nivel_formalizacion', 'Formalización', '#258DC5', 'circle'),
+        ('nivel_digitalizacion', 'Digitalización', '#EA185E', 'diamond')
+    ]
+    if grupos is None:
+        trazos = [(None, df_filtrado, None)]
+    else:
+        etiquetas, nombres, colores = grupos
+        trazos = [(nombres[g], df_filtrado[etiquetas == g], colores[g % len(colores)])
+                  for g in sorted(set(etiquetas.tolist()))]
+
+    for nombre_grupo, df_grupo, color_grupo in trazos:
+        for columna, medida, color, simbolo in medidas:
+            fig.add_trace(go.Scatter(
+                x=df_grupo['tipo_org_score'],
+                y=df_grupo[columna],
+                mode='markers',
+                name=medida if nombre_grupo is None else nombre_grupo,
+                legendgroup=nombre_grupo,
+                showlegend=nombre_grupo is None or columna == 'nivel_formalizacion',
+                marker=dict(
+                    size=df_grupo['total_entidades'] * 5 + 5,
+                    color=color if color_grupo is None else color_grupo,
+                    symbol='circle' if nombre_grupo is None else simbolo,
+                    opacity=0.6,
+                    line=dict(width=1, color='white')
+                ),
+                text=df_grupo.apply(
+                    lambda row: f"País: {row['pais']}<br>Orgs: {row['num_organizaciones']}<br>Proyectos: {row['num_proyectos']}<br>{medida}: {row[columna]}",
+                    axis=1
+                ) if len(df_grupo) else [],
+                hovertemplate='%{text}<extra></extra>'
+            ))
+
+    fig.update_layout(
+        xaxis_title="Tipo de organización: de muy gubernamental (-10) a muy empresarial (+10)",
+        yaxis_title="Nivel (0-100)",
+        height=600,
+        hovermode='closest',
+        plot_bgcolor='white',
+        xaxis=dict(gridcolor='#f0f0f0', range=[-12, 12]),
+        yaxis=dict(gridcolor='#f0f0f0', range=[-5, 105])
+    )
+
+    return fig
+
+def contar_labores(df_filtrado):
+    """Cuenta cuántas personas realizan cada labor profesional"""
+    labores_conteo = {labor: 0 for labor in LABORES_OPCIONES}
+
+    for labores_str in df_filtrado['labores_profesionales']:
+        if labores_str:
+            for labor in str(labores_str).split('|'):
+                labor = labor.strip()
+                if labor in labores_conteo:
+                    labores_conteo[labor] += 1
+
+    return labores_conteo
+
+def calcular_promedios(df_filtrado):
+    """Promedios de participación y de herramientas digitales por persona"""
+    promedios = {
+        'num_organizaciones': df_filtrado['num_organizaciones'].mean(),
+        'num_proyectos': df_filtrado['num_proyectos'].mean(),
+        'num_labores': df_filtrado['num_labores'].mean() if len(df_filtrado) > 0 else 0
+    }
+    for columna in CATEGORIAS_HERRAMIENTAS:
+        promedios[columna] = df_filtrado[columna].mean()
+    return promedios
+
+def crear_grafico_labores(df_filtrado):
+    """Barras con la cantidad de personas por labor profesional"""
+    labores_conteo = contar_labores(df_filtrado)
+
+    fig = go.Figure(data=[
+        go.Bar(
+            x=list(labores_conteo.keys()),
+            y=list(labores_conteo.values()),
+            marker_color=COLORES_LABORES,
+            text=list(labores_conteo.values()),
+            textposition='outside'
+        )
+    ])
+    fig.update_layout(
+        yaxis_title="Cantidad de personas que realizan cada labor",
+        xaxis_title="Labores profesionales",
+        height=450,
+        showlegend=False,
+        plot_bgcolor='white',
+        yaxis=dict(gridcolor='#e0e0e0', rangemode='tozero'),
+        xaxis=dict(tickangle=-45),
+        margin=dict(t=50)
+    )
+    return fig
+
+def crear_grafico_torta(serie, colores, alto=350, leyenda_y=-0.3):
+    """Torta con la distribución de una variable categórica"""
+    conteos = serie.value_counts()
+
+    fig = go.Figure(data=[go.Pie(
+        labels=conteos.index.tolist(),
+        values=conteos.values.tolist(),
+        hole=0.3,
+        marker_colors=colores[:len(conteos)],
+        textinfo='percent',
+        textposition='outside'
+    )])
+    fig.update_layout(
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=leyenda_y, xanchor="center", x=0.5, font=dict(size=10)),
+        height=alto,
+        margin=dict(t=20, b=80, l=20, r=20)
+    )
+    return fig
+
+def crear_grafico_herramientas(df_filtrado, intervalos=None):
+    """Barras con el uso promedio de herramientas digitales por persona, con intervalos opcionales"""
+    promedios = [df_filtrado[columna].mean() for columna in CATEGORIAS_HERRAMIENTAS]
+
+    barras = go.Bar(
+        x=list(CATEGORIAS_HERRAMIENTAS.values()),
+        y=promedios,
+        marker_color=COLORES_HERRAMIENTAS,
+        text=[f"{p:.1f}" for p in promedios],
+        textposition='outside'
+    )
+    if intervalos:
+        barras.error_y = dict(
+            type='data',
+            symmetric=False,
+            array=[intervalos[c][1] - p for c, p in zip(CATEGORIAS_HERRAMIENTAS, promedios)],
+            arrayminus=[p - intervalos[c][0] for c, p in zip(CATEGORIAS_HERRAMIENTAS, promedios)],
+            color='#555555'
+        )
+        # Con barras de error el texto va dentro para no superponerse
+        barras.textposition = 'inside'
+
+    fig = go.Figure(data=[barras])
+    fig.update_layout(
+        yaxis_title="Promedio por persona",
+        height=450,
+        showlegend=False,
+        plot_bgcolor='white',
+        yaxis=dict(gridcolor='#e0e0e0', rangemode='tozero'),
+        margin=dict(t=50)
+    )
+    return fig
+
+def crear_barras_comparadas(agregados, columnas, titulo_y, alto=400, decimales=1):
+    """Barras agrupadas con una serie por cohorte; agregados tiene una fila por cohorte"""
+    fig = go.Figure()
+    for i, (cohorte, fila) in enumerate(agregados.iterrows()):
+        valores = [fila.get(columna, 0) for columna in columnas]
+        fig.add_trace(go.Bar(
+            x=list(columnas.values()),
+            y=valores,
+            name=str(cohorte),
+            marker_color=COLORES_COHORTES[i % len(COLORES_COHORTES)],
+            text=[f"{v:.{decimales}f}" for v in valores],
+            textposition='outside'
+        ))
+    fig.update_layout(
+        barmode='group',
+        yaxis_title=titulo_y,
+        height=alto,
+        plot_bgcolor='white',
+        yaxis=dict(gridcolor='#e0e0e0', rangemode='tozero'),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
+        margin=dict(t=50)
+    )
+    return fig
+
+def crear_grafico_roles(roles):
+    """Barras horizontales con las personas por rol; roles tiene columnas Rol, Personas y %"""
+    fig = go.Figure(data=[go.Bar(
+        x=roles['Personas'],
+        y=roles['Rol'],
+        orientation='h',
+        marker_color='#258DC5',
+        text=[f"{n} ({p:.0f}%)" for n, p in zip(roles['Personas'], roles['%'])],
+        textposition='outside',
+        cliponaxis=False
+    )])
+    fig.update_layout(
+        xaxis_title="Personas que ocupan el rol en alguna organización o proyecto",
+        height=max(300, 40 * len(roles) + 120),
+        showlegend=False,
+        plot_bgcolor='white',
+        xaxis=dict(gridcolor='#e0e0e0', rangemode='tozero'),
+        yaxis=dict(autorange='reversed'),
+        margin=dict(t=20, r=80)
+    )
+    return fig
+
+def crear_figuras_reporte(df_filtrado):
+    """Figuras estáticas de la vista de resultados, en el orden en que se muestran"""
+    return {
+        'principal': crear_scatter_dual(df_filtrado),
+        'labores': crear_grafico_labores(df_filtrado),
+        'jerarquia': crear_grafico_torta(df_filtrado['jerarquia'], COLORES_AZUL),
+        'planeacion': crear_grafico_torta(df_filtrado['planeacion'], COLORES_MORADO),
+        'ecosistema': crear_grafico_torta(df_filtrado['ecosistema'], COLORES_AZUL),
+        'redes': crear_grafico_torta(df_filtrado['redes'], COLORES_MORADO),
+        'liderazgo': crear_grafico_torta(df_filtrado['liderazgo'], COLORES_AZUL, alto=400, leyenda_y=-0.1),
+        'herramientas': crear_grafico_herramientas(df_filtrado)
+    }
+
+# Cuadrícula de los agregados del gráfico principal: una columna por punto del
+# tipo de organización (-10..10) y una fila cada 5 puntos de nivel (0..100)
+BORDES_TIPO_ORG = np.arange(-10.5, 11.5, 1.0)
+BORDES_NIVEL = np.arange(0, 106, 5.0)
+
+def agregar_scatter(df_filtrado, columna_nivel, minimo=1):
+    """Conteos del gráfico principal por celda: [tipo de organización, nivel, personas]; omite celdas pequeñas"""
+    conteos, _, _ = np.histogram2d(df_filtrado['tipo_org_score'], df_filtrado[columna_nivel],
+                                   bins=[BORDES_TIPO_ORG, BORDES_NIVEL])
+    centros_x = (BORDES_TIPO_ORG[:-1] + BORDES_TIPO_ORG[1:]) / 2
+    ix, iy = np.nonzero(conteos >= max(minimo, 1))
+    return [[float(centros_x[i]), float(BORDES_NIVEL[j]), int(conteos[i, j])] for i, j in zip(ix, iy)]
+
+def calcular_agregados(df_filtrado, minimo=1):
+    """Agregados de la vista de resultados en tipos nativos de JSON, sin filas individuales.
+
+    Las celdas y categorías con menos de `minimo` personas (pero más de cero) se
+    omiten, para que ningún grupo publicado describa a una o dos personas.
+    """
+    def sin_pequenos(conteos):
+        return {str(k): int(v) for k, v in conteos.items() if v == 0 or v >= minimo}
+
+    return {
+        'respuestas': int(len(df_filtrado)),
+        'minimo': minimo,
+        'scatter': {
+            'formalizacion': agregar_scatter(df_filtrado, 'nivel_formalizacion', minimo),
+            'digitalizacion': agregar_scatter(df_filtrado, 'nivel_digitalizacion', minimo)
+        },
+        'labores': sin_pequenos(contar_labores(df_filtrado)),
+        'tortas': {
+            columna: sin_pequenos(df_filtrado[columna].value_counts())
+            for columna in ['jerarquia', 'planeacion', 'ecosistema', 'redes', 'liderazgo']
+        },
+        'promedios': {
+            columna: (round(float(valor), 4) if pd.notna(valor) else None)
+            for columna, valor in calcular_promedios(df_filtrado).items()
+        }
+    }
@@ -0,0 +1,267 @@
+"""Google Sheets simulado en el proceso, compatible con la parte de gspread que usa la app.
+
+Reemplaza al cliente de gspread con un libro en memoria que responde a
+open_by_key, sheet1, append_row(s), update_cell, get_all_values, get_all_records,
+row_values, get_values y batch_get. Cada llamada puede tardar una latencia
+configurable y fallar con 429 o 500 (al azar con una semilla, o en el orden
+programado con programar_fallos), y las cuotas por minuto de lectura y escritura
+se simulan como en la API real. Así los reintentos, el backoff y las cachés de
+guardar_respuesta_sheets y cargar_respuestas_sheets se pueden probar bajo carga
+sin tocar Google. La hoja se puede servir desde un multiprocessing Manager para
+que varios procesos compartan los mismos datos, cuotas y fallos.
+
+Uso:
+    from hoja_simulada import HojaSimulada, instalar_hoja_simulada
+    hoja = HojaSimulada(HEADERS_SHEETS, latencia=0.15, prob_429=0.05, cuota_escrituras=60)
+    instalar_hoja_simulada(hoja)
+"""
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter, deque
+
+import gspread
+from gspread.utils import a1_range_to_grid_range, numericise_all
+from gspread.worksheet import ValueRange
+
+# Código HTTP -> (estado, mensaje) como los devuelve la API de Google
+ERRORES_API = {
+    429: ('RESOURCE_EXHAUSTED', "Quota exceeded for quota metric 'Requests' and limit 'Requests per minute per user'"),
+    500: ('INTERNAL', 'Internal error encountered.'),
+    503: ('UNAVAILABLE', 'The service is currently unavailable.')
+}
+VENTANA_CUOTA = 60  # segundos
+
+class RespuestaSimulada:
+    """Lo mínimo de requests.Response que usa gspread.exceptions.APIError"""
+
+    def __init__(self, codigo):
+        estado, mensaje = ERRORES_API.get(codigo, ('UNKNOWN', 'Error simulado'))
+        self.status_code = codigo
+        self.cuerpo = {'error': {'code': codigo, 'message': mensaje, 'status': estado}}
+        self.text = json.dumps(self.cuerpo)
+
+    def json(self):
+        return self.cuerpo
+
+class ErrorApiSimulado(gspread.exceptions.APIError):
+    """APIError de una respuesta simulada que se puede enviar a otro proceso (p. ej. desde un Manager)"""
+
+    def __init__(self, codigo):
+        super().__init__(RespuestaSimulada(codigo))
+        self.codigo = codigo
+
+    def __reduce__(self):
+        return type(self), (self.codigo,)
+
+class HojaSimulada:
+    """Hoja de cálculo en memoria con la interfaz de gspread.Worksheet que usa la app"""
+
+    def __init__(self, encabezados, filas=(), latencia=0.0, variacion=0.0, prob_429=0.0, prob_500=0.0,
+                 cuota_lecturas=None, cuota_escrituras=None, semilla=None, reloj=time.monotonic,
+                 titulo='Hoja 1'):
+        self.title = titulo
+        self.id = 0
+        self.filas = [list(map(str, encabezados))] + [self.como_celdas(fila) for fila in filas]
+        self.latencia = latencia
+        self.variacion = variacion
+        self.prob_429 = prob_429
+        self.prob_500 = prob_500
+        self.cuotas = {'lectura': cuota_lecturas, 'escritura': cuota_escrituras}
+        self.reloj = reloj
+        self.rnd = random.Random(semilla)
+        self.lock = threading.Lock()
+        self.solicitudes = {'lectura': deque(), 'escritura': deque()}
+        self.fallos_programados = deque()
+        self.llamadas = Counter()
+        self.errores = Counter()
+
+    # ---------- Simulación de la API ----------
+
+    @staticmethod
+    def como_celdas(fila):
+        """Las celdas se guardan como texto, igual que las devuelve la API"""
+        return ['' if valor is None else str(valor) for valor in fila]
+
+    def programar_fallos(self, *codigos):
+        """Las próximas solicitudes fallan con estos códigos, en orden (antes que el azar)"""
+        with self.lock:
+            self.fallos_programados.extend(codigos)
+
+    def solicitud(self, operacion, tipo):
+        """Espera la latencia y decide si la solicitud falla; lanza APIError como gspread"""
+        with self.lock:
+            self.llamadas[operacion] += 1
+            espera = max(0.0, self.latencia + self.rnd.uniform(-self.variacion, self.variacion))
+            ahora = self.reloj()
+            ventana = self.solicitudes[tipo]
+            while ventana and ahora - ventana[0] >= VENTANA_CUOTA:
+                ventana.popleft()
+            codigo = None
+            if self.fallos_programados:
+                codigo = self.fallos_programados.popleft()
+            elif self.cuotas[tipo] is not None and len(ventana) >= self.cuotas[tipo]:
+                codigo = 429
+            else:
+                azar = self.rnd.random()
+                if azar < self.prob_429:
+                    codigo = 429
+                elif azar < self.prob_429 + self.prob_500:
+                    codigo = 500
+            # Como en la API, las solicitudes rechazadas por cuota no consumen cuota
+            if codigo != 429:
+                ventana.append(ahora)
+            if codigo is not None:
+                self.errores[codigo] += 1
+
+        if espera:
+            time.sleep(espera)
+        if codigo is not None:
+            raise ErrorApiSimulado(codigo)
+
+    def recortadas(self, filas):
+        """La API omite las celdas vacías al final de cada fila y las filas vacías al final"""
+        filas = [list(fila) for fila in filas]
+        for fila in filas:
+            while fila and fila[-1] == '':
+                fila.pop()
+        while filas and not filas[-1]:
+            filas.pop()
+        return filas
+
+    def rango(self, nombre_rango):
+        """Filas de un rango A1 ('A2:C10', 'A2:1001', 'Hoja 1!B:B'), sin relleno"""
+        if '!' in nombre_rango:
+            nombre_rango = nombre_rango.split('!', 1)[1]
+        rejilla = a1_range_to_grid_range(nombre_rango)
+        inicio_fila = rejilla.get('startRowIndex', 0)
+        fin_fila = rejilla.get('endRowIndex', len(self.filas))
+        inicio_col = rejilla.get('startColumnIndex', 0)
+        fin_col = rejilla.get('endColumnIndex')
+        return self.recortadas(fila[inicio_col:fin_col] for fila in self.filas[inicio_fila:fin_fila])
+
+    @staticmethod
+    def rellenadas(filas):
+        """Como gspread, rellena las filas para que todas tengan el mismo ancho"""
+        ancho = max((len(fila) for fila in filas), default=0)
+        return [fila + [''] * (ancho - len(fila)) for fila in filas]
+
+    # ---------- Interfaz de gspread.Worksheet ----------
+
+    @property
+    def row_count(self):
+        return len(self.filas)
+
+    def get_all_values(self, **kwargs):
+        self.solicitud('get_all_values', 'lectura')
+        with self.lock:
+            return self.rellenadas(self.recortadas(self.filas))
+
+    def get_values(self, range_name=None, **kwargs):
+        self.solicitud('get_values', 'lectura')
+        with self.lock:
+            filas = self.rango(range_name) if range_name else self.recortadas(self.filas)
+        return self.rellenadas(filas)
+
+    def row_values(self, fila, **kwargs):
+        self.solicitud('row_values', 'lectura')
+        with self.lock:
+            filas = self.rango(f"{fila}:{fila}")
+        return filas[0] if filas else []
+
+    def batch_get(self, ranges, **kwargs):
+        self.solicitud('batch_get', 'lectura')
+        with self.lock:
+            return [ValueRange.from_json({'range': f"'{self.title}'!{r}", 'majorDimension': 'ROWS',
+                                          'values': self.rango(r)}) for r in ranges]
+
+    def get_all_records(self, empty2zero=False, head=1, default_blank='', allow_underscores_in_numeric_literals=False,
+                        numericise_ignore=None, **kwargs):
+        self.solicitud('get_all_records', 'lectura')
+        with self.lock:
+            filas = self.rellenadas(self.recortadas(self.filas))
+        if len(filas) < head:
+            return []
+        encabezados = filas[head - 1]
+        ignorar = [] if numericise_ignore is None else numericise_ignore
+        if ignorar == ['all']:
+            valores = filas[head:]
+        else:
+            valores = [numericise_all(fila, empty2zero, default_blank, allow_underscores_in_numeric_literals, ignorar)
+                       for fila in filas[head:]]
+        return [dict(zip(encabezados, fila)) for fila in valores]
+
+    def update_cell(self, row, col, value):
+        self.solicitud('update_cell', 'escritura')
+        with self.lock:
+            while len(self.filas) < row:
+                self.filas.append([])
+            fila = self.filas[row - 1]
+            fila.extend([''] * (col - len(fila)))
+            fila[col - 1] = '' if value is None else str(value)
+        return {'updatedRange': f"'{self.title}'!R{row}C{col}", 'updatedCells': 1}
+
+    def append_row(self, values, value_input_option='RAW', **kwargs):
+        return self.append_rows([values], value_input_option, **kwargs)
+
+    def append_rows(self, values, value_input_option='RAW', **kwargs):
+        self.solicitud('append_rows', 'escritura')
+        with self.lock:
+            inicio = len(self.filas) + 1
+            self.filas.extend(self.como_celdas(fila) for fila in values)
+            fin = len(self.filas)
+        return {'updates': {'updatedRange': f"'{self.title}'!A{inicio}:{fin}", 'updatedRows': len(values)}}
+
+    # ---------- Consultas para las pruebas ----------
+
+    def respuestas(self):
+        """Filas escritas sin contar el encabezado"""
+        with self.lock:
+            return len(self.filas) - 1
+
+    def contadores(self):
+        """(llamadas por operación, errores inyectados por código), también a través de un Manager"""
+        with self.lock:
+            return dict(self.llamadas), dict(self.errores)
+
+class LibroSimulado:
+    """Spreadsheet con una sola hoja"""
+
+    def __init__(self, clave, hoja):
+        self.id = clave
+        self.title = 'Mapeo (simulado)'
+        self.sheet1 = hoja
+
+    def get_worksheet(self, indice):
+        return self.sheet1 if indice == 0 else None
+
+    def worksheets(self):
+        return [self.sheet1]
+
+class ClienteSimulado:
+    """Lo que gspread.authorize devuelve: abre libros por clave"""
+
+    def __init__(self, libros):
+        self.libros = libros
+
+    def open_by_key(self, clave):
+        libro = self.libros.get(clave)
+        if libro is None:
+            raise gspread.exceptions.SpreadsheetNotFound(clave)
+        libro.sheet1.solicitud('open_by_key', 'lectura')
+        return libro
+
+def instalar_hoja_simulada(hoja, clave='local'):
+    """Hace que obtener_cliente_gspread use la hoja simulada en lugar de Google Sheets"""
+    from google.oauth2.service_account import Credentials
+
+    os.environ['GOOGLE_CREDENTIALS'] = json.dumps({
+        'type': 'service_account', 'project_id': 'local', 'private_key': 'local', 'client_email': 'local@local'
+    })
+    os.environ['SPREADSHEET_ID'] = clave
+    Credentials.from_service_account_info = classmethod(lambda cls, *args, **kwargs: object())
+    cliente = ClienteSimulado({clave: LibroSimulado(clave, hoja)})
+    gspread.authorize = lambda credenciales: cliente
+    return cliente
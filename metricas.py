@@ -0,0 +1,218 @@
+"""Métricas operativas del proceso en formato de texto de Prometheus.
+
+La app actualiza un registro compartido por todas las sesiones en los caminos
+calientes (llamadas a Google Sheets, cachés, envíos, reruns por sección). El
+registro se publica en http://<METRICAS_HOST>:<METRICAS_PUERTO>/metrics y/o se
+escribe cada METRICAS_INTERVALO segundos en METRICAS_ARCHIVO; sin esas variables
+de entorno solo se lleva en memoria. No usa pandas ni Google Sheets.
+"""
+import streamlit as st
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIJO = 'mapeo_'
+
+# Límites superiores (segundos) de las cubetas de los histogramas de latencia
+CUBETAS_SEGUNDOS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Nombre -> (tipo, ayuda)
+METRICAS = {
+    'sheets_latencia_segundos': ('histogram', 'Duración de las llamadas a Google Sheets por operación'),
+    'sheets_errores_total': ('counter', 'Errores de Google Sheets por tipo (429, 5xx, 4xx, conexion, otro)'),
+    'cache_consultas_total': ('counter', 'Consultas a cachés de la app'),
+    'cache_fallos_total': ('counter', 'Consultas a cachés de la app que tuvieron que recalcular'),
+    'cache_aciertos_ratio': ('gauge', 'Fracción de consultas resueltas desde la caché'),
+    'envios_en_curso': ('gauge', 'Respuestas reservadas que aún no se escriben en la hoja'),
+    'datos_degradados_total': ('counter', 'Cargas de la hoja fallidas o vacías resueltas con datos anteriores o parciales'),
+    'envios_total': ('counter', 'Intentos de guardar una respuesta por resultado'),
+    'envios_reintentos_total': ('counter', 'Reintentos de guardar_respuesta_sheets tras un fallo'),
+    'rerun_segundos': ('histogram', 'Duración de cada ejecución del script por sección'),
+    'sesiones_activas': ('gauge', 'Sesiones de Streamlit conectadas al proceso'),
+    'precalentamiento_listo': ('gauge', '1 cuando terminó el precalentamiento de cachés del proceso'),
+    'precalentamiento_segundos': ('gauge', 'Duración de cada paso del último precalentamiento'),
+}
+
+@st.cache_resource
+def obtener_registro():
+    """Valores de las métricas del proceso, compartidos por todas las sesiones"""
+    return {'lock': threading.Lock(), 'valores': {}, 'histogramas': {}}
+
+def clave_metrica(nombre, etiquetas):
+    """(nombre, etiquetas ordenadas) con que se guarda cada serie"""
+    return nombre, tuple(sorted((k, str(v)) for k, v in etiquetas.items()))
+
+def incrementar(nombre, valor=1, **etiquetas):
+    """Suma valor a un contador o medidor (valor negativo para descontar)"""
+    registro = obtener_registro()
+    clave = clave_metrica(nombre, etiquetas)
+    with registro['lock']:
+        registro['valores'][clave] = registro['valores'].get(clave, 0) + valor
+
+def establecer(nombre, valor, **etiquetas):
+    """Fija el valor de un medidor (el último valor reemplaza al anterior)"""
+    registro = obtener_registro()
+    clave = clave_metrica(nombre, etiquetas)
+    with registro['lock']:
+        registro['valores'][clave] = valor
+
+def observar(nombre, valor, **etiquetas):
+    """Registra una observación en un histograma"""
+    registro = obtener_registro()
+    clave = clave_metrica(nombre, etiquetas)
+    with registro['lock']:
+        histograma = registro['histogramas'].setdefault(
+            clave, {'cubetas': [0] * len(CUBETAS_SEGUNDOS), 'suma': 0.0, 'conteo': 0})
+        for i, limite in enumerate(CUBETAS_SEGUNDOS):
+            if valor <= limite:
+                histograma['cubetas'][i] += 1
+        histograma['suma'] += valor
+        histograma['conteo'] += 1
+
+def registrar_consulta_cache(cache):
+    """Se llama donde se consulta la caché; los fallos se cuentan dentro de la función cacheada"""
+    incrementar('cache_consultas_total', cache=cache)
+
+def registrar_fallo_cache(cache):
+    """Se llama dentro de la función cacheada, que solo corre cuando la caché no tiene el valor"""
+    incrementar('cache_fallos_total', cache=cache)
+
+def tipo_error_sheets(error):
+    """Clasifica una excepción de gspread por el código HTTP de su respuesta"""
+    codigo = getattr(getattr(error, 'response', None), 'status_code', None)
+    if codigo == 429:
+        return '429'
+    if isinstance(codigo, int) and codigo >= 500:
+        return '5xx'
+    if isinstance(codigo, int) and codigo >= 400:
+        return '4xx'
+    if isinstance(error, (ConnectionError, TimeoutError, OSError)):
+        return 'conexion'
+    return 'otro'
+
+@contextmanager
+def medir_sheets(operacion):
+    """Mide la latencia de una llamada a Google Sheets y cuenta sus errores por tipo"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        incrementar('sheets_errores_total', tipo=tipo_error_sheets(e), operacion=operacion)
+        raise
+    finally:
+        observar('sheets_latencia_segundos', time.perf_counter() - inicio, operacion=operacion)
+
+def contar_sesiones_activas():
+    """Sesiones conectadas; None fuera del servidor de Streamlit"""
+    try:
+        from streamlit.runtime import Runtime
+        return len(Runtime.instance()._session_mgr.list_active_sessions())
+    except Exception:
+        return None
+
+# ==================== FORMATO PROMETHEUS ====================
+
+def escapar_etiqueta(valor):
+    """Escapa barras, comillas y saltos de línea en el valor de una etiqueta"""
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def linea_serie(nombre, etiquetas, valor):
+    """Una línea 'nombre{etiquetas} valor' del formato de texto"""
+    texto = ','.join(f'{k}="{escapar_etiqueta(v)}"' for k, v in etiquetas)
+    numero = str(int(valor)) if float(valor).is_integer() else repr(float(valor))
+    return f"{PREFIJO}{nombre}{{{texto}}} {numero}" if texto else f"{PREFIJO}{nombre} {numero}"
+
+def texto_prometheus(registro=None):
+    """Todas las métricas en el formato de exposición de texto de Prometheus"""
+    registro = registro or obtener_registro()
+    with registro['lock']:
+        valores = dict(registro['valores'])
+        histogramas = {clave: {**h, 'cubetas': list(h['cubetas'])} for clave, h in registro['histogramas'].items()}
+
+    # Medidores derivados que se calculan al exponer
+    for (nombre, etiquetas), consultas in list(valores.items()):
+        if nombre == 'cache_consultas_total' and consultas:
+            fallos = valores.get(('cache_fallos_total', etiquetas), 0)
+            valores[('cache_aciertos_ratio', etiquetas)] = max(consultas - fallos, 0) / consultas
+    sesiones = contar_sesiones_activas()
+    if sesiones is not None:
+        valores[('sesiones_activas', ())] = sesiones
+
+    lineas = []
+    for nombre, (tipo, ayuda) in METRICAS.items():
+        lineas.append(f"# HELP {PREFIJO}{nombre} {ayuda}")
+        lineas.append(f"# TYPE {PREFIJO}{nombre} {tipo}")
+        if tipo == 'histogram':
+            for (n, etiquetas), h in sorted(histogramas.items()):
+                if n != nombre:
+                    continue
+                for limite, conteo in zip(CUBETAS_SEGUNDOS, h['cubetas']):
+                    lineas.append(linea_serie(f"{nombre}_bucket", etiquetas + (('le', f"{limite:g}"),), conteo))
+                lineas.append(linea_serie(f"{nombre}_bucket", etiquetas + (('le', '+Inf'),), h['conteo']))
+                lineas.append(linea_serie(f"{nombre}_sum", etiquetas, h['suma']))
+                lineas.append(linea_serie(f"{nombre}_count", etiquetas, h['conteo']))
+        else:
+            for (n, etiquetas), valor in sorted(valores.items()):
+                if n == nombre:
+                    lineas.append(linea_serie(nombre, etiquetas, valor))
+    return '\n'.join(lineas) + '\n'
+
+# ==================== EXPORTACIÓN ====================
+
+def escribir_archivo_metricas(ruta, registro=None):
+    """Reemplaza el archivo de métricas de forma atómica (formato del textfile collector)"""
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        f.write(texto_prometheus(registro))
+    os.replace(temporal, ruta)
+
+@st.cache_resource
+def iniciar_exportador_metricas():
+    """Arranca una vez por proceso el endpoint HTTP y/o la escritura periódica del archivo"""
+    registro = obtener_registro()
+    activos = {}
+
+    puerto = os.environ.get('METRICAS_PUERTO')
+    if puerto:
+        class Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                cuerpo = texto_prometheus(registro).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            servidor = ThreadingHTTPServer((os.environ.get('METRICAS_HOST', '127.0.0.1'), int(puerto)), Manejador)
+        except (OSError, ValueError) as e:
+            # Otro proceso ya tiene el puerto: la app sigue sin endpoint
+            activos['error_http'] = str(e)
+        else:
+            threading.Thread(target=servidor.serve_forever, name='metricas-http', daemon=True).start()
+            activos['http'] = servidor.server_address
+
+    ruta = os.environ.get('METRICAS_ARCHIVO')
+    if ruta:
+        intervalo = float(os.environ.get('METRICAS_INTERVALO', '15'))
+
+        def escribir_periodicamente():
+            while True:
+                try:
+                    escribir_archivo_metricas(ruta, registro)
+                except OSError:
+                    pass
+                time.sleep(intervalo)
+
+        threading.Thread(target=escribir_periodicamente, name='metricas-archivo', daemon=True).start()
+        activos['archivo'] = ruta
+
+    return activos
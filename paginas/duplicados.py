@@ -0,0 +1,7 @@
+"""Administración: respuestas duplicadas"""
+import streamlit as st
+
+from administracion import mostrar_duplicados
+
+st.markdown('<div class="mapeo-title">Respuestas duplicadas</div>', unsafe_allow_html=True)
+mostrar_duplicados()
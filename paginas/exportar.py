@@ -0,0 +1,7 @@
+"""Administración: exportación anonimizada"""
+import streamlit as st
+
+from administracion import mostrar_exportacion
+
+st.markdown('<div class="mapeo-title">Exportar datos anonimizados</div>', unsafe_allow_html=True)
+mostrar_exportacion()
@@ -0,0 +1,25 @@
+"""Feria de arte Máscaras Ciberpiratas"""
+import streamlit as st
+
+st.markdown('<div class="mapeo-title">Feria Máscaras Ciberpiratas</div>', unsafe_allow_html=True)
+
+st.markdown("""
+<div class="question-box">
+    <p style="line-height: 1.8;">
+        Te invitamos a participar en la feria itinerante que busca obras en las cuales las y los artistas
+        respondan a la pregunta: ¿Cómo te enfrentas a la ansiedad digital?
+    </p>
+</div>
+""", unsafe_allow_html=True)
+
+st.markdown(
+    '<img class="mc-page-image" src="https://elchorroco.wordpress.com/wp-content/uploads/2026/07/texto-curatorial-mc-11.png">',
+    unsafe_allow_html=True
+)
+
+st.markdown("""
+<div class="pink-box">
+    La convocatoria está cerrada en este momento, pero pronto publicaremos las fechas y lineamientos
+    para la feria del 2027
+</div>
+""", unsafe_allow_html=True)
@@ -0,0 +1,10 @@
+"""Página de inicio del proyecto"""
+import streamlit as st
+
+st.markdown('<p style="font-family: \'Roboto Slab\', serif; font-size: 1.6rem; text-align: center; color: #000000;"><strong>Máscaras Ciberpiratas</strong></p>', unsafe_allow_html=True)
+
+st.markdown("""
+<div class="question-box">
+<p>Máscaras Ciberpiratas es un proyecto de investigación en donde buscamos responder a la pregunta: ¿Qué es eso de la autogestión y cómo se relaciona con nuestra identidad como latinos? </p><p> En esta página podrás ver todos sus componentes en el menú de la izquierda: empieza por ver el mapa que se arma en tiempo real y participa para conocer los tipos de gestión y niveles de digitalización de las organizaciones culturales. Luego podrás ver la serie web de los casos que han participado en el estudio, la convocatoria a próximas ferias de arte que organizamos y las fechas y lugares en donde se presentará, y el libro que funciona a modo de guía de autogestión para artistas.</p><p> Este proyecto es desarrollado en el marco de la beca “Posdoctorados por México”, 2023-1 de la Secretaría de Ciencia, Humanidades, Tecnología e Innovación (SECIHTI).</p>
+</div>
+""", unsafe_allow_html=True)
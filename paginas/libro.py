@@ -0,0 +1,25 @@
+"""Libro Máscaras Ciberpiratas"""
+import streamlit as st
+
+st.markdown('<div class="mapeo-title">Máscaras Ciberpiratas</div>', unsafe_allow_html=True)
+
+col_portada, col_texto = st.columns([1, 1.7], gap="large")
+
+with col_portada:
+    st.markdown(
+        '<img class="mc-cover-image" src="https://elchorroco.wordpress.com/wp-content/uploads/2026/07/portada-para-web.png">',
+        unsafe_allow_html=True
+    )
+
+with col_texto:
+    st.markdown("""
+    <div class="question-box">
+    <p>Máscaras Ciberpiratas es un libro realista de gestión cultural. A diferencia de los textos clásicos de administración, que suelen ofrecer recetas universales aplicables a cualquier tipo de organización y promesas de éxito monetario basadas en la ilusión de poder planear el futuro con estrategias, este libro rompe con esa ficción. Su primera afirmación es provocadora y de entrada rompe un mito ¿de qué futuro estamos hablando? </p><p>El libro no solo propone una visión más realista de la gestión, sino que también ofrece una comprensión más objetiva sobre lo que ocurre en las llamadas industrias creativas y culturales (ICC), pues hace evidente que la época en que la creatividad es regulada a través de los contratos ha quedado atrás, pues en la era digital el arte circula por redes complejas (ecosistemas creativos), y ya no se subsume en cadenas lineales de producción (autor-editor-distribuidor-público).</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+st.markdown("""
+<div class="pink-box">
+    Pronto podrás adquirir el libro acá
+</div>
+""", unsafe_allow_html=True)
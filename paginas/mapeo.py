@@ -0,0 +1,18 @@
+"""Mapeo de gestión cultural: encuesta, resultados y comparación de cohortes"""
+import streamlit as st
+
+from encuesta import mostrar_encuesta
+from resultados import mostrar_mapas, mostrar_comparacion
+
+st.markdown('<div class="mapeo-title">Mapeo de Gestión Cultural y Digital en Latinoamérica</div>', unsafe_allow_html=True)
+
+tab1, tab2, tab3 = st.tabs(["📝 Participar en Encuesta", "📊 Ver Resultados", "⚖️ Comparar cohortes"])
+
+with tab1:
+    mostrar_encuesta()
+
+with tab2:
+    mostrar_mapas()
+
+with tab3:
+    mostrar_comparacion()
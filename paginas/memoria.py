@@ -0,0 +1,7 @@
+"""Administración: uso de memoria"""
+import streamlit as st
+
+from administracion import mostrar_reporte_memoria
+
+st.markdown('<div class="mapeo-title">Uso de memoria</div>', unsafe_allow_html=True)
+mostrar_reporte_memoria()
@@ -0,0 +1,30 @@
+"""Serie web Máscaras Ciberpiratas"""
+import streamlit as st
+
+from componentes import youtube_embed
+
+st.markdown('<div class="mapeo-title">Serie Web Máscaras Ciberpiratas</div>', unsafe_allow_html=True)
+
+st.markdown("""
+<div class="question-box">
+<p>Mira la serie con los casos de artistas que hacen parte del proyecto y que vamos realizando, podrías formar parte de estos si nos envías un correo. </p><p>Estos son nuestros cuatro capítulos favoritos, da click más abajo para ver la serie completa:</p>
+</div>
+""", unsafe_allow_html=True)
+
+capitulos = ['mH-0NdhHcNM', 'UMdT1hP0nUY', 'ppnJwypcjUk', 'NZn7nr7K5u4']
+
+col1, col2 = st.columns(2)
+for i, video_id in enumerate(capitulos):
+    with (col1 if i % 2 == 0 else col2):
+        st.markdown(youtube_embed(video_id), unsafe_allow_html=True)
+
+st.markdown("""
+<div style="text-align: center; margin-top: 0.5rem;">
+    <a href="https://youtube.com/playlist?list=PLlmVVBH4XMZCIh1DXFh3XmYZqkLbiToyH&si=u_I9rhonYeM7nnYV" target="_blank" style="text-decoration: none;">
+        <button style="background-color: #EA185E; color: #FFFFFF; font-family: 'Roboto', sans-serif;
+                       font-weight: 700; border-radius: 10px; padding: 0.75rem 2rem; border: none; font-size: 1.1rem; cursor: pointer;">
+            🎬 Ver la serie completa
+        </button>
+    </a>
+</div>
+""", unsafe_allow_html=True)
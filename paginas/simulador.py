@@ -0,0 +1,7 @@
+"""Investigación: simulador de puntajes"""
+import streamlit as st
+
+from administracion import mostrar_simulador_puntajes
+
+st.markdown('<div class="mapeo-title">Simulador de puntajes</div>', unsafe_allow_html=True)
+mostrar_simulador_puntajes()
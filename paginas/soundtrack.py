@@ -0,0 +1,19 @@
+"""Soundtrack de la serie web"""
+import streamlit as st
+
+from componentes import youtube_embed
+
+st.markdown('<div class="mapeo-title">Soundtrack Máscaras Ciberpiratas</div>', unsafe_allow_html=True)
+
+st.markdown("""
+<div class="question-box">
+<p>Nuestra serie web tiene un soundtrack de canciones que hicimos exclusivamente para ella. </p><p>Acá están las cuatro canciones:</p>
+</div>
+""", unsafe_allow_html=True)
+
+canciones = ['qXPZKylY7Sg', 'AbBFhIGObuU', 'tD7oJgqTOf8', '0576LOVLj7M']
+
+col1, col2 = st.columns(2)
+for i, video_id in enumerate(canciones):
+    with (col1 if i % 2 == 0 else col2):
+        st.markdown(youtube_embed(video_id), unsafe_allow_html=True)
@@ -0,0 +1,103 @@
+"""Precalentamiento de las cachés compartidas al arrancar el servidor.
+
+Construye en un hilo de fondo lo que de otro modo pagaría el primer visitante:
+credenciales y autorización de gspread, open_by_key, la descarga completa de la
+hoja, las listas de geonames, la importación de plotly y las cachés de la vista
+de resultados sin filtros. Las cachés de st.cache_* son del proceso, así que lo
+que se construye aquí lo reutilizan todas las sesiones; si una sesión llega antes
+de terminar, espera el mismo cálculo en lugar de repetirlo.
+
+Uso (en lugar de `streamlit run app.py`, con las mismas opciones):
+    python precalentamiento.py --server.port=$PORT --server.address=0.0.0.0
+
+app.py también lo inicia en la primera ejecución, por si el servidor se arrancó
+con `streamlit run`.
+"""
+import streamlit as st
+import logging
+import os
+import sys
+import threading
+import time
+
+from metricas import establecer
+
+RUTA_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+def paso_datos():
+    """Credenciales, cliente, libro y tabla de respuestas compartida"""
+    from datos import cargar_datos_compartidos
+    from resultados import precalcular_vista_inicial
+
+    df_datos, version_datos = cargar_datos_compartidos()
+    if version_datos is not None:
+        precalcular_vista_inicial(df_datos, version_datos)
+
+def paso_geonames():
+    """Países, ciudades por país e índice de coordenadas"""
+    from datos import obtener_paises, obtener_codigos_paises, obtener_ciudades_por_pais
+    from resultados import obtener_indice_coordenadas
+
+    obtener_paises()
+    obtener_codigos_paises()
+    obtener_ciudades_por_pais()
+    obtener_indice_coordenadas()
+
+def paso_plotly():
+    """Importación de plotly y carga de sus validadores con una figura mínima"""
+    import plotly.graph_objects as go
+
+    go.Figure(go.Scatter(x=[0], y=[0])).to_json()
+
+# Nombre -> función, en el orden en que se ejecutan
+PASOS = {
+    'geonames': paso_geonames,
+    'plotly': paso_plotly,
+    'datos': paso_datos
+}
+
+@st.cache_resource
+def obtener_estado_precalentamiento():
+    """Estado del proceso: evento de listo, duración y error de cada paso"""
+    return {'listo': threading.Event(), 'pasos': {}, 'errores': {}}
+
+def precalentar(estado):
+    """Ejecuta los pasos en orden; un paso que falla no impide los siguientes"""
+    # Este hilo no pertenece a ninguna sesión: Streamlit avisaría en cada llamada a una caché
+    logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').setLevel(logging.ERROR)
+    for nombre, paso in PASOS.items():
+        inicio = time.perf_counter()
+        try:
+            paso()
+        except Exception as e:
+            estado['errores'][nombre] = f"{type(e).__name__}: {e}"
+        duracion = time.perf_counter() - inicio
+        estado['pasos'][nombre] = duracion
+        establecer('precalentamiento_segundos', duracion, paso=nombre)
+    estado['listo'].set()
+    establecer('precalentamiento_listo', 1)
+
+@st.cache_resource
+def iniciar_precalentamiento():
+    """Lanza el precalentamiento una sola vez por proceso, sin bloquear a quien lo llama"""
+    estado = obtener_estado_precalentamiento()
+    threading.Thread(target=precalentar, args=(estado,), name='precalentamiento', daemon=True).start()
+    return estado
+
+def esta_listo():
+    """True cuando terminó el precalentamiento (con o sin errores)"""
+    return obtener_estado_precalentamiento()['listo'].is_set()
+
+def main():
+    """Arranca el precalentamiento y luego el servidor de Streamlit en el mismo proceso"""
+    # Como script este archivo es __main__; app.py importa `precalentamiento`, y st.cache_resource
+    # distingue las funciones por módulo: se usa el mismo módulo para compartir estado e hilo
+    import precalentamiento
+    precalentamiento.iniciar_precalentamiento()
+    from streamlit.web import cli
+
+    sys.argv = ['streamlit', 'run', RUTA_APP] + sys.argv[1:]
+    return cli.main()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,414 @@
+"""
+Prueba de carga de la app con sesiones simultáneas (Streamlit AppTest).
+
+Cada sesión simulada recorre la encuesta completa (páginas 0 a 5 de
+mostrar_encuesta) y luego cambia filtros en la pestaña de resultados. Google
+Sheets se reemplaza por una hoja en memoria con latencia configurable, así que
+la prueba no toca datos reales. La hoja simulada (hoja_simulada.py) también
+puede devolver errores 429/500 al azar y aplicar cuotas por minuto, para ver
+cómo responden los reintentos y las cachés bajo carga.
+
+Al terminar, cada sesión recarga la hoja y comprueba que ninguna respuesta se
+cuente dos veces; con --hoja-sin-clave la hoja empieza sin la columna
+clave_envio, como las hojas creadas antes de que existiera.
+
+AppTest no es seguro entre hilos, así que cada sesión simultánea corre en su
+propio proceso (como una réplica del servidor, con sus propias cachés) y todos
+los procesos comparten una sola hoja simulada servida por un Manager. Los
+errores de la app (excepciones en el script o envíos que no llegan a la página
+de agradecimiento) se reportan aparte de los errores del arnés de prueba.
+
+Uso:
+    python prueba_carga.py --sesiones 40 --concurrencia 8 --respuestas-iniciales 2000
+    python prueba_carga.py --prob-429 0.1 --cuota-escrituras 60
+    python prueba_carga.py --sesiones 4 --hoja-sin-clave
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.managers import BaseManager
+
+import numpy as np
+
+from hoja_simulada import HojaSimulada, instalar_hoja_simulada
+
+RUTA_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+# Columnas en el orden en que guardar_respuesta_sheets escribe cada fila
+COLUMNAS_HOJA = [
+    'timestamp', 'num_organizaciones', 'num_proyectos', 'labores_profesionales', 'artista_independiente',
+    'organizaciones_tipos', 'organizaciones_cargos', 'proyectos_nombres', 'proyectos_cargos',
+    'jerarquia', 'planeacion', 'ecosistema', 'redes', 'funciones', 'liderazgo', 'liderazgo_propio',
+    'identidad', 'importancia_formalidad', 'herramientas_admin_conoce', 'herramientas_admin_aplica',
+    'herramientas', 'herramientas_pagadas', 'importancia_herramientas',
+    'ias', 'ias_pagadas', 'importancia_ias', 'comunidades', 'importancia_comunidades', 'asociacion_artistas',
+    'pais', 'ciudad', 'edad', 'nivel_academico', 'nombre', 'correo', 'telefono',
+    'entrevista', 'convocatorias', 'mascaras', 'tipo_org_score', 'nivel_formalizacion',
+    'nivel_digitalizacion', 'clave_envio'
+]
+
+LUGARES = [('Colombia', 'Bogotá'), ('Colombia', 'Medellín'), ('Colombia', 'Cali'), ('Mexico', 'Mexico City'),
+           ('Mexico', 'Guadalajara'), ('Argentina', 'Buenos Aires'), ('Chile', 'Santiago'), ('Peru', 'Lima')]
+EDADES = ["18-24 años", "25-34 años", "35-44 años", "45-54 años", "55-64 años", "65+ años"]
+NIVELES = ["Técnico", "Licenciatura/Grado", "Maestría/Posgrado", "Doctorado"]
+LABORES = ["Creación", "Producción", "Gestión", "Educación formal", "Investigación", "Estudiante"]
+HERRAMIENTAS = ["Redes sociales", "Página web", "Almacenamiento en la nube", "Software de oficina"]
+IAS = ["Generador de texto (ChatGPT, Claude, etc.)", "Traductor", "Generador de imágenes"]
+CARGOS = ["Director", "directora", "Coordinadora", "Productor", "Gestora cultural", "Músico", "Docente", "Socia"]
+PROYECTOS = ["Festival Ruido", "Cine Club", "Colectivo Sur", "Revista Trama"]
+
+# ==================== ALMACENAMIENTO LOCAL ====================
+
+def fila_sintetica(rnd, indice):
+    """Fila con el mismo formato que escribe la app"""
+    pais, ciudad = rnd.choice(LUGARES)
+    fecha = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(time.time() - rnd.randint(0, 180) * 86400))
+    valores = {
+        'timestamp': f"{fecha}.{indice % 1000000:06d}",
+        'num_organizaciones': rnd.randint(0, 3),
+        'num_proyectos': rnd.randint(0, 3),
+        'labores_profesionales': '|'.join(rnd.sample(LABORES, rnd.randint(1, 3))),
+        'artista_independiente': rnd.choice(["Sí totalmente", "Sí pero quisiera estar en otro segmento"]),
+        'organizaciones_cargos': '|'.join(rnd.choices(CARGOS, k=rnd.randint(0, 2))),
+        'proyectos_nombres': rnd.choice(PROYECTOS),
+        'proyectos_cargos': rnd.choice(CARGOS),
+        'jerarquia': rnd.choice(["Altamente jerarquizadas", "No reconozco jerarquías"]),
+        'planeacion': rnd.choice(["Planeación intuitiva", "No tengo ninguna planeación"]),
+        'ecosistema': "Participo con organizaciones del mismo sector",
+        'redes': rnd.choice(["Estoy consolidando lazos", "No participo con nadie"]),
+        'liderazgo': rnd.choice(["Sin liderazgo claro", "Liderazgo compartido por conocimiento"]),
+        'herramientas': '|'.join(rnd.sample(HERRAMIENTAS, rnd.randint(0, 4))),
+        'ias': '|'.join(rnd.sample(IAS, rnd.randint(0, 3))),
+        'pais': pais,
+        'ciudad': ciudad,
+        'edad': rnd.choice(EDADES),
+        'nivel_academico': rnd.choice(NIVELES),
+        'tipo_org_score': rnd.randint(-10, 10),
+        'nivel_formalizacion': rnd.randint(0, 100),
+        'nivel_digitalizacion': rnd.randint(0, 100)
+    }
+    return [valores.get(columna, '') for columna in COLUMNAS_HOJA]
+
+class GestorHoja(BaseManager):
+    """Sirve una HojaSimulada a los procesos de la prueba"""
+
+GestorHoja.register('HojaSimulada', HojaSimulada)
+
+def crear_hoja_local(respuestas_iniciales, latencia, semilla, prob_429=0.0, prob_500=0.0,
+                     cuota_lecturas=None, cuota_escrituras=None, fabrica=HojaSimulada, sin_clave=False):
+    """Hoja simulada con filas sintéticas, latencia, fallos y cuotas (fabrica puede ser la de un Manager).
+
+    Con sin_clave la hoja no tiene la última columna (clave_envio), como las hojas anteriores a ella.
+    """
+    rnd = random.Random(semilla)
+    columnas = len(COLUMNAS_HOJA) - 1 if sin_clave else len(COLUMNAS_HOJA)
+    return fabrica(
+        COLUMNAS_HOJA[:columnas], [fila_sintetica(rnd, i)[:columnas] for i in range(respuestas_iniciales)],
+        latencia=latencia, prob_429=prob_429, prob_500=prob_500,
+        cuota_lecturas=cuota_lecturas, cuota_escrituras=cuota_escrituras, semilla=semilla
+    )
+
+def instalar_almacenamiento_local(respuestas_iniciales, latencia, semilla, prob_429=0.0, prob_500=0.0,
+                                  cuota_lecturas=None, cuota_escrituras=None, sin_clave=False):
+    """Reemplaza Google Sheets por la hoja simulada en este proceso"""
+    hoja = crear_hoja_local(respuestas_iniciales, latencia, semilla, prob_429, prob_500,
+                            cuota_lecturas, cuota_escrituras, sin_clave=sin_clave)
+    instalar_hoja_simulada(hoja)
+    return hoja
+
+def compartir_bytecode():
+    """Compila app.py una sola vez para todas las sesiones, como hace el servidor real.
+
+    AppTest crea un ScriptCache nuevo en cada ejecución, así que sin esto cada
+    rerun recompila el script.
+    """
+    from streamlit.runtime.scriptrunner import script_cache
+
+    original = script_cache.ScriptCache.get_bytecode
+    compilados = {}
+    lock = threading.Lock()
+
+    def get_bytecode(self, script_path):
+        ruta = os.path.abspath(script_path)
+        with lock:
+            if ruta not in compilados:
+                compilados[ruta] = original(self, script_path)
+            return compilados[ruta]
+
+    script_cache.ScriptCache.get_bytecode = get_bytecode
+
+# ==================== SESIONES SIMULADAS ====================
+
+class ErrorApp(RuntimeError):
+    """Falla de la app (no del arnés): excepción en el script o envío que no se completó"""
+
+def ejecutar(at, tiempos, metrica):
+    """Corre la app una vez y registra la duración"""
+    inicio = time.perf_counter()
+    at.run()
+    tiempos[metrica].append(time.perf_counter() - inicio)
+    if at.exception:
+        raise ErrorApp(at.exception[0].value)
+
+def widget(elementos, etiqueta):
+    """Primer widget cuya etiqueta empieza con el texto dado"""
+    for elemento in elementos:
+        if elemento.label.startswith(etiqueta):
+            return elemento
+    raise LookupError(f"No se encontró el widget '{etiqueta}'")
+
+def sesion_simulada(numero, semilla, timeout):
+    """Recorre la encuesta y la vista de resultados como lo haría una persona"""
+    from streamlit.testing.v1 import AppTest
+
+    rnd = random.Random(semilla + numero)
+    tiempos = {'rerun': [], 'envio': []}
+
+    at = AppTest.from_file(RUTA_APP, default_timeout=timeout)
+    at.switch_page('paginas/mapeo.py')
+    ejecutar(at, tiempos, 'rerun')
+
+    # Página 0: consentimiento
+    at.checkbox(key='acepta_datos').check()
+    ejecutar(at, tiempos, 'rerun')
+    widget(at.button, 'INICIAR').click()
+    ejecutar(at, tiempos, 'rerun')
+
+    # Página 1: en el navegador cada respuesta solo vuelve a correr el fragmento de preguntas;
+    # aquí el conteo va en su propio rerun y el resto se envía junto con "Continuar"
+    at.number_input(key='num_org').set_value(1)
+    ejecutar(at, tiempos, 'rerun')
+    at.multiselect(key='labores_profesionales').set_value(rnd.sample(LABORES, 2))
+    at.text_input(key='cargo_org_0').input('Gestión cultural')
+    widget(at.button, 'Continuar').click()
+    ejecutar(at, tiempos, 'rerun')
+
+    # Página 2: herramientas administrativas
+    at.multiselect(key='herramientas_admin_conoce').set_value(['Mercadotecnia'])
+    at.multiselect(key='herramientas_admin_aplica').set_value(['Mercadotecnia'])
+    widget(at.button, 'Continuar').click()
+    ejecutar(at, tiempos, 'rerun')
+
+    # Página 3: herramientas digitales
+    usadas = rnd.sample(HERRAMIENTAS, 2)
+    widget(at.multiselect, '**1.').set_value(usadas)
+    at.multiselect(key='herr_pag').set_value(usadas[:1])
+    at.multiselect(key='ias').set_value(rnd.sample(IAS, 1))
+    widget(at.button, 'Continuar').click()
+    ejecutar(at, tiempos, 'rerun')
+
+    # Página 4: el país redibuja la lista de ciudades; el resto va con "Finalizar"
+    pais, ciudad = rnd.choice(LUGARES)
+    widget(at.selectbox, 'País').set_value(pais)
+    ejecutar(at, tiempos, 'rerun')
+    selector_ciudad = widget(at.selectbox, 'Ciudad')
+    selector_ciudad.set_value(ciudad if ciudad in selector_ciudad.options else selector_ciudad.options[0])
+    widget(at.selectbox, 'Rango de edad').set_value(rnd.choice(EDADES))
+    widget(at.selectbox, 'Nivel académico').set_value(rnd.choice(NIVELES))
+    widget(at.button, 'Finalizar').click()
+    ejecutar(at, tiempos, 'envio')
+    if at.session_state['encuesta_page'] != 5:
+        raise ErrorApp("La encuesta no llegó a la página de agradecimiento")
+
+    # Resultados: filtrar por país y volver a todos
+    at.selectbox(key='f_pais').set_value(pais)
+    ejecutar(at, tiempos, 'rerun')
+    at.selectbox(key='f_pais').set_value('Todos')
+    ejecutar(at, tiempos, 'rerun')
+
+    comprobar_tabla_compartida()
+    return tiempos
+
+def comprobar_tabla_compartida():
+    """Tras recargar la hoja, la tabla no puede tener más filas que la hoja ni escrituras pendientes.
+
+    Detecta respuestas contadas dos veces: escrituras locales que la recarga no reconoce
+    como ya guardadas (por ejemplo en hojas sin la columna clave_envio).
+    """
+    from datos import (
+        cargar_datos_compartidos, conectar_google_sheets, obtener_datos_compartidos, obtener_escrituras_locales
+    )
+
+    obtener_datos_compartidos.clear()
+    if obtener_datos_compartidos()[1] is None:
+        # La hoja no respondió (fallos inyectados): no hay recarga que comprobar
+        return
+    df_datos, _ = cargar_datos_compartidos()
+    pendientes = len(obtener_escrituras_locales()['registros'])
+    filas_hoja = conectar_google_sheets().respuestas()
+    if pendientes or len(df_datos) > filas_hoja:
+        raise ErrorApp(f"La tabla recargada tiene {len(df_datos)} filas y {pendientes} escrituras pendientes; "
+                       f"la hoja tiene {filas_hoja}")
+
+def iniciar_proceso(hoja):
+    """Prepara un proceso de la prueba: silencia avisos de Streamlit y usa la hoja compartida"""
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    instalar_hoja_simulada(hoja)
+    compartir_bytecode()
+
+def sesion_en_proceso(numero, semilla, timeout):
+    """Corre una sesión y devuelve tiempos, error clasificado y memoria del proceso (todo serializable)"""
+    resultado = {'tiempos': {'rerun': [], 'envio': []}, 'error_app': None, 'error_arnes': None,
+                 'inicio': time.time()}
+    try:
+        resultado['tiempos'] = sesion_simulada(numero, semilla, timeout)
+    except ErrorApp as e:
+        resultado['error_app'] = str(e)
+    except Exception as e:
+        resultado['error_arnes'] = f"{type(e).__name__}: {e}"
+    resultado['fin'] = time.time()
+    resultado['memoria_mb'] = memoria_residente_mb()
+    return resultado
+
+# ==================== REPORTE ====================
+
+def memoria_residente_mb():
+    """RSS actual del proceso (Linux) o pico de RSS en otros sistemas"""
+    try:
+        with open('/proc/self/status') as f:
+            for linea in f:
+                if linea.startswith('VmRSS:'):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maximo / (1024 * 1024) if sys.platform == 'darwin' else maximo / 1024
+
+def resumir(valores):
+    """Conteo, promedio y percentiles en milisegundos"""
+    if not valores:
+        return {'n': 0}
+    ms = np.asarray(valores) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {'n': len(ms), 'promedio_ms': float(ms.mean()), 'p50_ms': float(p50), 'p95_ms': float(p95),
+            'p99_ms': float(p99), 'max_ms': float(ms.max())}
+
+def correr_prueba(sesiones, concurrencia, respuestas_iniciales, latencia_ms, semilla, timeout,
+                  prob_429=0.0, prob_500=0.0, cuota_lecturas=None, cuota_escrituras=None, sin_clave=False):
+    """Lanza las sesiones en procesos paralelos que comparten la hoja simulada y devuelve el reporte"""
+    contexto = multiprocessing.get_context('spawn')
+    with GestorHoja(ctx=contexto) as gestor:
+        hoja = crear_hoja_local(respuestas_iniciales, latencia_ms / 1000, semilla, prob_429, prob_500,
+                                cuota_lecturas, cuota_escrituras, fabrica=gestor.HojaSimulada,
+                                sin_clave=sin_clave)
+        filas_iniciales = hoja.respuestas()
+
+        tiempos = {'rerun': [], 'envio': []}
+        errores_app = []
+        errores_arnes = []
+        memoria_pico = 0.0
+        inicios, fines = [], []
+
+        with ProcessPoolExecutor(max_workers=concurrencia, mp_context=contexto,
+                                 initializer=iniciar_proceso, initargs=(hoja,)) as executor:
+            futuros = [executor.submit(sesion_en_proceso, i, semilla, timeout) for i in range(sesiones)]
+            for futuro in as_completed(futuros):
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    # El proceso murió o no se pudo iniciar
+                    errores_arnes.append(f"{type(e).__name__}: {e}")
+                    continue
+                if resultado['error_app']:
+                    errores_app.append(resultado['error_app'])
+                if resultado['error_arnes']:
+                    errores_arnes.append(resultado['error_arnes'])
+                for metrica, valores in resultado['tiempos'].items():
+                    tiempos[metrica].extend(valores)
+                memoria_pico = max(memoria_pico, resultado['memoria_mb'])
+                inicios.append(resultado['inicio'])
+                fines.append(resultado['fin'])
+
+        # Desde que empieza la primera sesión, sin contar el arranque de los procesos
+        duracion = max(fines) - min(inicios) if inicios else 0.0
+        llamadas, errores_hoja = hoja.contadores()
+        filas_escritas = hoja.respuestas() - filas_iniciales
+
+    completadas = sesiones - len(errores_app) - len(errores_arnes)
+    return {
+        'sesiones': sesiones,
+        'concurrencia': concurrencia,
+        'respuestas_iniciales': respuestas_iniciales,
+        'latencia_hoja_ms': latencia_ms,
+        'hoja_sin_clave': sin_clave,
+        'completadas': completadas,
+        'errores_app': errores_app,
+        'errores_arnes': errores_arnes,
+        'filas_escritas': filas_escritas,
+        'llamadas_hoja': llamadas,
+        'errores_hoja': {str(codigo): n for codigo, n in sorted(errores_hoja.items())},
+        'duracion_s': duracion,
+        'sesiones_por_s': completadas / duracion if duracion else 0.0,
+        'reruns_por_s': (len(tiempos['rerun']) + len(tiempos['envio'])) / duracion if duracion else 0.0,
+        'rerun': resumir(tiempos['rerun']),
+        'envio': resumir(tiempos['envio']),
+        'memoria_pico_proceso_mb': memoria_pico
+    }
+
+def imprimir_reporte(reporte):
+    print(f"Sesiones: {reporte['completadas']}/{reporte['sesiones']} completadas "
+          f"(concurrencia {reporte['concurrencia']}, {reporte['respuestas_iniciales']} respuestas iniciales, "
+          f"latencia de hoja {reporte['latencia_hoja_ms']} ms)")
+    print(f"Duración: {reporte['duracion_s']:.1f} s · {reporte['sesiones_por_s']:.2f} sesiones/s · "
+          f"{reporte['reruns_por_s']:.1f} reruns/s · {reporte['filas_escritas']} filas escritas")
+    errores_hoja = ', '.join(f"{codigo}: {n}" for codigo, n in reporte['errores_hoja'].items()) or 'ninguno'
+    print(f"Hoja simulada: {sum(reporte['llamadas_hoja'].values())} llamadas · errores inyectados {errores_hoja}")
+    print()
+    print(f"{'':10}{'n':>7}{'prom':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+    for metrica in ('rerun', 'envio'):
+        r = reporte[metrica]
+        if not r['n']:
+            print(f"{metrica:10}{0:>7}")
+            continue
+        print(f"{metrica:10}{r['n']:>7}{r['promedio_ms']:>10.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+              f"{r['p99_ms']:>10.1f}{r['max_ms']:>10.1f}")
+    print()
+    print(f"Memoria (RSS): pico por proceso {reporte['memoria_pico_proceso_mb']:.0f} MB")
+    print(f"Errores de la app: {len(reporte['errores_app'])} · errores del arnés: {len(reporte['errores_arnes'])}")
+    for error in reporte['errores_app'][:10]:
+        print(f"  ❌ app: {error}")
+    for error in reporte['errores_arnes'][:10]:
+        print(f"  ⚠️ arnés: {error}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga con sesiones simultáneas de Streamlit AppTest")
+    parser.add_argument('--sesiones', type=int, default=20, help="Sesiones a simular en total")
+    parser.add_argument('--concurrencia', type=int, default=4, help="Sesiones simultáneas (una por proceso)")
+    parser.add_argument('--respuestas-iniciales', type=int, default=1000, help="Filas precargadas en la hoja local")
+    parser.add_argument('--latencia-ms', type=float, default=150, help="Latencia simulada de cada llamada a la hoja")
+    parser.add_argument('--prob-429', type=float, default=0.0, help="Probabilidad de que una llamada a la hoja devuelva 429")
+    parser.add_argument('--prob-500', type=float, default=0.0, help="Probabilidad de que una llamada a la hoja devuelva 500")
+    parser.add_argument('--cuota-lecturas', type=int, default=None, help="Lecturas por minuto antes de responder 429")
+    parser.add_argument('--cuota-escrituras', type=int, default=None, help="Escrituras por minuto antes de responder 429")
+    parser.add_argument('--hoja-sin-clave', action='store_true',
+                        help="La hoja empieza sin la columna clave_envio (hojas anteriores a ella)")
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--timeout', type=float, default=120, help="Tiempo máximo por ejecución de la app (s)")
+    parser.add_argument('--json', help="Ruta donde guardar el reporte en JSON")
+    args = parser.parse_args()
+
+    # Streamlit avisa de contextos faltantes y parámetros obsoletos en cada ejecución
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    reporte = correr_prueba(args.sesiones, args.concurrencia, args.respuestas_iniciales,
+                            args.latencia_ms, args.semilla, args.timeout, args.prob_429, args.prob_500,
+                            args.cuota_lecturas, args.cuota_escrituras, args.hoja_sin_clave)
+    imprimir_reporte(reporte)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+
+    return 1 if reporte['errores_app'] or reporte['errores_arnes'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
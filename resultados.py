@@ -0,0 +1,1335 @@
+"""Vista de resultados del mapeo: mapa, cruces, coocurrencias, series, perfiles, ranking, roles y comparación de cohortes"""
+import streamlit as st
+import re
+import threading
+import unicodedata
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from datos import (
+    LABORES_OPCIONES, RANGOS_MEDICION, cargar_datos_compartidos, calcular_opciones_filtros,
+    obtener_geonames, obtener_codigos_paises, filtrar_datos
+)
+from graficos import (
+    COLORES_AZUL, COLORES_MORADO, COLORES_COHORTES, CATEGORIAS_HERRAMIENTAS, crear_scatter_dual,
+    crear_grafico_labores, crear_grafico_torta, crear_grafico_herramientas, crear_barras_comparadas,
+    crear_grafico_roles, calcular_promedios
+)
+
+# ==================== MAPA GEOGRÁFICO ====================
+
+# En el nivel de detalle z cada celda de la cuadrícula mide 180 / 2**z grados
+NIVELES_ZOOM_MAPA = list(range(0, 8))
+
+@st.cache_resource
+def obtener_indice_coordenadas():
+    """Tabla (código de país, ciudad) -> (latitud, longitud), construida una vez por proceso"""
+    indice = {}
+    poblaciones = {}
+    for city in obtener_geonames().get_cities().values():
+        clave = (city["countrycode"], city["name"])
+        # Con ciudades homónimas dentro de un país se usa la más poblada
+        poblacion = city.get("population", 0) or 0
+        if poblacion >= poblaciones.get(clave, -1):
+            poblaciones[clave] = poblacion
+            indice[clave] = (city["latitude"], city["longitude"])
+    return indice
+
+def resolver_coordenadas(df_datos):
+    """Devuelve latitud y longitud por fila (NaN si no se encuentra la ciudad)"""
+    indice = obtener_indice_coordenadas()
+    codigos_paises = obtener_codigos_paises()
+
+    # Solo se busca cada par (país, ciudad) distinto una vez
+    pares = df_datos['pais'].astype(str) + '|' + df_datos['ciudad'].astype(str)
+    codigos, unicos = pd.factorize(pares)
+    coordenadas = np.full((len(unicos), 2), np.nan)
+    for i, par in enumerate(unicos):
+        pais, ciudad = par.split('|', 1)
+        punto = indice.get((codigos_paises.get(pais), ciudad))
+        if punto is not None:
+            coordenadas[i] = punto
+
+    return coordenadas[codigos, 0], coordenadas[codigos, 1]
+
+def agregar_en_celdas(lat, lon, formalizacion, digitalizacion, zoom):
+    """Agrupa puntos en celdas de la cuadrícula con su centroide y promedios"""
+    tam_celda = 180.0 / 2 ** zoom
+    columnas = int(np.ceil(360.0 / tam_celda)) + 1
+    ix = np.floor((lon + 180.0) / tam_celda).astype(np.int64)
+    iy = np.floor((lat + 90.0) / tam_celda).astype(np.int64)
+    _, inversa = np.unique(iy * columnas + ix, return_inverse=True)
+
+    conteo = np.bincount(inversa)
+
+    def promedio(valores):
+        return np.bincount(inversa, weights=valores) / conteo
+
+    return pd.DataFrame({
+        'latitud': promedio(lat),
+        'longitud': promedio(lon),
+        'respuestas': conteo,
+        'formalizacion': promedio(formalizacion),
+        'digitalizacion': promedio(digitalizacion)
+    })
+
+@st.cache_data(max_entries=64)
+def precalcular_celdas_mapa(version_datos, clave_filtros, _df_filtrado):
+    """Celdas agregadas para todos los niveles de zoom, por versión de datos y filtros"""
+    lat, lon = resolver_coordenadas(_df_filtrado)
+    ubicados = ~np.isnan(lat)
+    formalizacion = _df_filtrado['nivel_formalizacion'].to_numpy(dtype=float)[ubicados]
+    digitalizacion = _df_filtrado['nivel_digitalizacion'].to_numpy(dtype=float)[ubicados]
+
+    celdas = {
+        zoom: agregar_en_celdas(lat[ubicados], lon[ubicados], formalizacion, digitalizacion, zoom)
+        for zoom in NIVELES_ZOOM_MAPA
+    }
+    return celdas, int((~ubicados).sum())
+
+def crear_mapa_celdas(celdas, indicador):
+    """Mapa de burbujas: tamaño según respuestas y color según el promedio del indicador"""
+    columna = 'formalizacion' if indicador == 'Formalización' else 'digitalizacion'
+    escala = [[0, '#B3D9EE'], [1, '#0B3C5D']] if columna == 'formalizacion' else [[0, '#FBD3E0'], [1, '#7A0E3B']]
+    max_respuestas = max(int(celdas['respuestas'].max()), 1) if len(celdas) else 1
+
+    fig = go.Figure(go.Scattergeo(
+        lat=celdas['latitud'],
+        lon=celdas['longitud'],
+        mode='markers',
+        marker=dict(
+            size=8 + 27 * np.sqrt(celdas['respuestas'] / max_respuestas),
+            color=celdas[columna],
+            colorscale=escala,
+            cmin=0,
+            cmax=100,
+            colorbar=dict(title=indicador),
+            opacity=0.85,
+            line=dict(width=1, color='white')
+        ),
+        customdata=np.column_stack([celdas['respuestas'], celdas['formalizacion'], celdas['digitalizacion']]),
+        hovertemplate='Respuestas: %{customdata[0]:.0f}<br>Formalización: %{customdata[1]:.1f}<br>Digitalización: %{customdata[2]:.1f}<extra></extra>'
+    ))
+    fig.update_geos(
+        projection_type='natural earth',
+        showcountries=True,
+        countrycolor='#e0e0e0',
+        fitbounds='locations' if len(celdas) else False
+    )
+    fig.update_layout(height=550, margin=dict(t=10, b=10, l=10, r=10))
+    return fig
+
+def mostrar_mapa_geografico(df_filtrado, version_datos, clave_filtros):
+    """Mapa de respuestas agregadas por zona con nivel de detalle ajustable"""
+    celdas_por_zoom, sin_ubicar = precalcular_celdas_mapa(version_datos, clave_filtros, df_filtrado)
+
+    col_zoom, col_color = st.columns(2)
+    with col_zoom:
+        zoom = st.select_slider("Nivel de detalle:", options=NIVELES_ZOOM_MAPA, value=3, key="mapa_zoom")
+    with col_color:
+        indicador = st.radio("Color según:", ["Formalización", "Digitalización"], horizontal=True, key="mapa_color")
+
+    st.plotly_chart(crear_mapa_celdas(celdas_por_zoom[zoom], indicador), use_container_width=True)
+
+    if sin_ubicar:
+        st.caption(f"{sin_ubicar} respuestas con ciudad no encontrada no aparecen en el mapa.")
+
+# ==================== TABLAS CRUZADAS ====================
+
+VARIABLES_CATEGORICAS = {
+    'jerarquia': 'Tipo de jerarquía',
+    'planeacion': 'Tipo de planeación',
+    'ecosistema': 'Tipo de ecosistema',
+    'redes': 'Tipo de red',
+    'liderazgo': 'Tipo de liderazgo',
+    'artista_independiente': '¿Qué tan independiente eres?',
+    'pais': 'País',
+    'ciudad': 'Ciudad',
+    'edad': 'Rango de edad',
+    'nivel_academico': 'Nivel académico'
+}
+
+@st.cache_resource(max_entries=8)
+def codificar_categoricas(version_datos, _df_datos):
+    """Códigos enteros por columna categórica (-1 para respuestas vacías), una vez por versión de datos.
+
+    Es de solo lectura y todas las sesiones comparten los mismos arreglos, sin copiarlos en cada rerun.
+    """
+    codificadas = {}
+    for columna in VARIABLES_CATEGORICAS:
+        valores = _df_datos[columna].astype(str).replace('', np.nan)
+        codigos, categorias = pd.factorize(valores, sort=True)
+        codigos.setflags(write=False)
+        codificadas[columna] = (codigos, categorias.tolist())
+    return codificadas
+
+def tabla_contingencia(codigos_filas, codigos_columnas, n_filas, n_columnas):
+    """Matriz de conteos a partir de códigos enteros, con un solo bincount"""
+    validos = (codigos_filas >= 0) & (codigos_columnas >= 0)
+    celdas = codigos_filas[validos] * n_columnas + codigos_columnas[validos]
+    return np.bincount(celdas, minlength=n_filas * n_columnas).reshape(n_filas, n_columnas)
+
+def estadistico_chi_cuadrado(conteos):
+    """Chi cuadrado de independencia, grados de libertad y V de Cramér"""
+    total = conteos.sum()
+    if total == 0:
+        return 0.0, 0, 0.0
+    esperados = np.outer(conteos.sum(axis=1), conteos.sum(axis=0)) / total
+    con_datos = esperados > 0
+    chi2 = float((((conteos - esperados) ** 2)[con_datos] / esperados[con_datos]).sum())
+    filas, columnas = conteos.shape
+    gl = (filas - 1) * (columnas - 1)
+    menor = min(filas, columnas) - 1
+    cramer_v = float(np.sqrt(chi2 / (total * menor))) if menor > 0 else 0.0
+    return chi2, gl, cramer_v
+
+@st.cache_data(max_entries=256)
+def calcular_tabla_cruzada(version_datos, clave_filtros, var_filas, var_columnas, _codificadas, _indices):
+    """Conteos, porcentajes por fila y columna y chi cuadrado para un par de variables"""
+    codigos_filas, categorias_filas = _codificadas[var_filas]
+    codigos_columnas, categorias_columnas = _codificadas[var_columnas]
+
+    conteos = tabla_contingencia(codigos_filas[_indices], codigos_columnas[_indices],
+                                 len(categorias_filas), len(categorias_columnas))
+
+    # Se descartan las categorías que no aparecen con los filtros actuales
+    filas_presentes = conteos.sum(axis=1) > 0
+    columnas_presentes = conteos.sum(axis=0) > 0
+    conteos = conteos[filas_presentes][:, columnas_presentes]
+    etiquetas_filas = [c for c, presente in zip(categorias_filas, filas_presentes) if presente]
+    etiquetas_columnas = [c for c, presente in zip(categorias_columnas, columnas_presentes) if presente]
+
+    chi2, gl, cramer_v = estadistico_chi_cuadrado(conteos)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pct_filas = np.nan_to_num(conteos / conteos.sum(axis=1, keepdims=True) * 100)
+        pct_columnas = np.nan_to_num(conteos / conteos.sum(axis=0, keepdims=True) * 100)
+
+    def como_tabla(valores):
+        return pd.DataFrame(valores, index=etiquetas_filas, columns=etiquetas_columnas)
+
+    total = int(conteos.sum())
+    esperados = np.outer(conteos.sum(axis=1), conteos.sum(axis=0)) / total if total else np.zeros(conteos.shape)
+
+    return {
+        'conteos': como_tabla(conteos),
+        'pct_filas': como_tabla(pct_filas),
+        'pct_columnas': como_tabla(pct_columnas),
+        'total': total,
+        'chi2': chi2,
+        'gl': gl,
+        'cramer_v': cramer_v,
+        'pct_esperados_bajos': float((esperados < 5).mean() * 100) if esperados.size else 0.0
+    }
+
+def mostrar_tabla_cruzada(df_datos, df_filtrado, version_datos, clave_filtros):
+    """Explorador de cruces entre dos variables categóricas"""
+    opciones = list(VARIABLES_CATEGORICAS)
+
+    col_filas, col_columnas, col_vista = st.columns(3)
+    with col_filas:
+        var_filas = st.selectbox("Filas:", opciones, index=opciones.index('jerarquia'),
+                                 format_func=VARIABLES_CATEGORICAS.get, key="cruce_filas")
+    with col_columnas:
+        var_columnas = st.selectbox("Columnas:", opciones, index=opciones.index('planeacion'),
+                                    format_func=VARIABLES_CATEGORICAS.get, key="cruce_columnas")
+    with col_vista:
+        vista = st.radio("Mostrar:", ["Conteos", "% por fila", "% por columna"], horizontal=True, key="cruce_vista")
+
+    if var_filas == var_columnas:
+        st.warning("Selecciona dos variables diferentes para cruzarlas.")
+        return
+
+    codificadas = codificar_categoricas(version_datos, df_datos)
+    tabla = calcular_tabla_cruzada(version_datos, clave_filtros, var_filas, var_columnas,
+                                   codificadas, df_filtrado.index.to_numpy())
+
+    if tabla['total'] == 0:
+        st.info("No hay respuestas con ambas variables para los filtros seleccionados.")
+        return
+
+    datos = {"Conteos": tabla['conteos'], "% por fila": tabla['pct_filas'], "% por columna": tabla['pct_columnas']}[vista]
+    formato = '%{z:.0f}' if vista == "Conteos" else '%{z:.1f}%'
+
+    fig = go.Figure(data=go.Heatmap(
+        z=datos.values,
+        x=datos.columns.tolist(),
+        y=datos.index.tolist(),
+        colorscale=[[0, '#FFFFFF'], [0.5, '#6FB6DE'], [1, '#0B3C5D']],
+        texttemplate=formato,
+        hovertemplate=f'{VARIABLES_CATEGORICAS[var_filas]}: %{{y}}<br>{VARIABLES_CATEGORICAS[var_columnas]}: %{{x}}<br>Valor: {formato}<extra></extra>',
+        showscale=False
+    ))
+    fig.update_layout(
+        height=max(350, 60 * len(datos.index) + 150),
+        plot_bgcolor='white',
+        xaxis=dict(tickangle=-30),
+        yaxis=dict(autorange='reversed'),
+        margin=dict(t=20, b=20, l=20, r=20)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.caption(
+        f"χ² = {tabla['chi2']:.2f} · grados de libertad = {tabla['gl']} · "
+        f"V de Cramér = {tabla['cramer_v']:.2f} · n = {tabla['total']}"
+    )
+    if tabla['pct_esperados_bajos'] > 20:
+        st.caption("⚠️ Más del 20% de las celdas tienen una frecuencia esperada menor a 5: interpreta el χ² con cautela.")
+
+# ==================== COOCURRENCIAS ====================
+
+CAMPOS_MULTIPLES = {
+    'herramientas': 'Herramientas digitales',
+    'ias': 'Inteligencias artificiales',
+    'comunidades': 'Comunidades en línea',
+    'labores_profesionales': 'Labores profesionales'
+}
+
+@st.cache_resource(max_entries=8)
+def construir_indicadores(version_datos, _df_datos):
+    """Matriz indicadora dispersa por campo de selección múltiple: (filas, códigos, etiquetas, total de filas).
+
+    Cada par (fila, opción) aparece una vez, ordenado por fila y luego por opción.
+    Es de solo lectura y todas las sesiones comparten los mismos arreglos.
+    """
+    indicadores = {}
+    for campo in CAMPOS_MULTIPLES:
+        opciones = _df_datos[campo].astype(str).str.split('|').explode().str.strip()
+        opciones = opciones[(opciones != '') & (opciones != 'Ninguna')]
+        codigos, etiquetas = pd.factorize(opciones, sort=True)
+
+        k = max(len(etiquetas), 1)
+        claves = np.unique(opciones.index.to_numpy(dtype=np.int64) * k + codigos)
+        filas, codigos = claves // k, claves % k
+        filas.setflags(write=False)
+        codigos.setflags(write=False)
+        indicadores[campo] = (filas, codigos, etiquetas.tolist(), len(_df_datos))
+    return indicadores
+
+def producto_indicadores(filas, codigos, k):
+    """Xᵀ·X de una matriz indicadora dispersa ordenada por fila, con bincount.
+
+    Los pares de opciones de una misma fila están a distancia d < k en los arreglos;
+    cada distancia se cuenta con un bincount sobre todas las filas a la vez.
+    """
+    usos = np.bincount(codigos, minlength=k)
+    superior = np.zeros(k * k, dtype=np.int64)
+    for d in range(1, k):
+        misma_fila = filas[d:] == filas[:-d]
+        if not misma_fila.any():
+            break
+        superior += np.bincount(codigos[:-d][misma_fila] * k + codigos[d:][misma_fila], minlength=k * k)
+    superior = superior.reshape(k, k)
+    return superior + superior.T + np.diag(usos)
+
+@st.cache_data(max_entries=256)
+def calcular_coocurrencias(version_datos, clave_filtros, campo, _indicadores, _indices):
+    """Coocurrencias (Xᵀ·X) de las respuestas filtradas, con lift y Jaccard por par"""
+    filas, codigos, etiquetas, total_filas = _indicadores[campo]
+    seleccion = np.zeros(total_filas, dtype=bool)
+    seleccion[_indices] = True
+    en_filtro = seleccion[filas]
+    n = len(_indices)
+
+    coocurrencias = producto_indicadores(filas[en_filtro], codigos[en_filtro], len(etiquetas))
+    usos = np.diag(coocurrencias).astype(float)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        lift = coocurrencias * n / np.outer(usos, usos)
+        jaccard = coocurrencias / (usos[:, None] + usos[None, :] - coocurrencias)
+    np.fill_diagonal(lift, np.nan)
+    np.fill_diagonal(jaccard, np.nan)
+
+    i, j = np.triu_indices(len(etiquetas), k=1)
+    pares = pd.DataFrame({
+        'Opción A': [etiquetas[a] for a in i],
+        'Opción B': [etiquetas[b] for b in j],
+        'Personas': coocurrencias[i, j],
+        'Lift': lift[i, j],
+        'Jaccard': jaccard[i, j]
+    })
+    pares = pares[pares['Personas'] > 0].sort_values('Personas', ascending=False).reset_index(drop=True)
+
+    def como_tabla(valores):
+        return pd.DataFrame(valores, index=etiquetas, columns=etiquetas)
+
+    return {
+        'conteos': como_tabla(coocurrencias),
+        'lift': como_tabla(lift),
+        'jaccard': como_tabla(jaccard),
+        'pares': pares,
+        'respuestas': n
+    }
+
+def mostrar_coocurrencias(df_datos, df_filtrado, version_datos, clave_filtros):
+    """Mapa de calor de las opciones que las personas eligen juntas"""
+    col_campo, col_metrica = st.columns(2)
+    with col_campo:
+        campo = st.selectbox("Campo:", list(CAMPOS_MULTIPLES), format_func=CAMPOS_MULTIPLES.get, key="cooc_campo")
+    with col_metrica:
+        metrica = st.radio("Medida:", ["Personas", "Lift", "Jaccard"], horizontal=True, key="cooc_metrica")
+
+    indicadores = construir_indicadores(version_datos, df_datos)
+    resultado = calcular_coocurrencias(version_datos, clave_filtros, campo, indicadores, df_filtrado.index.to_numpy())
+
+    if resultado['conteos'].empty:
+        st.info("Nadie ha seleccionado opciones en este campo con los filtros actuales.")
+        return
+
+    datos = {"Personas": resultado['conteos'], "Lift": resultado['lift'], "Jaccard": resultado['jaccard']}[metrica]
+    formato = '%{z:.0f}' if metrica == "Personas" else '%{z:.2f}'
+
+    fig = go.Figure(data=go.Heatmap(
+        z=datos.values,
+        x=datos.columns.tolist(),
+        y=datos.index.tolist(),
+        colorscale=[[0, '#FFFFFF'], [0.5, '#F06B94'], [1, '#7A0E3B']],
+        texttemplate=formato,
+        hovertemplate=f'%{{y}} + %{{x}}<br>{metrica}: {formato}<extra></extra>',
+        showscale=False
+    ))
+    fig.update_layout(
+        height=max(400, 45 * len(datos.index) + 200),
+        plot_bgcolor='white',
+        xaxis=dict(tickangle=-45),
+        yaxis=dict(autorange='reversed'),
+        margin=dict(t=20, b=20, l=20, r=20)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(
+        "Lift > 1: las dos opciones aparecen juntas más de lo esperado por azar. "
+        "Jaccard: proporción de quienes usan alguna de las dos que usan ambas."
+    )
+
+    if not resultado['pares'].empty:
+        st.dataframe(
+            resultado['pares'].head(10),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                'Lift': st.column_config.NumberColumn(format="%.2f"),
+                'Jaccard': st.column_config.NumberColumn(format="%.2f")
+            }
+        )
+
+# ==================== SERIE DE TIEMPO ====================
+
+COLUMNAS_SERIE = ['envios', 'nivel_formalizacion', 'nivel_digitalizacion', 'tipo_org_score']
+
+@st.cache_resource
+def obtener_serie_envios():
+    """Estado compartido por el proceso con los envíos agregados por día y por semana"""
+    vacia = pd.DataFrame(columns=COLUMNAS_SERIE, dtype=float, index=pd.DatetimeIndex([], name='periodo'))
+    return {
+        'lock': threading.Lock(),
+        'filas': 0,
+        'ultimo_timestamp': None,
+        'diario': vacia,
+        'semanal': vacia.copy()
+    }
+
+def acumular_periodos(tabla, nuevos):
+    """Suma los periodos que ya existían y agrega al final los periodos nuevos"""
+    existentes = nuevos.index.isin(tabla.index)
+    tabla = tabla.copy()
+    tabla.loc[nuevos.index[existentes]] += nuevos[existentes]
+    return pd.concat([tabla, nuevos[~existentes]]).sort_index()
+
+def actualizar_serie_envios(df_datos):
+    """Procesa solo las filas nuevas desde la última actualización (la hoja solo crece al final)"""
+    serie = obtener_serie_envios()
+    with serie['lock']:
+        filas = serie['filas']
+        # Si cambió alguna fila ya procesada (ediciones o borrados en la hoja) se reconstruye todo
+        if len(df_datos) < filas or (filas and df_datos['timestamp'].iat[filas - 1] != serie['ultimo_timestamp']):
+            serie['diario'] = serie['diario'].iloc[0:0]
+            serie['semanal'] = serie['semanal'].iloc[0:0]
+            filas = 0
+
+        if len(df_datos) > filas:
+            nuevas = df_datos.iloc[filas:]
+            fechas = pd.to_datetime(nuevas['timestamp'], format='ISO8601', errors='coerce')
+            validas = fechas.notna().to_numpy()
+
+            valores = nuevas.loc[validas, COLUMNAS_SERIE[1:]].astype(float)
+            valores.insert(0, 'envios', 1.0)
+            dias = fechas[validas].dt.floor('D')
+            semanas = dias - pd.to_timedelta(dias.dt.weekday, unit='D')
+
+            serie['diario'] = acumular_periodos(serie['diario'], valores.groupby(dias.to_numpy()).sum())
+            serie['semanal'] = acumular_periodos(serie['semanal'], valores.groupby(semanas.to_numpy()).sum())
+            serie['filas'] = len(df_datos)
+            serie['ultimo_timestamp'] = df_datos['timestamp'].iat[-1]
+
+        return serie['diario'], serie['semanal']
+
+def crear_grafico_serie(sumas, frecuencia, ventana):
+    """Barras de envíos por periodo y líneas con el promedio móvil de los puntajes"""
+    sumas = sumas.asfreq(frecuencia, fill_value=0)
+    moviles = sumas.rolling(ventana, min_periods=1).sum()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        promedios = moviles[COLUMNAS_SERIE[1:]].div(moviles['envios'], axis=0)
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=sumas.index, y=sumas['envios'], name='Envíos', marker_color='#B3D9EE'))
+    fig.add_trace(go.Scatter(x=promedios.index, y=promedios['nivel_formalizacion'], name='Formalización (promedio móvil)',
+                             mode='lines', line=dict(color='#258DC5', width=3), yaxis='y2'))
+    fig.add_trace(go.Scatter(x=promedios.index, y=promedios['nivel_digitalizacion'], name='Digitalización (promedio móvil)',
+                             mode='lines', line=dict(color='#EA185E', width=3), yaxis='y2'))
+    fig.update_layout(
+        height=450,
+        plot_bgcolor='white',
+        hovermode='x unified',
+        yaxis=dict(title='Envíos', gridcolor='#f0f0f0', rangemode='tozero'),
+        yaxis2=dict(title='Nivel (0-100)', overlaying='y', side='right', range=[0, 100], showgrid=False),
+        legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5),
+        margin=dict(t=20)
+    )
+    return fig
+
+def mostrar_serie_envios(df_datos):
+    """Envíos diarios o semanales con promedios móviles de los puntajes"""
+    diario, semanal = actualizar_serie_envios(df_datos)
+    if diario.empty:
+        st.info("Aún no hay envíos con fecha registrada.")
+        return
+
+    periodo = st.radio("Periodo:", ["Diario", "Semanal"], horizontal=True, key="serie_periodo")
+    if periodo == "Diario":
+        fig = crear_grafico_serie(diario, 'D', 7)
+        st.caption("Promedio móvil de 7 días, ponderado por número de envíos. Incluye todas las respuestas, sin filtros.")
+    else:
+        fig = crear_grafico_serie(semanal, 'W-MON', 4)
+        st.caption("Promedio móvil de 4 semanas, ponderado por número de envíos. Incluye todas las respuestas, sin filtros.")
+    st.plotly_chart(fig, use_container_width=True)
+
+# ==================== INTERVALOS DE CONFIANZA ====================
+
+COLUMNAS_PROMEDIO_IC = ['num_organizaciones', 'num_proyectos', 'num_labores', 'num_herramientas',
+                        'num_herramientas_pagadas', 'num_ias', 'num_ias_pagadas', 'num_comunidades']
+COLUMNAS_PORCENTAJE_IC = ['jerarquia', 'planeacion', 'ecosistema', 'redes', 'liderazgo']
+REPETICIONES_BOOTSTRAP = 1000
+SEMILLA_BOOTSTRAP = 2024
+# Tope de índices de remuestreo por bloque (repeticiones x personas)
+ELEMENTOS_POR_BLOQUE = 4_000_000
+
+def bootstrap_promedios(valores, repeticiones=REPETICIONES_BOOTSTRAP, semilla=SEMILLA_BOOTSTRAP, nivel=0.95):
+    """Intervalo percentil de la media de cada columna de valores (n x k) con una matriz de índices de remuestreo"""
+    n, k = valores.shape
+    rng = np.random.default_rng(semilla)
+    medias = np.empty((repeticiones, k))
+    # Las repeticiones se procesan en bloques para acotar la memoria con tablas grandes
+    bloque = max(1, ELEMENTOS_POR_BLOQUE // max(n, 1))
+    for inicio in range(0, repeticiones, bloque):
+        fin = min(inicio + bloque, repeticiones)
+        indices = rng.integers(0, n, size=(fin - inicio, n))
+        # Veces que sale cada persona en cada remuestreo; la media es un producto matricial
+        desplazados = indices + np.arange(fin - inicio)[:, None] * n
+        conteos = np.bincount(desplazados.ravel(), minlength=(fin - inicio) * n).reshape(fin - inicio, n)
+        medias[inicio:fin] = conteos @ valores / n
+    alfa = (1 - nivel) / 2 * 100
+    return np.percentile(medias, [alfa, 100 - alfa], axis=0)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def calcular_intervalos(version_datos, clave_filtros, _df_filtrado):
+    """Intervalos de 95% de los promedios y porcentajes de la vista, cacheados por estado de filtros"""
+    if len(_df_filtrado) < 2:
+        return {}
+
+    # Los porcentajes son promedios de indicadores 0/1 por categoría
+    indicadores = pd.get_dummies(_df_filtrado[COLUMNAS_PORCENTAJE_IC], prefix_sep='=', dtype=float) * 100
+    tabla = pd.concat([_df_filtrado[COLUMNAS_PROMEDIO_IC].astype(float), indicadores], axis=1)
+
+    bajos, altos = bootstrap_promedios(tabla.to_numpy())
+    return {columna: (bajo, alto) for columna, bajo, alto in zip(tabla.columns, bajos, altos)}
+
+def texto_intervalo(intervalos, columna, decimales=1):
+    """'IC 95%: a – b' para las tarjetas, o vacío si no hay intervalo"""
+    if columna not in intervalos:
+        return ""
+    bajo, alto = intervalos[columna]
+    return f"IC 95%: {bajo:.{decimales}f} – {alto:.{decimales}f}"
+
+def tabla_porcentajes_intervalo(df_filtrado, intervalos):
+    """Porcentaje de cada categoría de las tortas con su intervalo"""
+    filas = []
+    for columna in COLUMNAS_PORCENTAJE_IC:
+        for categoria, proporcion in df_filtrado[columna].value_counts(normalize=True).items():
+            bajo, alto = intervalos.get(f"{columna}={categoria}", (np.nan, np.nan))
+            filas.append({'Variable': columna, 'Categoría': categoria, '%': round(proporcion * 100, 1),
+                          'IC 95% inferior': round(bajo, 1), 'IC 95% superior': round(alto, 1)})
+    return pd.DataFrame(filas)
+
+# ==================== PERFILES ====================
+
+OPCIONES_NUM_PERFILES = [2, 3, 4, 5, 6, 7, 8]
+NUM_PERFILES = 4
+CAMPOS_PERFIL_CATEGORICOS = ['jerarquia', 'planeacion', 'liderazgo']
+CAMPOS_PERFIL_MULTIPLES = ['herramientas', 'ias', 'comunidades']
+# Peso de cada bloque de variables: los puntajes pesan más que cada opción suelta
+PESO_PUNTAJES = 2.0
+PESO_MULTIPLES = 0.5
+# Si la tabla crece más de este factor desde el último ajuste, el modelo se reajusta
+CRECIMIENTO_REAJUSTE = 2.0
+COLORES_PERFILES = ['#0B3C5D', '#EA185E', '#258DC5', '#7A0E3B', '#6FB6DE', '#F06B94', '#1B6A99', '#B0123F']
+
+def vocabulario_perfiles(df_datos):
+    """Categorías y opciones que definen las columnas de la codificación"""
+    vocabulario = {}
+    for campo in CAMPOS_PERFIL_CATEGORICOS:
+        vocabulario[campo] = sorted(v for v in df_datos[campo].astype(str).unique() if v != '')
+    for campo in CAMPOS_PERFIL_MULTIPLES:
+        opciones = df_datos[campo].astype(str).str.split('|').explode().str.strip()
+        vocabulario[campo] = sorted(set(opciones) - {'', 'Ninguna'})
+    return vocabulario
+
+def codificar_perfiles(df, vocabulario):
+    """Matriz (respuestas x variables): puntajes escalados a 0-1 y codificación one-hot con el vocabulario dado"""
+    bloques = [
+        PESO_PUNTAJES * np.column_stack([
+            (df['tipo_org_score'].to_numpy(dtype=float) + 10) / 20,
+            df['nivel_formalizacion'].to_numpy(dtype=float) / 100,
+            df['nivel_digitalizacion'].to_numpy(dtype=float) / 100
+        ])
+    ]
+    for campo in CAMPOS_PERFIL_CATEGORICOS:
+        # Las categorías que no estaban al ajustar el modelo quedan en cero
+        codigos = pd.Index(vocabulario[campo]).get_indexer(df[campo].astype(str))
+        bloque = np.zeros((len(df), len(vocabulario[campo])))
+        validos = codigos >= 0
+        bloque[np.flatnonzero(validos), codigos[validos]] = 1
+        bloques.append(bloque)
+    for campo in CAMPOS_PERFIL_MULTIPLES:
+        normalizado = df[campo].astype(str).str.replace(r'\s*\|\s*', '|', regex=True)
+        indicadores = normalizado.str.get_dummies(sep='|').reindex(columns=vocabulario[campo], fill_value=0)
+        bloques.append(PESO_MULTIPLES * indicadores.to_numpy(dtype=float))
+    return np.hstack(bloques)
+
+def distancias_cuadradas(X, centroides):
+    """Distancia euclidiana al cuadrado de cada fila a cada centroide, sin ciclos"""
+    return np.maximum(
+        (X ** 2).sum(axis=1)[:, None] - 2 * X @ centroides.T + (centroides ** 2).sum(axis=1)[None, :], 0)
+
+def kmeans(X, k, semilla=0, reinicios=4, iteraciones=100):
+    """k-means vectorizado (Lloyd con inicio k-means++); devuelve (centroides, etiquetas) del mejor reinicio"""
+    rng = np.random.default_rng(semilla)
+    n = len(X)
+    mejor = None
+    for _ in range(reinicios):
+        # k-means++: cada centro nuevo se elige con probabilidad proporcional a la distancia al más cercano
+        centroides = X[[rng.integers(n)]]
+        for _ in range(1, k):
+            d = distancias_cuadradas(X, centroides).min(axis=1)
+            total = d.sum()
+            siguiente = rng.choice(n, p=d / total) if total > 0 else rng.integers(n)
+            centroides = np.vstack([centroides, X[siguiente]])
+
+        for _ in range(iteraciones):
+            distancias = distancias_cuadradas(X, centroides)
+            etiquetas = distancias.argmin(axis=1)
+            conteos = np.bincount(etiquetas, minlength=k)
+            sumas = (etiquetas[None, :] == np.arange(k)[:, None]).astype(X.dtype) @ X
+            nuevos = centroides.copy()
+            llenos = conteos > 0
+            nuevos[llenos] = sumas[llenos] / conteos[llenos, None]
+            # Un grupo vacío toma el punto peor representado
+            for vacio in np.flatnonzero(~llenos):
+                nuevos[vacio] = X[distancias.min(axis=1).argmax()]
+            if np.allclose(nuevos, centroides):
+                break
+            centroides = nuevos
+
+        etiquetas = distancias_cuadradas(X, centroides).argmin(axis=1)
+        inercia = distancias_cuadradas(X, centroides).min(axis=1).sum()
+        if mejor is None or inercia < mejor[0]:
+            mejor = (inercia, centroides, etiquetas)
+    return mejor[1], mejor[2]
+
+@st.cache_resource
+def obtener_modelo_perfiles(k):
+    """Estado compartido por el proceso: modelo de perfiles y perfil asignado a cada fila de la tabla"""
+    return {
+        'lock': threading.Lock(),
+        'version': None,
+        'vocabulario': None,
+        'centroides': None,
+        'etiquetas': np.empty(0, dtype=int),
+        'filas_ajuste': 0,
+        'ultimo_timestamp': None
+    }
+
+def copia_perfiles(modelo):
+    """Etiquetas, centroides y versión del modelo en un momento dado (los arreglos se reemplazan, no se modifican)"""
+    return {'version': modelo['version'], 'etiquetas': modelo['etiquetas'], 'centroides': modelo['centroides']}
+
+def actualizar_perfiles(df_datos, version_datos, k):
+    """Ajusta el modelo la primera vez y asigna al centroide más cercano solo las filas nuevas.
+
+    Devuelve una copia tomada bajo el lock: otra sesión puede reajustar el modelo
+    compartido para otra versión de datos mientras esta usa sus etiquetas.
+    """
+    modelo = obtener_modelo_perfiles(k)
+    with modelo['lock']:
+        if modelo['version'] == version_datos:
+            return copia_perfiles(modelo)
+
+        filas = len(modelo['etiquetas'])
+        # Ediciones o borrados en la hoja, o mucho crecimiento desde el ajuste, obligan a reajustar
+        reajustar = (
+            modelo['centroides'] is None
+            or len(df_datos) < filas
+            or (filas and df_datos['timestamp'].iat[filas - 1] != modelo['ultimo_timestamp'])
+            or len(df_datos) > CRECIMIENTO_REAJUSTE * modelo['filas_ajuste']
+        )
+
+        if reajustar:
+            modelo['vocabulario'] = vocabulario_perfiles(df_datos)
+            X = codificar_perfiles(df_datos, modelo['vocabulario'])
+            k_efectivo = min(k, len(df_datos))
+            modelo['centroides'], modelo['etiquetas'] = kmeans(X, k_efectivo)
+            modelo['filas_ajuste'] = len(df_datos)
+        elif len(df_datos) > filas:
+            X_nuevas = codificar_perfiles(df_datos.iloc[filas:], modelo['vocabulario'])
+            nuevas = distancias_cuadradas(X_nuevas, modelo['centroides']).argmin(axis=1)
+            modelo['etiquetas'] = np.concatenate([modelo['etiquetas'], nuevas])
+
+        modelo['version'] = version_datos
+        modelo['ultimo_timestamp'] = df_datos['timestamp'].iat[-1]
+        return copia_perfiles(modelo)
+
+def nombres_perfiles(perfiles):
+    """Nombre corto de cada perfil según sus puntajes promedio"""
+    nombres = []
+    for i, centro in enumerate(perfiles['centroides']):
+        tipo, formalizacion, digitalizacion = centro[:3] / PESO_PUNTAJES
+        tendencia = 'empresarial' if tipo > 0.55 else 'gubernamental' if tipo < 0.45 else 'mixto'
+        nombres.append(f"Perfil {i + 1}: {tendencia}, formalización {formalizacion * 100:.0f}, "
+                       f"digitalización {digitalizacion * 100:.0f}")
+    return nombres
+
+def describir_perfiles(df_filtrado, etiquetas, nombres):
+    """Tamaño, puntajes promedio y respuestas más comunes de cada perfil dentro del filtro"""
+    filas = []
+    grupos = df_filtrado.groupby(etiquetas)
+    for perfil, grupo in grupos:
+        herramientas = grupo['herramientas'].astype(str).str.split('|').explode().str.strip()
+        herramientas = herramientas[(herramientas != '') & (herramientas != 'Ninguna')]
+        filas.append({
+            'Perfil': nombres[perfil],
+            'Personas': len(grupo),
+            '%': round(len(grupo) / len(df_filtrado) * 100, 1),
+            'Tipo de organización': round(grupo['tipo_org_score'].mean(), 1),
+            'Formalización': round(grupo['nivel_formalizacion'].mean(), 1),
+            'Digitalización': round(grupo['nivel_digitalizacion'].mean(), 1),
+            'Jerarquía más común': grupo['jerarquia'].mode().iat[0],
+            'Planeación más común': grupo['planeacion'].mode().iat[0],
+            'Liderazgo más común': grupo['liderazgo'].mode().iat[0],
+            'Herramientas más usadas': ', '.join(herramientas.value_counts().index[:3])
+        })
+    return pd.DataFrame(filas)
+
+def perfiles_filtrados(df_datos, df_filtrado, version_datos, k):
+    """(etiquetas de las filas filtradas, nombres de los perfiles) con el modelo de k perfiles"""
+    perfiles = actualizar_perfiles(df_datos, version_datos, k)
+    return perfiles['etiquetas'][df_filtrado.index.to_numpy()], nombres_perfiles(perfiles)
+
+def mostrar_perfiles(df_datos, df_filtrado, version_datos):
+    """Segmentación de las personas en perfiles de gestión"""
+    k = st.selectbox("Número de perfiles:", OPCIONES_NUM_PERFILES,
+                     index=OPCIONES_NUM_PERFILES.index(NUM_PERFILES), key="perfiles_k")
+    etiquetas, nombres = perfiles_filtrados(df_datos, df_filtrado, version_datos, k)
+
+    st.dataframe(describir_perfiles(df_filtrado, etiquetas, nombres), hide_index=True, use_container_width=True)
+    st.caption("Los perfiles agrupan a personas con puntajes, jerarquía, planeación, liderazgo y herramientas "
+               "parecidos (k-means sobre todas las respuestas). Las respuestas nuevas se asignan al perfil más "
+               "cercano sin recalcular el modelo. Activa «Colorear por perfil» en el gráfico principal para verlos.")
+
+# ==================== RANKING POR PAÍS Y CIUDAD ====================
+
+COLUMNAS_RANKING = {
+    'nivel_formalizacion': 'Formalización',
+    'nivel_digitalizacion': 'Digitalización',
+    'tipo_org_score': 'Tipo de organización'
+}
+
+@st.cache_data(max_entries=8)
+def calcular_ranking(version_datos, _df_datos):
+    """Tablas por país y por ciudad: respuestas, promedio y mediana de los puntajes, uso de herramientas e IAs"""
+    df = _df_datos[['pais', 'ciudad', 'num_herramientas', 'num_ias'] + list(COLUMNAS_RANKING)].copy()
+    df['usa_ias'] = (df['num_ias'] > 0) * 100.0
+    agregaciones = {'Respuestas': ('pais', 'size')}
+    for columna, nombre in COLUMNAS_RANKING.items():
+        agregaciones[f"{nombre} (prom.)"] = (columna, 'mean')
+        agregaciones[f"{nombre} (mediana)"] = (columna, 'median')
+    agregaciones['Herramientas (prom.)'] = ('num_herramientas', 'mean')
+    agregaciones['IAs (prom.)'] = ('num_ias', 'mean')
+    agregaciones['% que usa IAs'] = ('usa_ias', 'mean')
+
+    tablas = {}
+    for nivel, claves in [('País', ['pais']), ('Ciudad', ['pais', 'ciudad'])]:
+        tabla = df[df[claves[-1]] != ''].groupby(claves, sort=False).agg(**agregaciones).reset_index()
+        tabla = tabla.rename(columns={'pais': 'País', 'ciudad': 'Ciudad'})
+        tablas[nivel] = tabla.round(1).sort_values('Respuestas', ascending=False, ignore_index=True)
+    return tablas
+
+def mostrar_ranking(df_datos, version_datos):
+    """Ranking ordenable de países o ciudades con un mínimo de respuestas"""
+    tablas = calcular_ranking(version_datos, df_datos)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        nivel = st.radio("Agrupar por:", list(tablas), horizontal=True, key="ranking_nivel")
+    tabla = tablas[nivel]
+    with col2:
+        orden = st.selectbox("Ordenar por:", [c for c in tabla.columns if c not in ('País', 'Ciudad')],
+                             key="ranking_orden")
+    with col3:
+        minimo = st.number_input("Mínimo de respuestas:", min_value=1, value=5, step=1, key="ranking_min_n")
+
+    visibles = tabla[tabla['Respuestas'] >= minimo].sort_values(orden, ascending=False, kind='stable')
+    st.dataframe(visibles, hide_index=True, use_container_width=True)
+    st.caption(f"{len(visibles)} de {len(tabla)} grupos con al menos {minimo} respuestas. "
+               "Incluye todas las respuestas, sin filtros.")
+
+# ==================== ROLES Y PROYECTOS ====================
+
+CAMPOS_CARGOS = ['organizaciones_cargos', 'proyectos_cargos']
+
+# Rol -> raíces (sin tildes y en minúscula) con que empieza alguna palabra del cargo.
+# Las raíces cubren masculino, femenino y sustantivo (director, directora, dirección);
+# gana la raíz que aparece primero en el cargo («asistente de dirección» es Administración)
+# y, si empiezan en la misma palabra, el rol que va primero aquí.
+TAXONOMIA_ROLES = {
+    'Dirección': ('direct', 'direcc', 'dirij', 'gerent', 'gerenc', 'ceo', 'president', 'fundador', 'cofundador',
+                  'duen', 'propietari', 'represent'),
+    'Coordinación': ('coordin', 'lider', 'jef', 'responsabl', 'encargad', 'supervis'),
+    'Producción': ('produc',),
+    'Gestión cultural': ('gestor', 'gestion', 'promot'),
+    'Curaduría': ('curad',),
+    'Creación artística': ('artist', 'creador', 'creativ', 'autor', 'escritor', 'compositor', 'music', 'actor',
+                           'actriz', 'bailar', 'danz', 'cantant', 'interpret', 'ilustr', 'fotograf', 'cineast',
+                           'realizador', 'guion', 'disen', 'dramaturg', 'poet', 'pintor', 'escult', 'coreograf'),
+    'Educación': ('docent', 'profesor', 'maestr', 'tallerist', 'formador', 'educa', 'instructor', 'tutor',
+                  'mediador'),
+    'Investigación': ('investig', 'academ', 'analist'),
+    'Comunicación': ('comunic', 'prensa', 'community', 'redes', 'marketing', 'mercade', 'difusion', 'publicist',
+                     'periodist', 'contenido'),
+    'Administración': ('administr', 'contador', 'contab', 'tesorer', 'finanz', 'asistent', 'secretari',
+                       'auxiliar', 'logistic'),
+    'Técnica': ('tecnic', 'sonid', 'ingenier', 'ilumin', 'montaj', 'escenograf', 'editor', 'edicion',
+                'programador', 'desarroll', 'tramoy'),
+    'Integrante': ('soci', 'integrant', 'miembro', 'asociad', 'colaborador', 'voluntari', 'participant',
+                   'afiliad')
+}
+ETIQUETAS_ROLES = list(TAXONOMIA_ROLES) + ['Otro']
+PATRON_ROLES = re.compile(r'\b(?:' + '|'.join(
+    f"(?P<r{i}>{'|'.join(raices)})" for i, raices in enumerate(TAXONOMIA_ROLES.values())
+) + ')')
+
+# Abreviaturas frecuentes -> palabra completa, antes de clasificar
+ABREVIATURAS = {'dir': 'director', 'coord': 'coordinador', 'prod': 'productor', 'admin': 'administrador',
+                'asist': 'asistente', 'pdte': 'presidente', 'cm': 'community manager'}
+# Textos que equivalen a dejar el campo vacío
+SIN_RESPUESTA = {'', 'na', 'n a', 'no', 'ninguno', 'ninguna', 'no aplica', 'no tengo', 'x'}
+
+MAX_PROYECTOS = 15
+MINIMO_MENCIONES_PROYECTO = 2
+
+def normalizar_texto(texto):
+    """Minúsculas, sin tildes ni puntuación, espacios simples y abreviaturas expandidas"""
+    sin_tildes = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(ABREVIATURAS.get(palabra, palabra) for palabra in re.findall(r'[a-z0-9]+', sin_tildes.lower()))
+
+def clasificar_cargo(normalizado):
+    """Índice en ETIQUETAS_ROLES del cargo ya normalizado"""
+    coincidencia = PATRON_ROLES.search(normalizado)
+    return int(coincidencia.lastgroup[1:]) if coincidencia else len(ETIQUETAS_ROLES) - 1
+
+def separar_entradas(columna):
+    """Una fila por cada valor de un campo separado por '|', con la etiqueta de su respuesta"""
+    entradas = columna.astype(str).str.split('|').explode().str.strip()
+    return entradas[entradas != '']
+
+def pares_unicos(filas, codigos, n_codigos):
+    """(filas, códigos) sin repetir el mismo código en una respuesta"""
+    claves = np.unique(filas.astype(np.int64) * n_codigos + codigos)
+    return claves // n_codigos, claves % n_codigos
+
+def indice_roles_vacio():
+    """Contenido del índice de roles antes de indexar la primera fila"""
+    return {
+        'version': None,
+        'filas': 0,
+        'ultimo_timestamp': None,
+        'roles_filas': np.empty(0, dtype=np.int64),
+        'roles_codigos': np.empty(0, dtype=np.int64),
+        'proyectos_filas': np.empty(0, dtype=np.int64),
+        'proyectos_codigos': np.empty(0, dtype=np.int64),
+        'vocabulario': {},
+        'nombres_proyectos': []
+    }
+
+@st.cache_resource
+def obtener_indice_roles():
+    """Estado compartido por el proceso: rol de cada cargo y proyecto mencionado por cada fila"""
+    return {'lock': threading.Lock(), **indice_roles_vacio()}
+
+def indexar_roles(nuevas, indice):
+    """Pares (fila, rol) y (fila, proyecto) de las filas nuevas; amplía el vocabulario de proyectos"""
+    cargos = pd.concat([separar_entradas(nuevas[campo]) for campo in CAMPOS_CARGOS])
+    normalizados = {c: normalizar_texto(c) for c in cargos.unique()}
+    roles = {c: -1 if n in SIN_RESPUESTA else clasificar_cargo(n) for c, n in normalizados.items()}
+    codigos = cargos.map(roles).to_numpy(dtype=np.int64)
+    validos = codigos >= 0
+    roles_filas, roles_codigos = pares_unicos(cargos.index.to_numpy()[validos], codigos[validos],
+                                              len(ETIQUETAS_ROLES))
+
+    # Los proyectos se agrupan por nombre normalizado y se muestran con la primera forma escrita
+    nombres = separar_entradas(nuevas['proyectos_nombres'])
+    vocabulario = indice['vocabulario']
+    claves = {}
+    for nombre in nombres.unique():
+        normalizado = normalizar_texto(nombre)
+        if normalizado in SIN_RESPUESTA:
+            claves[nombre] = -1
+            continue
+        if normalizado not in vocabulario:
+            vocabulario[normalizado] = len(indice['nombres_proyectos'])
+            indice['nombres_proyectos'].append(nombre)
+        claves[nombre] = vocabulario[normalizado]
+    codigos = nombres.map(claves).to_numpy(dtype=np.int64)
+    validos = codigos >= 0
+    proyectos_filas, proyectos_codigos = pares_unicos(nombres.index.to_numpy()[validos], codigos[validos],
+                                                      max(len(vocabulario), 1))
+    return roles_filas, roles_codigos, proyectos_filas, proyectos_codigos
+
+def actualizar_indice_roles(df_datos, version_datos):
+    """Indexa solo las filas nuevas (la hoja solo crece al final); devuelve una copia para esta versión"""
+    indice = obtener_indice_roles()
+    with indice['lock']:
+        if indice['version'] != version_datos:
+            filas = indice['filas']
+            # Si cambió alguna fila ya indexada (ediciones o borrados en la hoja) se reconstruye todo
+            if len(df_datos) < filas or (filas and df_datos['timestamp'].iat[filas - 1] != indice['ultimo_timestamp']):
+                indice.update(indice_roles_vacio())
+                filas = 0
+
+            if len(df_datos) > filas:
+                partes = indexar_roles(df_datos.iloc[filas:], indice)
+                for clave, nuevos in zip(['roles_filas', 'roles_codigos', 'proyectos_filas', 'proyectos_codigos'],
+                                         partes):
+                    indice[clave] = np.concatenate([indice[clave], nuevos])
+                indice['filas'] = len(df_datos)
+                indice['ultimo_timestamp'] = df_datos['timestamp'].iat[-1]
+            indice['version'] = version_datos
+
+        # Los arreglos se reemplazan al actualizar: la copia queda fija para esta versión
+        copia = {clave: valor for clave, valor in indice.items() if clave not in ('lock', 'vocabulario')}
+        copia['nombres_proyectos'] = list(indice['nombres_proyectos'])
+        return copia
+
+@st.cache_data(max_entries=256)
+def contar_roles(version_datos, clave_filtros, _indice, _indices):
+    """Personas por rol y proyectos más mencionados entre las respuestas filtradas"""
+    seleccion = np.zeros(_indice['filas'], dtype=bool)
+    seleccion[_indices] = True
+
+    en_filtro = seleccion[_indice['roles_filas']]
+    personas = np.bincount(_indice['roles_codigos'][en_filtro], minlength=len(ETIQUETAS_ROLES))
+    con_cargo = np.unique(_indice['roles_filas'][en_filtro]).size
+    roles = pd.DataFrame({
+        'Rol': ETIQUETAS_ROLES,
+        'Personas': personas,
+        '%': personas / max(con_cargo, 1) * 100
+    })
+    roles = roles[roles['Personas'] > 0].sort_values('Personas', ascending=False, kind='stable', ignore_index=True)
+
+    en_filtro = seleccion[_indice['proyectos_filas']]
+    menciones = np.bincount(_indice['proyectos_codigos'][en_filtro], minlength=len(_indice['nombres_proyectos']))
+    frecuentes = np.flatnonzero(menciones >= MINIMO_MENCIONES_PROYECTO)
+    frecuentes = frecuentes[np.argsort(-menciones[frecuentes], kind='stable')][:MAX_PROYECTOS]
+    proyectos = pd.DataFrame({
+        'Proyecto': [_indice['nombres_proyectos'][i] for i in frecuentes],
+        'Personas': menciones[frecuentes]
+    })
+
+    return {'roles': roles, 'proyectos': proyectos, 'con_cargo': con_cargo}
+
+def mostrar_roles(df_datos, df_filtrado, version_datos, clave_filtros):
+    """Roles más comunes en organizaciones y proyectos, y proyectos que más personas mencionan"""
+    indice = actualizar_indice_roles(df_datos, version_datos)
+    resultado = contar_roles(version_datos, clave_filtros, indice, df_filtrado.index.to_numpy())
+
+    if resultado['roles'].empty:
+        st.info("Nadie ha escrito sus cargos con los filtros actuales.")
+        return
+
+    st.plotly_chart(crear_grafico_roles(resultado['roles']), use_container_width=True)
+    st.caption(f"{resultado['con_cargo']} personas escribieron al menos un cargo. Los cargos se agrupan sin "
+               "importar tildes, mayúsculas ni género (director, directora y dirección son Dirección); "
+               "una persona cuenta una vez por rol aunque lo ocupe en varias organizaciones o proyectos.")
+
+    if not resultado['proyectos'].empty:
+        with st.expander("Proyectos mencionados por más personas"):
+            st.dataframe(resultado['proyectos'], hide_index=True, use_container_width=True)
+            st.caption(f"Solo proyectos que mencionan al menos {MINIMO_MENCIONES_PROYECTO} personas.")
+
+# ==================== FUNCIÓN MOSTRAR MAPAS ====================
+
+def mostrar_mapas():
+    """Vista de mapas con gráficos y filtros"""
+
+    # Tabla compartida por todas las sesiones (cargada desde Google Sheets)
+    df_datos, version_datos = cargar_datos_compartidos()
+
+    # Verificar si hay datos
+    if version_datos is None:
+        st.info("📊 Aún no hay respuestas. ¡Sé el primero en completar la encuesta!")
+        return
+
+    opciones_filtros = calcular_opciones_filtros(version_datos, df_datos)
+
+    # Filtros demográficos
+    st.markdown("### Filtros Demográficos")
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        filtro_pais = st.selectbox("País:", opciones_filtros['pais'], key="f_pais")
+
+    with col2:
+        if filtro_pais != 'Todos':
+            ciudades_disponibles = opciones_filtros['ciudades_por_pais'].get(filtro_pais, ('Todos',))
+        else:
+            ciudades_disponibles = opciones_filtros['ciudad']
+        filtro_ciudad = st.selectbox("Ciudad:", ciudades_disponibles, key="f_ciudad")
+
+    with col3:
+        filtro_edad = st.selectbox("Edad:", opciones_filtros['edad'], key="f_edad")
+
+    with col4:
+        filtro_nivel = st.selectbox("Nivel académico:", opciones_filtros['nivel_academico'], key="f_nivel")
+
+    # Filtros de medición
+    st.markdown("### Filtros de Medición")
+    col5, col6, col7, col8 = st.columns(4)
+
+    with col5:
+        filtro_digitalizacion = st.selectbox("Nivel de Digitalización:", RANGOS_MEDICION, key="f_digitalizacion")
+
+    with col6:
+        filtro_formalizacion = st.selectbox("Nivel de Formalización:", RANGOS_MEDICION, key="f_formalizacion")
+
+    with col7:
+        filtro_labores = st.selectbox("Labores profesionales:", ['Todos'] + LABORES_OPCIONES, key="f_labores")
+
+    with col8:
+        # Tipo de artista independiente
+        filtro_artista = st.selectbox("¿Qué tan independiente eres?", opciones_filtros['artista_independiente'], key="f_artista")
+
+    # Aplicar filtros
+    filtros = {
+        'pais': filtro_pais,
+        'ciudad': filtro_ciudad,
+        'edad': filtro_edad,
+        'nivel_academico': filtro_nivel,
+        'digitalizacion': filtro_digitalizacion,
+        'formalizacion': filtro_formalizacion,
+        'labores': filtro_labores,
+        'artista': filtro_artista
+    }
+
+    df_filtrado = filtrar_datos(df_datos, filtros)
+
+    clave_filtros = tuple(filtros.values())
+
+    st.info(f"📊 Mostrando {len(df_filtrado)} de {len(df_datos)} respuestas")
+    mostrar_ic = st.toggle("Mostrar intervalos de confianza (95%)", key="mostrar_ic",
+                           help="Calculados por bootstrap sobre las respuestas filtradas")
+
+    if len(df_filtrado) == 0:
+        st.warning("No hay datos con los filtros seleccionados. Prueba con otros criterios.")
+        return
+
+    st.markdown("---")
+
+    # GRÁFICO PRINCIPAL
+    st.markdown("### Gráfico Principal")
+    st.markdown("""
+    <div style="background-color: #f0f0f0; padding: 0.8rem; border-radius: 8px; margin-bottom: 1rem;">
+        En este mapa medimos, por persona, qué tan formalizadas son sus relaciones
+        <span style="display: inline-block; width: 10px; height: 10px; border-radius: 50%; background-color: #258DC5; margin: 0 3px;"></span>
+        y su nivel de digitalización
+        <span style="display: inline-block; width: 10px; height: 10px; border-radius: 50%; background-color: #EA185E; margin: 0 3px;"></span>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if st.toggle("Colorear por perfil", key="scatter_perfiles"):
+        k = st.session_state.get('perfiles_k', NUM_PERFILES)
+        etiquetas, nombres = perfiles_filtrados(df_datos, df_filtrado, version_datos, k)
+        fig = crear_scatter_dual(df_filtrado, grupos=(etiquetas, nombres, COLORES_PERFILES))
+    else:
+        fig = crear_scatter_dual(df_filtrado)
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("---")
+
+    # MAPA GEOGRÁFICO
+    st.markdown("### Mapa Geográfico")
+    st.markdown("""
+    <div style="background-color: #f0f0f0; padding: 0.8rem; border-radius: 8px; margin-bottom: 1rem;">
+        Cada círculo agrupa a las personas de una zona: su tamaño indica cuántas respondieron
+        y su color el promedio del nivel seleccionado. Aumenta el nivel de detalle para separar ciudades cercanas.
+    </div>
+    """, unsafe_allow_html=True)
+
+    mostrar_mapa_geografico(df_filtrado, version_datos, clave_filtros)
+
+    st.markdown("---")
+
+    # GRÁFICOS COMPLEMENTARIOS
+    st.markdown("### Gráficos Complementarios")
+
+    # 1. Participación promedio y labores profesionales
+    st.markdown("#### 1. Participación promedio")
+
+    st.plotly_chart(crear_grafico_labores(df_filtrado), use_container_width=True)
+
+    # Promedios de organizaciones, proyectos y labores
+    promedios = calcular_promedios(df_filtrado)
+    prom_orgs = promedios['num_organizaciones']
+    prom_proys = promedios['num_proyectos']
+    prom_labores = promedios['num_labores']
+    intervalos = calcular_intervalos(version_datos, clave_filtros, df_filtrado) if mostrar_ic else {}
+
+    col_prom1, col_prom2, col_prom3 = st.columns(3)
+    with col_prom1:
+        st.markdown(f"""
+        <div style="background-color: #258DC5; color: white; padding: 1.5rem; border-radius: 10px; text-align: center;">
+            <p style="font-size: 1.1rem; margin-bottom: 0.5rem;">Promedio de organizaciones a las que pertenecen las personas:</p>
+            <p style="font-size: 2.5rem; font-weight: bold; margin: 0;">{prom_orgs:.1f}</p>
+            <p style="font-size: 0.9rem; margin: 0.3rem 0 0 0;">{texto_intervalo(intervalos, 'num_organizaciones')}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    with col_prom2:
+        st.markdown(f"""
+        <div style="background-color: #EA185E; color: white; padding: 1.5rem; border-radius: 10px; text-align: center;">
+            <p style="font-size: 1.1rem; margin-bottom: 0.5rem;">Promedio de proyectos en los que participan las personas:</p>
+            <p style="font-size: 2.5rem; font-weight: bold; margin: 0;">{prom_proys:.1f}</p>
+            <p style="font-size: 0.9rem; margin: 0.3rem 0 0 0;">{texto_intervalo(intervalos, 'num_proyectos')}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    with col_prom3:
+        st.markdown(f"""
+        <div style="background-color: #1B6A99; color: white; padding: 1.5rem; border-radius: 10px; text-align: center;">
+            <p style="font-size: 1.1rem; margin-bottom: 0.5rem;">Promedio de labores que realiza una persona:</p>
+            <p style="font-size: 2.5rem; font-weight: bold; margin: 0;">{prom_labores:.1f}</p>
+            <p style="font-size: 0.9rem; margin: 0.3rem 0 0 0;">{texto_intervalo(intervalos, 'num_labores')}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("")
+
+    # 2. Gráficas de círculo para jerarquía y planeación
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("#### 2a. Tipos de jerarquía")
+        st.plotly_chart(crear_grafico_torta(df_filtrado['jerarquia'], COLORES_AZUL), use_container_width=True)
+
+    with col2:
+        st.markdown("#### 2b. Tipos de planeación")
+        st.plotly_chart(crear_grafico_torta(df_filtrado['planeacion'], COLORES_MORADO), use_container_width=True)
+
+    # 3. Gráficas de ecosistemas y redes
+    col3a, col3b = st.columns(2)
+
+    with col3a:
+        st.markdown("#### 3a. Tipos de ecosistemas")
+        st.plotly_chart(crear_grafico_torta(df_filtrado['ecosistema'], COLORES_AZUL), use_container_width=True)
+
+    with col3b:
+        st.markdown("#### 3b. Tipos de redes")
+        st.plotly_chart(crear_grafico_torta(df_filtrado['redes'], COLORES_MORADO), use_container_width=True)
+
+    # 4. Tipos de liderazgo
+    st.markdown("#### 4. Tipos de liderazgo")
+    fig_lider = crear_grafico_torta(df_filtrado['liderazgo'], COLORES_AZUL, alto=400, leyenda_y=-0.1)
+    st.plotly_chart(fig_lider, use_container_width=True)
+
+    if intervalos:
+        with st.expander("Porcentajes con intervalo de confianza (95%)"):
+            st.dataframe(tabla_porcentajes_intervalo(df_filtrado, intervalos), hide_index=True, use_container_width=True)
+
+    # 5. Promedios de herramientas digitales
+    st.markdown("#### 5. Uso promedio de herramientas digitales por persona")
+
+    st.plotly_chart(crear_grafico_herramientas(df_filtrado, intervalos), use_container_width=True)
+    if intervalos:
+        st.caption(f"Intervalos bootstrap de {REPETICIONES_BOOTSTRAP} remuestreos con semilla fija; "
+                   "con pocas respuestas son amplios.")
+
+    # 6. Cruce de variables
+    st.markdown("#### 6. Cruce de variables")
+    mostrar_tabla_cruzada(df_datos, df_filtrado, version_datos, clave_filtros)
+
+    # 7. Coocurrencias en herramientas, IAs, comunidades y labores
+    st.markdown("#### 7. ¿Qué se usa junto?")
+    mostrar_coocurrencias(df_datos, df_filtrado, version_datos, clave_filtros)
+
+    # 8. Participación en el tiempo
+    st.markdown("#### 8. Participación en el tiempo")
+    mostrar_serie_envios(df_datos)
+
+    # 9. Perfiles
+    st.markdown("#### 9. Perfiles de gestión")
+    mostrar_perfiles(df_datos, df_filtrado, version_datos)
+
+    # 10. Ranking por país y ciudad
+    st.markdown("#### 10. Ranking por país y ciudad")
+    mostrar_ranking(df_datos, version_datos)
+
+    # 11. Roles en organizaciones y proyectos
+    st.markdown("#### 11. Roles más comunes")
+    mostrar_roles(df_datos, df_filtrado, version_datos, clave_filtros)
+
+# ==================== COMPARACIÓN DE COHORTES ====================
+
+DIMENSIONES_COMPARACION = {
+    'pais': 'País',
+    'ciudad': 'Ciudad',
+    'edad': 'Edad',
+    'nivel_academico': 'Nivel académico',
+    'artista_independiente': '¿Qué tan independiente eres?'
+}
+NIVELES_COMPARACION = {
+    'nivel_formalizacion': 'Formalización',
+    'nivel_digitalizacion': 'Digitalización',
+    'tipo_org_score': 'Tipo de organización'
+}
+PARTICIPACION_COMPARACION = {
+    'num_organizaciones': 'Organizaciones',
+    'num_proyectos': 'Proyectos',
+    'num_labores': 'Labores'
+}
+CATEGORICAS_COMPARACION = {
+    'jerarquia': 'Tipos de jerarquía',
+    'planeacion': 'Tipos de planeación',
+    'ecosistema': 'Tipos de ecosistemas',
+    'redes': 'Tipos de redes',
+    'liderazgo': 'Tipos de liderazgo'
+}
+MAX_COHORTES = 6
+
+@st.cache_data(max_entries=64)
+def calcular_comparacion(version_datos, dimension, cohortes, _df_datos):
+    """Promedios y porcentajes de todas las cohortes en una sola agrupación"""
+    codigos = pd.Index(cohortes).get_indexer(_df_datos[dimension].astype(str))
+    seleccion = codigos >= 0
+    df = _df_datos[seleccion]
+    codigos = codigos[seleccion]
+
+    # Una tabla ancha: los porcentajes son promedios de indicadores 0/100
+    numericas = list(NIVELES_COMPARACION) + list(PARTICIPACION_COMPARACION) + list(CATEGORIAS_HERRAMIENTAS)
+    indicadores = pd.get_dummies(df[list(CATEGORICAS_COMPARACION)], prefix_sep='=', dtype=float) * 100
+    labores = (df['labores_profesionales'].astype(str).str.replace(r'\s*\|\s*', '|', regex=True)
+               .str.get_dummies(sep='|').reindex(columns=LABORES_OPCIONES, fill_value=0) * 100)
+    tabla = pd.concat([df[numericas].astype(float), indicadores, labores.add_prefix('labor=')], axis=1)
+
+    agregados = tabla.groupby(codigos).mean()
+    agregados.index = [cohortes[i] for i in agregados.index]
+    return {
+        'agregados': agregados.reindex(list(cohortes)).fillna(0),
+        'tamanos': dict(zip(cohortes, np.bincount(codigos, minlength=len(cohortes)).tolist())),
+        'indices': df.index.to_numpy(),
+        'etiquetas': codigos
+    }
+
+def mostrar_comparacion():
+    """Varias cohortes lado a lado en cada gráfico"""
+    df_datos, version_datos = cargar_datos_compartidos()
+    if version_datos is None:
+        st.info("📊 Aún no hay respuestas. ¡Sé el primero en completar la encuesta!")
+        return
+
+    opciones_filtros = calcular_opciones_filtros(version_datos, df_datos)
+
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        dimension = st.selectbox("Comparar por:", list(DIMENSIONES_COMPARACION),
+                                 format_func=DIMENSIONES_COMPARACION.get, key="comp_dimension")
+    opciones = [o for o in opciones_filtros[dimension] if o != 'Todos']
+    with col2:
+        # Una clave por dimensión para que la selección no arrastre valores de otra
+        cohortes = st.multiselect("Cohortes:", opciones, default=opciones[:2], max_selections=MAX_COHORTES,
+                                  key=f"comp_cohortes_{dimension}")
+
+    if len(cohortes) < 2:
+        st.info("Elige al menos dos cohortes para compararlas.")
+        return
+
+    comparacion = calcular_comparacion(version_datos, dimension, tuple(cohortes), df_datos)
+    agregados = comparacion['agregados']
+
+    columnas = st.columns(len(cohortes))
+    for columna, cohorte in zip(columnas, cohortes):
+        columna.metric(cohorte, f"{comparacion['tamanos'][cohorte]} respuestas")
+
+    st.markdown("#### Formalización y digitalización por cohorte")
+    df_seleccion = df_datos.loc[comparacion['indices']]
+    st.plotly_chart(crear_scatter_dual(df_seleccion, grupos=(comparacion['etiquetas'], list(cohortes), COLORES_COHORTES)),
+                    use_container_width=True)
+
+    st.markdown("#### Niveles promedio")
+    st.plotly_chart(crear_barras_comparadas(agregados, NIVELES_COMPARACION, "Promedio"), use_container_width=True)
+
+    col_a, col_b = st.columns(2)
+    with col_a:
+        st.markdown("#### Participación promedio")
+        st.plotly_chart(crear_barras_comparadas(agregados, PARTICIPACION_COMPARACION, "Promedio por persona"),
+                        use_container_width=True)
+    with col_b:
+        st.markdown("#### Herramientas digitales")
+        st.plotly_chart(crear_barras_comparadas(agregados, CATEGORIAS_HERRAMIENTAS, "Promedio por persona"),
+                        use_container_width=True)
+
+    st.markdown("#### Labores profesionales")
+    labores = {f"labor={labor}": labor for labor in LABORES_OPCIONES}
+    st.plotly_chart(crear_barras_comparadas(agregados, labores, "% de personas", alto=450, decimales=0),
+                    use_container_width=True)
+
+    for campo, titulo in CATEGORICAS_COMPARACION.items():
+        st.markdown(f"#### {titulo}")
+        categorias = {c: c.split('=', 1)[1] for c in agregados.columns if c.startswith(f"{campo}=")}
+        st.plotly_chart(crear_barras_comparadas(agregados, categorias, "% de personas", decimales=0),
+                        use_container_width=True)
+
+# ==================== PRECÁLCULO DE LA VISTA INICIAL ====================
+
+# Valores por defecto de los filtros de mostrar_mapas, en el mismo orden
+FILTROS_INICIALES = {
+    'pais': 'Todos',
+    'ciudad': 'Todos',
+    'edad': 'Todos',
+    'nivel_academico': 'Todos',
+    'digitalizacion': RANGOS_MEDICION[0],
+    'formalizacion': RANGOS_MEDICION[0],
+    'labores': 'Todos',
+    'artista': 'Todos'
+}
+
+def precalcular_vista_inicial(df_datos, version_datos):
+    """Llena las cachés que usa la vista de resultados sin filtros, sin dibujar nada"""
+    clave_filtros = tuple(FILTROS_INICIALES.values())
+    df_filtrado = filtrar_datos(df_datos, FILTROS_INICIALES)
+    calcular_opciones_filtros(version_datos, df_datos)
+    precalcular_celdas_mapa(version_datos, clave_filtros, df_filtrado)
+    codificar_categoricas(version_datos, df_datos)
+    construir_indicadores(version_datos, df_datos)
+    actualizar_serie_envios(df_datos)
+    actualizar_perfiles(df_datos, version_datos, NUM_PERFILES)
+    calcular_ranking(version_datos, df_datos)
+    contar_roles(version_datos, clave_filtros, actualizar_indice_roles(df_datos, version_datos),
+                 df_filtrado.index.to_numpy())
+    # La primera figura de plotly carga sus validadores; serializarla calienta plotly.io
+    crear_scatter_dual(df_filtrado).to_json()